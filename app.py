@@ -1,15 +1,10 @@
-import spacy
-import docx as docx_lib
-import pdfplumber
 import streamlit as st
-import sqlite3
 import pandas as pd
-import re
+import html
 import json
-import uuid
-import io
+import os
+import tempfile
 from datetime import datetime
-from pathlib import Path
 
 # ══════════════════════════════════════════════════════════
 #  DEPENDENCY CHECK & IMPORTS
@@ -234,362 +229,208 @@ if missing_pkgs:
     st.stop()
 
 # Safe imports after check
-
-# Load spacy model
-
-
-@st.cache_resource
-def load_spacy():
-    try:
-        return spacy.load("en_core_web_sm")
-    except OSError:
-        st.error(
-            "spaCy model not found! Run: `python -m spacy download en_core_web_sm`")
-        st.stop()
-
-
-nlp = load_spacy()
-
-# ══════════════════════════════════════════════════════════
-#  SKILLS DICTIONARY
-# ══════════════════════════════════════════════════════════
-SKILLS_DB = {
-    # Languages
-    "python", "java", "javascript", "typescript", "c++", "c#", "c", "ruby", "go", "rust", "kotlin", "swift",
-    "php", "scala", "r", "matlab", "perl", "bash", "shell", "dart", "lua", "haskell", "elixir", "clojure",
-    # Web
-    "html", "css", "react", "angular", "vue", "next.js", "nuxt", "svelte", "jquery", "bootstrap", "tailwind",
-    "sass", "less", "webpack", "vite", "node.js", "express", "django", "flask", "fastapi", "spring", "rails",
-    "asp.net", "laravel", "gatsby", "remix",
-    # Data / ML / AI
-    "machine learning", "deep learning", "nlp", "computer vision", "tensorflow", "pytorch", "keras",
-    "scikit-learn", "pandas", "numpy", "matplotlib", "seaborn", "plotly", "opencv", "huggingface",
-    "langchain", "openai", "transformers", "xgboost", "lightgbm", "random forest", "neural network",
-    "data analysis", "data science", "feature engineering", "model deployment",
-    # Databases
-    "sql", "mysql", "postgresql", "mongodb", "redis", "sqlite", "cassandra", "oracle", "dynamodb",
-    "firebase", "elasticsearch", "neo4j", "influxdb", "supabase",
-    # Cloud / DevOps
-    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "ansible", "jenkins", "ci/cd", "github actions",
-    "linux", "nginx", "apache", "heroku", "vercel", "netlify", "cloudflare",
-    # Tools
-    "git", "github", "gitlab", "bitbucket", "jira", "confluence", "figma", "postman", "swagger",
-    "grafana", "prometheus", "airflow", "spark", "hadoop", "kafka", "rabbitmq", "celery",
-    # Mobile
-    "android", "ios", "react native", "flutter", "xamarin",
-    # Other
-    "rest api", "graphql", "microservices", "agile", "scrum", "devops", "mlops", "llm",
-    "excel", "power bi", "tableau", "looker", "dbt",
-}
-
-# ══════════════════════════════════════════════════════════
-#  TEXT EXTRACTION
-# ══════════════════════════════════════════════════════════
-
-
-def extract_text_pdf(file_bytes: bytes) -> str:
-    text = ""
-    try:
-        with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-            for page in pdf.pages:
-                t = page.extract_text()
-                if t:
-                    text += t + "\n"
-    except Exception as e:
-        st.warning(f"PDF read error: {e}")
-    return text.strip()
-
-
-def extract_text_docx(file_bytes: bytes) -> str:
-    text = ""
-    try:
-        doc = docx_lib.Document(io.BytesIO(file_bytes))
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    text += cell.text + " "
-                text += "\n"
-    except Exception as e:
-        st.warning(f"DOCX read error: {e}")
-    return text.strip()
-
-
-def extract_text(file_bytes: bytes, filename: str) -> str:
-    ext = Path(filename).suffix.lower()
-    if ext == ".pdf":
-        return extract_text_pdf(file_bytes)
-    elif ext in (".docx", ".doc"):
-        return extract_text_docx(file_bytes)
-    return ""
+from resume_parser.db import (HIGHLIGHT_END, HIGHLIGHT_START, TABLE_HEADERS,  # noqa: E402
+                              clear_all_resumes, delete_resume, duplicate_groups,
+                              duplicate_pairs, count_resumes, fetch_metrics, fetch_resume_text,
+                              fetch_resumes, get_stats, init_db, search_table, top_skills)
+from resume_parser.export import EXPORT_FORMATS, export_resumes  # noqa: E402
+from resume_parser.parsing import nlp_installed  # noqa: E402
+from resume_parser.jobs import (ensure_worker, get_job, job_files, job_results,  # noqa: E402
+                                list_jobs, submit_job)
+from resume_parser.matching import (METRICS, match_candidates,  # noqa: E402
+                                    parse_job_description)
+from resume_parser.pipeline import default_workers, merge_duplicates  # noqa: E402
+from resume_parser.similar import similar_candidates  # noqa: E402
+from resume_parser.skills import SKILL_MATCHER  # noqa: E402
+from resume_parser.timing import PROFILERS, STAGES  # noqa: E402
+
+# Parse jobs load the spaCy model when they run; here it is only checked for
+if not nlp_installed():
+    st.error("spaCy model not found! Run: `python -m spacy download en_core_web_sm`")
+    st.stop()
 
 # ══════════════════════════════════════════════════════════
-#  PARSERS
+#  DATABASE
 # ══════════════════════════════════════════════════════════
 
 
-def parse_email(text: str) -> str:
-    match = re.search(
-        r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", text)
-    return match.group(0) if match else ""
-
-
-def parse_phone(text: str) -> str:
-    patterns = [
-        r"(?:\+91[\s\-]?)?[6-9]\d{9}",
-        r"\+?[\d][\d\s\-\(\)]{8,15}\d",
-    ]
-    for p in patterns:
-        m = re.search(p, text)
-        if m:
-            return m.group(0).strip()
-    return ""
-
-
-def parse_name(text: str, doc) -> str:
-    # Try spaCy PERSON first
-    for ent in doc.ents:
-        if ent.label_ == "PERSON":
-            name = ent.text.strip()
-            if 2 <= len(name.split()) <= 4 and len(name) < 50:
-                return name
-    # Fallback: first non-empty line that looks like a name
-    for line in text.split("\n")[:8]:
-        line = line.strip()
-        if (2 <= len(line.split()) <= 4 and
-                line.replace(" ", "").replace(".", "").isalpha() and
-                len(line) < 50 and line[0].isupper()):
-            return line
-    return ""
-
-
-def parse_skills(text: str) -> list:
-    text_lower = text.lower()
-    found = set()
-    for skill in SKILLS_DB:
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, text_lower):
-            found.add(skill.title())
-    return sorted(found)
-
-
-def parse_education(text: str) -> list:
-    degrees = [
-        "b.tech", "m.tech", "b.e", "m.e", "bsc", "msc", "b.sc", "m.sc", "bca", "mca",
-        "bba", "mba", "phd", "ph.d", "bachelor", "master", "diploma", "10th", "12th",
-        "b.com", "m.com", "be", "me", "b.a", "m.a", "llb", "mbbs", "engineering",
-    ]
-    lines = text.split("\n")
-    edu_lines = []
-    capture = False
-    for line in lines:
-        l = line.strip()
-        if not l:
-            continue
-        l_lower = l.lower()
-        if any(kw in l_lower for kw in ["education", "academic", "qualification", "schooling"]):
-            capture = True
-            continue
-        if capture and any(kw in l_lower for kw in ["experience", "project", "skill", "certification", "work", "employment"]):
-            capture = False
-        if capture and len(l) > 3:
-            edu_lines.append(l)
-        elif any(deg in l_lower for deg in degrees) and len(l) < 200:
-            if l not in edu_lines:
-                edu_lines.append(l)
-    # Clean duplicates keeping order
-    seen, result = set(), []
-    for e in edu_lines:
-        if e not in seen:
-            seen.add(e)
-            result.append(e)
-    return result[:6]
-
-
-def parse_experience(text: str) -> list:
-    lines = text.split("\n")
-    exp_lines = []
-    capture = False
-    for line in lines:
-        l = line.strip()
-        if not l:
-            continue
-        l_lower = l.lower()
-        if any(kw in l_lower for kw in ["experience", "employment", "work history", "career", "professional"]):
-            capture = True
-            continue
-        if capture and any(kw in l_lower for kw in ["education", "skill", "project", "certification", "academic"]):
-            capture = False
-        if capture and len(l) > 3:
-            exp_lines.append(l)
-    # Also catch year patterns like "2020 - 2023" lines near job titles
-    year_pat = re.compile(r'\b(19|20)\d{2}\b')
-    for i, l in enumerate(lines):
-        if year_pat.search(l) and len(l.strip()) < 120:
-            if l.strip() not in exp_lines:
-                exp_lines.append(l.strip())
-    seen, result = set(), []
-    for e in exp_lines:
-        if e not in seen:
-            seen.add(e)
-            result.append(e)
-    return result[:10]
-
-
-def parse_linkedin(text: str) -> str:
-    m = re.search(r'linkedin\.com/in/[\w\-]+', text, re.IGNORECASE)
-    return "https://" + m.group(0) if m else ""
-
-
-def parse_github(text: str) -> str:
-    m = re.search(r'github\.com/[\w\-]+', text, re.IGNORECASE)
-    return "https://" + m.group(0) if m else ""
-
-
-def completion_score(data: dict) -> int:
-    fields = ["name", "email", "phone", "skills", "education", "experience"]
-    filled = sum(1 for f in fields if data.get(
-        f) and data[f] != "" and data[f] != [])
-    return int((filled / len(fields)) * 100)
-
-
-def parse_resume(text: str, filename: str) -> dict:
-    doc = nlp(text[:50000])  # limit for performance
-    skills = parse_skills(text)
-    education = parse_education(text)
-    experience = parse_experience(text)
-    data = {
-        "id":          str(uuid.uuid4())[:8],
-        "filename":    filename,
-        "name":        parse_name(text, doc),
-        "email":       parse_email(text),
-        "phone":       parse_phone(text),
-        "linkedin":    parse_linkedin(text),
-        "github":      parse_github(text),
-        "skills":      skills,
-        "education":   education,
-        "experience":  experience,
-        "parsed_at":   datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "raw_text":    text[:3000],
+def highlight_html(snippet: str) -> str:
+    # Escape the resume text, then turn the FTS match markers into <mark> tags
+    return (html.escape(snippet)
+            .replace(HIGHLIGHT_START, "<mark style='background:rgba(0,212,170,0.25);color:#e2e8f0;'>")
+            .replace(HIGHLIGHT_END, "</mark>"))
+
+
+def full_text_toggle(resume_id: str, key: str):
+    # The stored text is decompressed only for the card whose toggle is on
+    if st.toggle("📄 Show full text", key=f"text_{key}_{resume_id}"):
+        with st.container(height=320):
+            st.text(fetch_resume_text(resume_id) or "No text stored")
+
+
+def details_toggle(resume_id: str, key: str):
+    # The full row (links, every education entry and skill) is read only for
+    # the card whose toggle is on
+    rows = fetch_resumes([resume_id]) if st.toggle(
+        "🧾 Show details", key=f"details_{key}_{resume_id}") else []
+    for r in rows:
+        ca, cb = st.columns(2)
+        with ca:
+            if r["linkedin"]:
+                st.markdown(f"**🔗 LinkedIn:** [{r['linkedin']}]({r['linkedin']})")
+            if r["education"]:
+                st.markdown("**🎓 Education:**")
+                for e in r["education"][:3]:
+                    st.markdown(f"  - {e}")
+        with cb:
+            st.markdown(f"**⚡ Skills ({len(r['skills'])}):**")
+            tags = "".join(f"<span class='skill-tag'>{s}</span>" for s in r["skills"][:15])
+            st.markdown(f"<div class='skill-wrap'>{tags}</div>", unsafe_allow_html=True)
+
+
+def find_similar(resume_id: str, key: str):
+    # The button opens (and closes) the list; it stays open across reruns
+    shown = f"similar_{key}_{resume_id}"
+    if st.button("🔎 Find similar", key=f"btn_{shown}",
+                 help="Candidates whose resume text and skills are most like this one"):
+        st.session_state[shown] = not st.session_state.get(shown, False)
+    if not st.session_state.get(shown):
+        return
+    matches = similar_candidates(resume_id, SIMILAR_SHOWN)
+    resumes = {r["id"]: r for r in fetch_resumes([m.resume_id for m in matches])}
+    if not resumes:
+        st.caption("No similar candidates found")
+        return
+    st.dataframe(pd.DataFrame([{
+        "Similarity %": round(m.score * 100),
+        "Name":         resumes[m.resume_id]["name"],
+        "Email":        resumes[m.resume_id]["email"],
+        "Skills":       ", ".join(resumes[m.resume_id]["skills"][:8]),
+        "Score %":      resumes[m.resume_id]["score"],
+        "File":         resumes[m.resume_id]["filename"],
+    } for m in matches if m.resume_id in resumes]), use_container_width=True, hide_index=True)
+
+
+PAGE_SIZES = [10, 25, 50, 100]
+DUP_GROUPS_SHOWN = 20
+SIMILAR_SHOWN = 20
+
+
+def pager(key: str, total: int, filters: tuple = ()) -> dict:
+    """Render page controls and return this table's paging state.
+
+    ``state["cursors"]`` maps a page number to the ``(parsed_at, id)`` of the
+    last row on the page before it, recorded while paging forward, so the next
+    page can be fetched by keyset instead of OFFSET. Changing the filters or
+    the page size starts over at page 1.
+    """
+    state = st.session_state.setdefault(
+        f"pager_{key}", {"page": 1, "size": PAGE_SIZES[1], "filters": None, "cursors": {}})
+    p_prev, p_info, p_next, p_size = st.columns([1, 2, 1, 1])
+    with p_size:
+        size = st.selectbox("Page size", PAGE_SIZES, index=PAGE_SIZES.index(state["size"]),
+                            key=f"pager_size_{key}", label_visibility="collapsed")
+    if state["filters"] != filters or state["size"] != size:
+        state.update(page=1, size=size, filters=filters, cursors={})
+    pages = max(1, -(-total // size))
+    state["page"] = min(state["page"], pages)
+    with p_prev:
+        if st.button("◀ Prev", key=f"pager_prev_{key}", disabled=state["page"] <= 1,
+                     use_container_width=True):
+            state["page"] -= 1
+    with p_next:
+        if st.button("Next ▶", key=f"pager_next_{key}", disabled=state["page"] >= pages,
+                     use_container_width=True):
+            state["page"] += 1
+    with p_info:
+        st.markdown(f"<div style='text-align:center;color:#64748b;font-size:0.85rem;padding-top:0.5rem;'>"
+                    f"Page <strong style='color:#00d4aa;'>{state['page']}</strong> of {pages}</div>",
+                    unsafe_allow_html=True)
+    return state
+
+
+def fetch_table(state: dict, keyset: bool = True, snippet: bool = False, **filters) -> pd.DataFrame:
+    # One page of the grid, straight from the cursor tuples; ``snippet`` adds a
+    # Snippet column for the candidate cards
+    size, page = state["size"], state["page"]
+    after = state["cursors"].get(page) if keyset else None
+    df = pd.DataFrame.from_records(
+        search_table(**filters, limit=size, offset=0 if after else (page - 1) * size, after=after,
+                     snippet=snippet),
+        columns=TABLE_HEADERS + ("Snippet",) if snippet else TABLE_HEADERS)
+    if keyset and len(df):
+        state["cursors"][page + 1] = (df["Parsed At"].iat[-1], df["ID"].iat[-1])
+    return df
+
+
+def export_controls(key: str, stem: str, **filters):
+    # Nothing is exported until asked; the rows stream from the DB into a temp
+    # file, so only the encoded export is ever held, never a DataFrame
+    c_fmt, c_btn = st.columns([1, 2])
+    fmt = c_fmt.selectbox("Format", list(EXPORT_FORMATS), key=f"export_fmt_{key}",
+                          label_visibility="collapsed")
+    if c_btn.button(f"📦 Prepare {fmt.upper()} Export", key=f"export_{key}",
+                    use_container_width=True):
+        _, ext, mime = EXPORT_FORMATS[fmt]
+        with st.spinner("Exporting…"), tempfile.TemporaryFile() as f:
+            n = export_resumes(f, fmt, **filters)
+            f.seek(0)
+            data = f.read()
+        st.download_button(
+            f"⬇️ Download {n} Candidate(s) as {fmt.upper()}",
+            data=data,
+            file_name=f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M')}.{ext}",
+            mime=mime,
+            key=f"export_dl_{key}",
+            use_container_width=True,
+        )
+
+
+# ══════════════════════════════════════════════════════════
+#  PARSE JOBS
+# ══════════════════════════════════════════════════════════
+
+
+def show_job(job_id: str):
+    # Load a finished job's resumes and summary into the session
+    job = get_job(job_id)
+    files = job_files(job_id)
+    st.session_state.loaded_job = job_id
+    st.session_state.parsed_results = job_results(job_id)
+    st.session_state.batch_summary = {
+        "parsed":     len(st.session_state.parsed_results),
+        "cache_hits": job.counts.get("cached", 0),
+        "cache_miss": job.total - job.counts.get("cached", 0) - job.counts.get("duplicate", 0),
+        "duplicates": job.counts.get("duplicate", 0),
+        "seconds":    job.seconds or 0,
+        "profile":    job.profile,
+        "problems":   [(f["filename"], f["error"]) for f in files
+                       if f["status"] in ("failed", "no_text")],
+        "error":      job.error,
     }
-    data["score"] = completion_score(data)
-    return data
 
 
-# ══════════════════════════════════════════════════════════
-#  DATABASE
-# ══════════════════════════════════════════════════════════
-DB_PATH = "resumes.db"
-
-
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS resumes (
-            id          TEXT PRIMARY KEY,
-            filename    TEXT,
-            name        TEXT,
-            email       TEXT,
-            phone       TEXT,
-            linkedin    TEXT,
-            github      TEXT,
-            skills      TEXT,
-            education   TEXT,
-            experience  TEXT,
-            score       INTEGER,
-            parsed_at   TEXT,
-            raw_text    TEXT
-        )""")
-    conn.commit()
-    conn.close()
-
-
-def save_resume(data: dict):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("""
-        INSERT OR REPLACE INTO resumes
-        (id,filename,name,email,phone,linkedin,github,skills,education,experience,score,parsed_at,raw_text)
-        VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)
-    """, (
-        data["id"], data["filename"], data["name"], data["email"], data["phone"],
-        data["linkedin"], data["github"],
-        json.dumps(data["skills"]),
-        json.dumps(data["education"]),
-        json.dumps(data["experience"]),
-        data["score"], data["parsed_at"], data["raw_text"],
-    ))
-    conn.commit()
-    conn.close()
-
-
-def fetch_all_resumes() -> list:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM resumes ORDER BY parsed_at DESC")
-    rows = []
-    for r in cur.fetchall():
-        d = dict(r)
-        d["skills"] = json.loads(d["skills"] or "[]")
-        d["education"] = json.loads(d["education"] or "[]")
-        d["experience"] = json.loads(d["experience"] or "[]")
-        rows.append(d)
-    conn.close()
-    return rows
-
-
-def delete_resume(resume_id: str):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("DELETE FROM resumes WHERE id=?", (resume_id,))
-    conn.commit()
-    conn.close()
-
-
-def clear_all_resumes():
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("DELETE FROM resumes")
-    conn.commit()
-    conn.close()
-
-
-def get_stats() -> dict:
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("SELECT COUNT(*) FROM resumes")
-    total = cur.fetchone()[0]
-    cur.execute("SELECT AVG(score) FROM resumes")
-    avg_score = cur.fetchone()[0] or 0
-    conn.close()
-    return {"total": total, "avg_score": round(avg_score)}
-
-
-def resumes_to_df(resumes: list) -> pd.DataFrame:
-    rows = []
-    for r in resumes:
-        rows.append({
-            "ID":         r["id"],
-            "Name":       r["name"],
-            "Email":      r["email"],
-            "Phone":      r["phone"],
-            "Skills":     ", ".join(r["skills"][:8]),
-            "Education":  " | ".join(r["education"][:2]),
-            "Experience": " | ".join(r["experience"][:2]),
-            "Score %":    r["score"],
-            "File":       r["filename"],
-            "Parsed At":  r["parsed_at"],
-        })
-    return pd.DataFrame(rows)
+@st.fragment(run_every=1.0)
+def job_progress(job_id: str):
+    # Re-runs on its own every second; the page stays usable while the job runs
+    job = get_job(job_id)
+    if job is None:
+        return
+    if job.finished:
+        show_job(job_id)
+        st.rerun()
+    label = "Queued" if job.status == "queued" else "Parsing resumes"
+    st.progress(job.done / max(job.total, 1), text=f"{label}… ({job.done}/{job.total})")
+    with st.expander("Per-file progress"):
+        st.dataframe(pd.DataFrame(job_files(job_id))[["filename", "status", "error"]],
+                     use_container_width=True, hide_index=True)
 
 
 # ══════════════════════════════════════════════════════════
 #  INIT
 # ══════════════════════════════════════════════════════════
 init_db()
+ensure_worker()  # also resumes jobs left unfinished by a previous run
 
 if "parsed_results" not in st.session_state:
     st.session_state.parsed_results = []
@@ -633,20 +474,29 @@ with st.sidebar:
         📕 PDF &nbsp; · &nbsp; 📘 DOCX &nbsp; · &nbsp; 📄 DOC
     </div>""", unsafe_allow_html=True)
 
+    st.markdown("<hr>", unsafe_allow_html=True)
+    profiler = st.selectbox(
+        "🔬 Profile Parsing", ["Off", *PROFILERS],
+        help="Profile the next parse. It runs in this process (1 worker) so "
+             "extraction and spaCy show up in the report.")
+
     st.markdown("<hr>", unsafe_allow_html=True)
     if st.button("🗑️ Clear All Resumes", use_container_width=True):
         clear_all_resumes()
         st.session_state.parsed_results = []
+        st.session_state.batch_summary = None
         st.success("All records cleared!")
         st.rerun()
 
 # ══════════════════════════════════════════════════════════
 #  MAIN TABS
 # ══════════════════════════════════════════════════════════
-tab_upload, tab_search, tab_database, tab_guide = st.tabs([
+tab_upload, tab_search, tab_match, tab_database, tab_perf, tab_guide = st.tabs([
     "📤  Upload & Parse",
     "🔍  Search & Filter",
+    "🎯  JD Match",
     "🗄️  Database",
+    "⏱️  Performance",
     "📖  How to Use",
 ])
 
@@ -669,29 +519,65 @@ with tab_upload:
     )
 
     if uploaded_files:
-        col_parse, col_clear = st.columns([1, 5])
+        col_parse, col_workers, col_clear = st.columns([1, 1, 4])
         with col_parse:
             parse_btn = st.button(
                 "⚡ Parse Resumes", type="primary", use_container_width=True)
+        with col_workers:
+            workers = st.number_input(
+                "Worker processes", min_value=1, max_value=os.cpu_count() or 1,
+                value=default_workers(), label_visibility="collapsed",
+                help="Parallel parser processes (1 = parse in this process)")
 
         if parse_btn:
+            # Queued and parsed by the background worker; the page stays responsive
+            # and the job survives a closed tab or an app restart
+            files = [(uf.name, uf.getvalue()) for uf in uploaded_files]
+            st.session_state.job_id = submit_job(
+                files, workers=int(workers), profiler=None if profiler == "Off" else profiler)
             st.session_state.parsed_results = []
-            progress = st.progress(0, text="Parsing resumes…")
-            for i, uf in enumerate(uploaded_files):
-                progress.progress((i + 1) / len(uploaded_files),
-                                  text=f"Parsing {uf.name}… ({i+1}/{len(uploaded_files)})")
-                file_bytes = uf.read()
-                text = extract_text(file_bytes, uf.name)
-                if text:
-                    result = parse_resume(text, uf.name)
-                    save_resume(result)
-                    st.session_state.parsed_results.append(result)
-                else:
-                    st.warning(f"⚠️ Could not extract text from `{uf.name}`")
-            progress.empty()
-            st.success(
-                f"✅ Parsed {len(st.session_state.parsed_results)} resume(s) successfully!")
-            st.rerun()
+            st.session_state.batch_summary = None
+
+    job_id = st.session_state.get("job_id")
+    if job_id and st.session_state.get("loaded_job") != job_id:
+        job_progress(job_id)
+
+    if st.session_state.get("batch_summary"):
+        summary = st.session_state.batch_summary
+        st.success(
+            f"✅ Parsed {summary['parsed']} resume(s) successfully in {summary['seconds']:.1f}s! "
+            f"Cache: {summary['cache_hits']} hit(s), {summary['cache_miss']} miss(es)"
+            + (f" · {summary['duplicates']} duplicate upload(s) skipped" if summary["duplicates"] else ""))
+        if summary.get("error"):
+            st.error(f"❌ Parse job failed: {summary['error']}")
+        uploaded = {r["id"] for r in st.session_state.parsed_results}
+        flagged = {i for p in duplicate_pairs(sorted(uploaded)) for i in (p["a"], p["b"])} & uploaded
+        if flagged:
+            st.info(f"🧬 {len(flagged)} resume(s) look like candidates already in the database — "
+                    "review them under **Likely Duplicates** in the Database tab")
+        for filename, error in summary.get("problems", []):
+            if error:
+                st.warning(f"⚠️ Failed to parse `{filename}`: {error}")
+            else:
+                st.warning(f"⚠️ Could not extract text from `{filename}`")
+        if summary.get("profile"):
+            with st.expander("🔬 Profile Report"):
+                st.code(summary["profile"], language=None)
+                st.download_button("⬇️ Download Profile Report", data=summary["profile"],
+                                   file_name="parse_profile.txt", mime="text/plain")
+
+    recent_jobs = list_jobs(5)
+    if recent_jobs:
+        with st.expander("🧾 Recent Parse Jobs"):
+            for job in recent_jobs:
+                jc1, jc2 = st.columns([4, 1])
+                jc1.markdown(f"`{job.created_at}` · **{job.status}** · {job.done}/{job.total} file(s)"
+                             + (" · " + ", ".join(f"{n} {k}" for k, n in sorted(job.counts.items()))
+                                if job.finished else ""))
+                if job.finished and jc2.button("Show", key=f"show_job_{job.id}"):
+                    st.session_state.job_id = job.id
+                    show_job(job.id)
+                    st.rerun()
 
     # ── Display Results ──────────────────────────────────
     if st.session_state.parsed_results:
@@ -721,6 +607,9 @@ with tab_upload:
                     <span class='score-pct' style='color:{score_color};'>{score}%</span>
                 </div>
                 """, unsafe_allow_html=True)
+                if res.get("truncated"):
+                    st.caption(
+                        "✂️ Long document — only the first pages/characters were parsed")
 
                 c1, c2 = st.columns(2)
 
@@ -790,11 +679,13 @@ with tab_upload:
                                     unsafe_allow_html=True)
                     st.markdown("</div>", unsafe_allow_html=True)
 
+                full_text_toggle(res["id"], "upload")
+                find_similar(res["id"], "upload")
+
                 # Download this resume's JSON
                 st.download_button(
                     "⬇️ Download as JSON",
-                    data=json.dumps(
-                        {k: v for k, v in res.items() if k != "raw_text"}, indent=2),
+                    data=json.dumps(res, indent=2),
                     file_name=f"{res['name'] or res['id']}_parsed.json",
                     mime="application/json",
                     key=f"json_{res['id']}",
@@ -807,15 +698,15 @@ with tab_search:
     st.markdown("<div class='sec-head'>🔍 Search & Filter Candidates</div>",
                 unsafe_allow_html=True)
 
-    all_resumes = fetch_all_resumes()
+    total_resumes = get_stats()["total"]
 
-    if not all_resumes:
+    if not total_resumes:
         st.info(
             "💡 No resumes in the database yet. Upload some in the **Upload & Parse** tab!")
     else:
         # ── Filters ─────────────────────────────────────
         with st.container():
-            f1, f2, f3 = st.columns([2, 2, 1])
+            f1, f2, f3, f4 = st.columns([2, 2, 1, 1])
             with f1:
                 search_name = st.text_input(
                     "🔎 Search by Name / Email", placeholder="e.g. John, john@email.com")
@@ -823,97 +714,146 @@ with tab_search:
                 search_skill = st.text_input(
                     "⚡ Filter by Skill", placeholder="e.g. Python, React, SQL")
             with f3:
+                skill_mode = st.radio("Skills match", ["Any", "All"], horizontal=True,
+                                      help="Comma-separated skills: match any (OR) or all (AND)")
+            with f4:
                 min_score = st.slider("Min Score %", 0, 100, 0, 10)
-
-        # ── Apply Filters ────────────────────────────────
-        filtered = all_resumes
-        if search_name:
-            q = search_name.lower()
-            filtered = [r for r in filtered if
-                        q in r["name"].lower() or q in r["email"].lower()]
-        if search_skill:
-            q = search_skill.lower()
-            filtered = [r for r in filtered if
-                        any(q in s.lower() for s in r["skills"])]
-        if min_score > 0:
-            filtered = [r for r in filtered if r["score"] >= min_score]
+            search_keywords = st.text_input(
+                "📝 Keyword search in resume text",
+                placeholder='e.g. "kubernetes operator", Acme, kube*  —  quotes for phrases, * for prefixes')
+
+        # ── Apply Filters (in SQL, on indexed columns) ───
+        filters = dict(
+            text=search_name,
+            skills=[t for t in search_skill.split(",") if t.strip()],
+            match_all=(skill_mode == "All"),
+            min_score=min_score,
+            keywords=search_keywords,
+        )
+        total_filtered = count_resumes(**filters)
 
         st.markdown(f"<div style='color:#64748b;font-size:0.85rem;margin-bottom:1rem;'>"
-                    f"Showing <strong style='color:#00d4aa;'>{len(filtered)}</strong> of "
-                    f"<strong>{len(all_resumes)}</strong> candidates</div>",
+                    f"Showing <strong style='color:#00d4aa;'>{total_filtered}</strong> of "
+                    f"<strong>{total_resumes}</strong> candidates</div>",
                     unsafe_allow_html=True)
 
-        if not filtered:
+        if not total_filtered:
             st.warning("No candidates match your filters.")
         else:
+            page_state = pager("search", total_filtered, tuple(
+                tuple(v) if isinstance(v, list) else v for v in filters.values()))
+            # Only the visible page is fetched, in one projected query that
+            # feeds both the grid and the cards
+            keyset = not filters["keywords"].strip()
+            page_df = fetch_table(page_state, keyset=keyset, snippet=True, **filters)
+
             # Summary table
-            df_filtered = resumes_to_df(filtered)
-            st.dataframe(df_filtered, use_container_width=True,
-                         hide_index=True, height=350)
-
-            # CSV Export of filtered results
-            csv = df_filtered.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                "⬇️ Download Filtered Results as CSV",
-                data=csv,
-                file_name=f"candidates_filtered_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                mime="text/csv",
-            )
+            st.dataframe(page_df.drop(columns="Snippet"),
+                         use_container_width=True, hide_index=True, height=350)
+
+            # Export of filtered results (all pages, built only on request)
+            export_controls("search", "candidates_filtered", **filters)
 
             st.markdown("<hr>", unsafe_allow_html=True)
 
             # Candidate cards
             st.markdown("**Candidate Cards**")
-            for r in filtered:
-                score = r["score"]
-                score_color = "#00d4aa" if score >= 70 else "#f59e0b" if score >= 40 else "#f87171"
-                with st.expander(f"👤 {r['name'] or 'Unknown'}  |  {r['email'] or '—'}  |  Score: {score}%"):
+            for r in page_df.to_dict("records"):
+                score = r["Score %"]
+                with st.expander(f"👤 {r['Name'] or 'Unknown'}  |  {r['Email'] or '—'}  |  Score: {score}%"):
+                    if r["Snippet"]:
+                        st.markdown(f"<div style='font-size:0.85rem;color:#94a3b8;margin-bottom:0.5rem;'>"
+                                    f"{highlight_html(r['Snippet'])}</div>", unsafe_allow_html=True)
                     ca, cb = st.columns(2)
                     with ca:
-                        st.markdown(f"**📞 Phone:** {r['phone'] or '—'}")
-                        st.markdown(f"**📅 Parsed:** {r['parsed_at']}")
-                        st.markdown(f"**📁 File:** {r['filename']}")
-                        if r["linkedin"]:
-                            st.markdown(
-                                f"**🔗 LinkedIn:** [{r['linkedin']}]({r['linkedin']})")
-                        if r["education"]:
-                            st.markdown("**🎓 Education:**")
-                            for e in r["education"][:3]:
-                                st.markdown(f"  - {e}")
+                        st.markdown(f"**📞 Phone:** {r['Phone'] or '—'}")
+                        st.markdown(f"**📅 Parsed:** {r['Parsed At']}")
+                        st.markdown(f"**📁 File:** {r['File']}")
                     with cb:
-                        st.markdown(f"**⚡ Skills ({len(r['skills'])}):**")
-                        tags = "".join(
-                            f"<span class='skill-tag'>{s}</span>" for s in r["skills"][:15])
-                        st.markdown(
-                            f"<div class='skill-wrap'>{tags}</div>", unsafe_allow_html=True)
+                        st.markdown(f"**⚡ Skills:** {r['Skills'] or '—'}")
+                    details_toggle(r["ID"], "search")
+                    full_text_toggle(r["ID"], "search")
+                    find_similar(r["ID"], "search")
                     del_col, _ = st.columns([1, 5])
                     with del_col:
-                        if st.button("🗑️ Delete", key=f"del_{r['id']}"):
-                            delete_resume(r["id"])
+                        if st.button("🗑️ Delete", key=f"del_{r['ID']}"):
+                            delete_resume(r["ID"])
                             st.rerun()
 
 # ══════════════════════════════════════════════════════════
-#  TAB 3 — DATABASE
+#  TAB 3 — JD MATCH
+# ══════════════════════════════════════════════════════════
+with tab_match:
+    st.markdown("<div class='sec-head'>🎯 Rank Candidates Against a Job Description</div>",
+                unsafe_allow_html=True)
+
+    if not get_stats()["total"]:
+        st.info("💡 No resumes in the database yet. Upload some in the **Upload & Parse** tab!")
+    else:
+        jd_text = st.text_area(
+            "Job description", height=220,
+            placeholder="Paste the job description. Skills under a \"Nice to have\" or "
+                        "\"Preferred\" heading count as optional.")
+        detected = parse_job_description(jd_text)
+        skill_options = sorted({s.title() for s in SKILL_MATCHER.skills})
+        m1, m2 = st.columns(2)
+        with m1:
+            required = st.multiselect("Required skills", skill_options,
+                                      default=[s.title() for s in detected.required])
+        with m2:
+            optional = st.multiselect("Optional skills", skill_options,
+                                      default=[s.title() for s in detected.optional])
+        o1, o2, o3, o4 = st.columns(4)
+        with o1:
+            top_k = st.number_input("Top candidates", 1, 500, 20, step=5)
+        with o2:
+            metric = st.radio("Ranking", METRICS, horizontal=True,
+                              format_func={"overlap": "Weighted overlap", "jaccard": "Jaccard"}.get,
+                              help="Jaccard also penalizes skills unrelated to the job")
+        with o3:
+            required_weight = st.slider("Required weight", 1.0, 5.0, 2.0, 0.5,
+                                        help="How much more a required skill counts than an optional one")
+        with o4:
+            require_all = st.checkbox("Must have all required", value=False)
+
+        if not (required or optional):
+            st.caption("Paste a job description or pick skills to rank candidates.")
+        else:
+            matches = match_candidates(required, optional, int(top_k), metric,
+                                       required_weight, require_all)
+            if not matches:
+                st.warning("No candidates match these skills.")
+            else:
+                resumes = {r["id"]: r for r in fetch_resumes([m.resume_id for m in matches])}
+                st.dataframe(pd.DataFrame([{
+                    "Rank":     rank,
+                    "Match %":  round(m.score * 100),
+                    "Name":     resumes[m.resume_id]["name"],
+                    "Email":    resumes[m.resume_id]["email"],
+                    "Matched":  ", ".join(s.title() for s in m.matched),
+                    "Missing":  ", ".join(s.title() for s in m.missing),
+                    "Score %":  resumes[m.resume_id]["score"],
+                    "File":     resumes[m.resume_id]["filename"],
+                } for rank, m in enumerate(matches, 1) if m.resume_id in resumes]),
+                    use_container_width=True, hide_index=True, height=420)
+
+# ══════════════════════════════════════════════════════════
+#  TAB 4 — DATABASE
 # ══════════════════════════════════════════════════════════
 with tab_database:
     st.markdown("<div class='sec-head'>🗄️ Candidate Database</div>",
                 unsafe_allow_html=True)
 
-    all_resumes = fetch_all_resumes()
+    # Metric cards (from the aggregate tables, not a scan of every resume)
     stats = get_stats()
-
-    # Metric cards
+    skill_counts = top_skills(15)
     mc1, mc2, mc3, mc4 = st.columns(4)
-    all_skills_flat = [s for r in all_resumes for s in r["skills"]]
-    top_skill = max(set(all_skills_flat),
-                    key=all_skills_flat.count) if all_skills_flat else "—"
-    avg_skills = round(sum(len(r["skills"])
-                       for r in all_resumes) / max(len(all_resumes), 1))
+    top_skill = skill_counts[0][0] if skill_counts else "—"
 
     for col, val, color, label in [
         (mc1, stats["total"],      "#00d4aa", "Total Candidates"),
         (mc2, f"{stats['avg_score']}%", "#6c8dff", "Avg Completeness"),
-        (mc3, avg_skills,          "#f59e0b", "Avg Skills/Resume"),
+        (mc3, stats["avg_skills"], "#f59e0b", "Avg Skills/Resume"),
         (mc4, top_skill,           "#f472b6", "Top Skill"),
     ]:
         with col:
@@ -925,49 +865,90 @@ with tab_database:
 
     st.markdown("<hr>", unsafe_allow_html=True)
 
-    if not all_resumes:
+    if not stats["total"]:
         st.info("💡 No data yet. Upload resumes in the **Upload & Parse** tab!")
     else:
-        df_all = resumes_to_df(all_resumes)
-        st.dataframe(df_all, use_container_width=True,
+        db_page = pager("database", stats["total"])
+        st.dataframe(fetch_table(db_page), use_container_width=True,
                      height=400, hide_index=True)
-
-        dl_c1, dl_c2 = st.columns(2)
-        with dl_c1:
-            csv_all = df_all.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                "⬇️ Download All as CSV",
-                data=csv_all,
-                file_name=f"all_candidates_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                mime="text/csv",
-                use_container_width=True,
-            )
-        with dl_c2:
-            json_all = json.dumps(
-                [{k: v for k, v in r.items() if k != "raw_text"}
-                 for r in all_resumes],
-                indent=2
-            ).encode("utf-8")
-            st.download_button(
-                "⬇️ Download All as JSON",
-                data=json_all,
-                file_name=f"all_candidates_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
-                mime="application/json",
-                use_container_width=True,
-            )
+        export_controls("database", "all_candidates")
+
+        # Likely duplicates: same email/phone or near-identical text
+        dup_groups = duplicate_groups()
+        if dup_groups:
+            with st.expander(f"🧬 Likely Duplicates ({len(dup_groups)} candidate(s) with several resumes)"):
+                if st.button("🔀 Merge all into their latest resume", key="merge_all_dups"):
+                    for group in dup_groups:
+                        merge_duplicates(group)
+                    st.rerun()
+                for group in dup_groups[:DUP_GROUPS_SHOWN]:
+                    st.dataframe(pd.DataFrame([{
+                        "Name":      r["name"],
+                        "Email":     r["email"],
+                        "Phone":     r["phone"],
+                        "Score %":   r["score"],
+                        "File":      r["filename"],
+                        "Parsed At": r["parsed_at"],
+                    } for r in fetch_resumes(group)]), use_container_width=True, hide_index=True)
+                    dc1, dc2, _ = st.columns([1, 1, 3])
+                    if dc1.button("🔀 Merge into latest", key=f"merge_{group[0]}",
+                                  help="Fill in missing contact details and combine skills, "
+                                       "education and experience, then drop the older resumes"):
+                        merge_duplicates(group)
+                        st.rerun()
+                    if dc2.button("🗑️ Keep latest only", key=f"keep_{group[0]}"):
+                        merge_duplicates(group, merge=False)
+                        st.rerun()
+                if len(dup_groups) > DUP_GROUPS_SHOWN:
+                    st.caption(f"… and {len(dup_groups) - DUP_GROUPS_SHOWN} more")
 
         # Skills frequency chart
-        if all_skills_flat:
+        if skill_counts:
             st.markdown("<hr>", unsafe_allow_html=True)
             st.markdown("**⚡ Top Skills Across All Candidates**")
-            from collections import Counter
-            skill_counts = Counter(all_skills_flat).most_common(15)
             df_skills = pd.DataFrame(skill_counts, columns=["Skill", "Count"])
             st.bar_chart(df_skills.set_index("Skill"),
                          color="#00d4aa", use_container_width=True)
 
 # ══════════════════════════════════════════════════════════
-#  TAB 4 — HOW TO USE
+#  TAB 5 — PERFORMANCE
+# ══════════════════════════════════════════════════════════
+with tab_perf:
+    st.markdown("<div class='sec-head'>⏱️ Parse Performance</div>",
+                unsafe_allow_html=True)
+
+    metrics = fetch_metrics()
+    if not metrics:
+        st.info("💡 No timings yet. Parse some resumes in the **Upload & Parse** tab!")
+    else:
+        st.caption(f"Last {len(metrics)} parsed resume(s). Results served from the parse cache aren't timed.")
+        df_times = pd.DataFrame([m["timings"] for m in metrics])
+        df_times = df_times[[s for s in STAGES if s in df_times.columns]]
+        df_times["total"] = [m["total_ms"] for m in metrics]
+        df_stages = pd.DataFrame({
+            "p50 ms":  df_times.quantile(0.5),
+            "p95 ms":  df_times.quantile(0.95),
+            "Mean ms": df_times.mean(),
+            "Share %": df_times.mean() / df_times["total"].mean() * 100,
+        }).round(2).rename_axis("Stage")
+        st.dataframe(df_stages, use_container_width=True)
+
+        st.markdown("**🐢 Slowest Files**")
+        df_slow = pd.DataFrame([{
+            "File":          m["filename"],
+            "Total ms":      round(m["total_ms"], 1),
+            "Slowest Stage": max(m["timings"], key=m["timings"].get),
+            "Pages":         m["pages"],
+            "Chars":         m["chars"],
+            "Parsed At":     m["measured_at"],
+        } for m in sorted(metrics, key=lambda m: m["total_ms"], reverse=True)[:10]])
+        st.dataframe(df_slow, use_container_width=True, hide_index=True)
+
+        st.markdown("**📊 p50 by Stage (ms)**")
+        st.bar_chart(df_stages["p50 ms"].drop("total"), color="#6c8dff", use_container_width=True)
+
+# ══════════════════════════════════════════════════════════
+#  TAB 6 — HOW TO USE
 # ══════════════════════════════════════════════════════════
 with tab_guide:
     st.markdown("<div class='sec-head'>📖 How to Use Resume Parser AI</div>",
@@ -985,7 +966,7 @@ with tab_guide:
         <div class='info-row'><span class='info-label'>Step 4</span>
             <span class='info-val'>View extracted data, then search/filter in the <strong>Search & Filter</strong> tab</span></div>
         <div class='info-row'><span class='info-label'>Step 5</span>
-            <span class='info-val'>Download results as <strong>CSV or JSON</strong> from the Database tab</span></div>
+            <span class='info-val'>Export results as <strong>CSV, JSON, NDJSON or Parquet</strong> from the Database tab</span></div>
     </div>
     """, unsafe_allow_html=True)
 
@@ -1016,6 +997,8 @@ with tab_guide:
         <div class='info-row'><span class='info-val'>✅ Resumes with clear section headers work best (Education, Experience, Skills)</span></div>
         <div class='info-row'><span class='info-val'>✅ Upload multiple resumes at once for batch processing</span></div>
         <div class='info-row'><span class='info-val'>✅ Use the Search tab to filter by skill for quick shortlisting</span></div>
+        <div class='info-row'><span class='info-val'>✅ Paste a job description in the JD Match tab to rank every candidate by skill fit</span></div>
+        <div class='info-row'><span class='info-val'>✅ Keyword search covers the resume text — "quotes" for phrases, kube* for prefixes</span></div>
         <div class='info-row'><span class='info-val'>⚠️ Scanned/image PDFs won't extract text (OCR not included in this version)</span></div>
     </div>
     """, unsafe_allow_html=True)
@@ -0,0 +1,78 @@
+"""Time JD matching over a large synthetic candidate pool.
+
+    python benchmarks/bench_match.py [-n 500000] [--skills 15] [--repeat 20] [--db resumes.db]
+
+Candidates get ``--skills`` random taxonomy skills each, drawn with a skewed
+popularity like real resumes. Reports the cost of building the bitset index
+and of top-k queries for a few job shapes. With --db, also times loading
+the index from that database.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from resume_parser import db  # noqa: E402
+from resume_parser.matching import SkillIndex  # noqa: E402
+from resume_parser.skills import SKILLS_DB  # noqa: E402
+
+QUERIES = {
+    "3 required": (3, 0),
+    "5 req + 5 opt": (5, 5),
+    "12 req + 8 opt": (12, 8),
+}
+
+
+def synthetic_index(n: int, per_candidate: int, seed: int) -> SkillIndex:
+    rng = random.Random(seed)
+    skills = sorted(SKILLS_DB)
+    ids = {skill: i for i, skill in enumerate(skills)}
+    weights = [1 / (rank + 1) for rank in range(len(skills))]
+    blobs = [db.pack_skill_bits(set(rng.choices(skills, weights, k=per_candidate)), ids)
+             for _ in range(n)]
+    return SkillIndex([f"{i:016x}" for i in range(n)], blobs, ids)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=500_000, help="candidates (default: %(default)s)")
+    ap.add_argument("--skills", type=int, default=15, help="skills drawn per candidate")
+    ap.add_argument("-k", type=int, default=20)
+    ap.add_argument("--repeat", type=int, default=20, help="runs per query")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--db", help="also time loading the index from this database")
+    args = ap.parse_args()
+
+    start = time.perf_counter()
+    index = synthetic_index(args.n, args.skills, args.seed)
+    print(f"built {len(index)} candidates x {index.words} word(s) "
+          f"in {time.perf_counter() - start:.2f}s (Python packing, not part of a query)")
+
+    rng = random.Random(args.seed)
+    skills = sorted(SKILLS_DB)
+    print(f"{'query':<18}{'metric':<10}{'p50 ms':>10}{'max ms':>10}")
+    for name, (n_req, n_opt) in QUERIES.items():
+        picked = rng.sample(skills, n_req + n_opt)
+        for metric in ("overlap", "jaccard"):
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                index.top_k(picked[:n_req], picked[n_req:], args.k, metric)
+                times.append((time.perf_counter() - start) * 1000)
+            print(f"{name:<18}{metric:<10}{statistics.median(times):>10.2f}{max(times):>10.2f}")
+
+    if args.db:
+        db.DB_PATH = args.db
+        start = time.perf_counter()
+        loaded = SkillIndex.load()
+        print(f"loaded {len(loaded)} candidates from {args.db} "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Compare PDF text-extraction backends on a corpus of PDFs.
+
+    python benchmarks/bench_pdf_backends.py path/to/pdfs [more paths...] [--json out.json]
+
+Every backend reads every page (no page/char budget). Reports pages/s and the
+characters each backend extracted, relative to pdfplumber.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from resume_parser.extract import _extract_pdf_with, extract_pdf  # noqa: E402
+from resume_parser.pdf_backends import ACCURATE_BACKEND, PDF_BACKENDS  # noqa: E402
+
+
+def collect_pdfs(paths: list) -> list:
+    files = []
+    for p in map(Path, paths):
+        files.extend(sorted(p.rglob("*.pdf")) if p.is_dir() else [p])
+    return [(f.name, f.read_bytes()) for f in files]
+
+
+def run_backend(name: str, corpus: list) -> dict:
+    pages = chars = failures = 0
+    start = time.perf_counter()
+    for _, data in corpus:
+        try:
+            if name == "auto":
+                ex = extract_pdf(data, max_pages=0, max_chars=0, backend="auto")
+            else:
+                ex = _extract_pdf_with(name, data, 0, 0)
+        except Exception:
+            failures += 1
+            continue
+        pages += ex.pages
+        chars += len(ex.text)
+    elapsed = time.perf_counter() - start
+    return {
+        "backend": name,
+        "files": len(corpus),
+        "pages": pages,
+        "chars": chars,
+        "failures": failures,
+        "seconds": round(elapsed, 4),
+        "pages_per_s": round(pages / elapsed, 2) if elapsed else None,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("paths", nargs="+")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args()
+
+    corpus = collect_pdfs(args.paths)
+    if not corpus:
+        sys.exit("no PDFs found")
+    results = [run_backend(name, corpus) for name in [*sorted(PDF_BACKENDS), "auto"]]
+
+    baseline = next(r for r in results if r["backend"] == ACCURATE_BACKEND)
+    print(f"{len(corpus)} PDF(s)")
+    print(f"{'backend':<12}{'pages/s':>10}{'pages':>8}{'chars':>12}{'vs ' + ACCURATE_BACKEND:>16}{'failed':>8}")
+    for r in results:
+        ratio = r["chars"] / baseline["chars"] if baseline["chars"] else 0
+        r["chars_vs_accurate"] = round(ratio, 4)
+        print(f"{r['backend']:<12}{r['pages_per_s'] or 0:>10.1f}{r['pages']:>8}{r['chars']:>12}"
+              f"{ratio:>15.1%}{r['failures']:>8}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Time "more like this" search over a large synthetic candidate pool.
+
+    python benchmarks/bench_similar.py [-n 100000] [--terms 250] [--repeat 20] [--db /tmp/similar.db]
+
+Candidates get about ``--terms`` distinct terms each, drawn with a Zipf-like
+popularity from a 50k-word vocabulary, and are stored in a scratch database
+(created if missing). Reports building the index from the database, loading
+the saved snapshot, applying one changed row, cosine top-k queries, and a
+batch of changes large enough to trigger a rebuild.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from resume_parser import db  # noqa: E402
+from resume_parser.similar import (COMPACT_FRACTION, COMPACT_MIN_ROWS, HASH_BITS, TERM_DTYPE,  # noqa: E402
+                                   SimilarIndex, snapshot_path)
+
+VOCABULARY = 50_000
+
+
+def synthetic_terms(rng: np.random.Generator, popularity: np.ndarray, terms: int) -> bytes:
+    features, counts = np.unique(rng.choice(len(popularity), size=terms * 2, p=popularity),
+                                 return_counts=True)
+    packed = np.empty(len(features), TERM_DTYPE)
+    packed["feature"], packed["count"] = features % 2**HASH_BITS, counts
+    return packed.tobytes()
+
+
+def _ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=100_000, help="candidates (default: %(default)s)")
+    ap.add_argument("--terms", type=int, default=250, help="approximate distinct terms per candidate")
+    ap.add_argument("-k", type=int, default=20)
+    ap.add_argument("--repeat", type=int, default=20, help="queries to time")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--db", default="/tmp/bench_similar.db", help="scratch database")
+    args = ap.parse_args()
+
+    db.DB_PATH = args.db
+    rng = np.random.default_rng(args.seed)
+    popularity = 1 / np.arange(1, VOCABULARY + 1)
+    popularity /= popularity.sum()
+    have = db.count_terms()
+    if have < args.n:
+        start = time.perf_counter()
+        for lo in range(have, args.n, 5000):
+            db.save_terms([(f"{i:016x}", synthetic_terms(rng, popularity, args.terms))
+                           for i in range(lo, min(lo + 5000, args.n))])
+        print(f"stored {args.n - have} synthetic candidates in {_ms(start) / 1000:.1f}s")
+
+    path = snapshot_path()
+    if os.path.exists(path):
+        os.remove(path)
+    start = time.perf_counter()
+    index = SimilarIndex.load(path)
+    print(f"build from database + save snapshot: {_ms(start):8.0f} ms "
+          f"({len(index)} candidates, {index.main.nnz / len(index):.0f} terms each, "
+          f"{os.path.getsize(path) / 1e6:.0f} MB snapshot)")
+    start = time.perf_counter()
+    index = SimilarIndex.load(path)
+    print(f"load snapshot:                       {_ms(start):8.0f} ms")
+
+    changed = index.resume_ids[0]
+    db.save_terms([(changed, synthetic_terms(rng, popularity, args.terms))])
+    start = time.perf_counter()
+    index = index.refresh()
+    print(f"apply 1 changed row:                 {_ms(start):8.0f} ms")
+
+    times = []
+    for resume_id in rng.choice(list(index.row_of), args.repeat):
+        start = time.perf_counter()
+        index.top_k(resume_id, args.k)
+        times.append(_ms(start))
+    print(f"top-{args.k} query:  p50 {statistics.median(times):.1f} ms, max {max(times):.1f} ms")
+
+    # Enough changed rows to trigger a rebuild (and a new snapshot)
+    rebuild = int(max(COMPACT_MIN_ROWS, COMPACT_FRACTION * len(index))) + 1
+    db.save_terms([(resume_id, synthetic_terms(rng, popularity, args.terms))
+                   for resume_id in index.resume_ids[:rebuild]])
+    start = time.perf_counter()
+    index = index.refresh()
+    print(f"apply {rebuild} changed rows + rebuild: {_ms(start):8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
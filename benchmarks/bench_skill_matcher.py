@@ -0,0 +1,87 @@
+"""Compare the single-pass SkillMatcher against the old per-skill regex loop.
+
+    python benchmarks/bench_skill_matcher.py [--docs 200] [--taxonomy 5000]
+"""
+import argparse
+import random
+import re
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from resume_parser.skills import SKILLS_DB, SkillMatcher  # noqa: E402
+
+
+def legacy_parse_skills(text: str, skills) -> list:
+    text_lower = text.lower()
+    found = set()
+    for skill in skills:
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, text_lower):
+            found.add(skill.title())
+    return sorted(found)
+
+
+def synthetic_taxonomy(size: int, rng: random.Random) -> set:
+    terms = set(SKILLS_DB)
+    while len(terms) < size:
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+                 for _ in range(rng.randint(1, 3))]
+        terms.add(" ".join(words) + rng.choice(["", "", "", ".js", "++", "/ops"]))
+    return terms
+
+
+def synthetic_resume(skills: list, rng: random.Random, words: int = 700) -> str:
+    filler = ["led", "built", "team", "project", "delivered", "2019", "-", "(", ")",
+              "with", "using", "for", "and", "senior", "engineer", "university"]
+    out = []
+    for _ in range(words):
+        out.append(rng.choice(skills) if rng.random() < 0.08 else rng.choice(filler))
+        if rng.random() < 0.1:
+            out.append("\n")
+    return " ".join(out)
+
+
+def bench(label: str, skills: set, docs: list):
+    matcher_start = time.perf_counter()
+    matcher = SkillMatcher(skills)
+    build = time.perf_counter() - matcher_start
+
+    t0 = time.perf_counter()
+    old = [legacy_parse_skills(d, skills) for d in docs]
+    t_old = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new = [sorted({s.title() for s in matcher.find(d)}) for d in docs]
+    t_new = time.perf_counter() - t0
+
+    assert old == new, "matcher output differs from the per-skill loop"
+    print(f"{label:<22} terms={len(skills):<6} docs={len(docs):<5} "
+          f"loop={t_old * 1000 / len(docs):8.2f} ms/doc  "
+          f"matcher={t_new * 1000 / len(docs):7.3f} ms/doc  "
+          f"speedup={t_old / t_new:6.1f}x  build={build * 1000:.0f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--docs", type=int, default=200)
+    ap.add_argument("--taxonomy", type=int, default=5000)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    builtin = sorted(SKILLS_DB)
+    docs = [synthetic_resume(builtin, rng) for _ in range(args.docs)]
+    bench("builtin SKILLS_DB", SKILLS_DB, docs)
+
+    big = synthetic_taxonomy(args.taxonomy, rng)
+    big_list = sorted(big)
+    docs = [synthetic_resume(big_list, rng) for _ in range(args.docs)]
+    bench("synthetic taxonomy", big, docs)
+
+
+if __name__ == "__main__":
+    main()
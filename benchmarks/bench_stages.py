@@ -0,0 +1,264 @@
+"""Time every stage of the parsing pipeline separately.
+
+    python benchmarks/bench_stages.py [--corpus DIR | -n 200] [--rows 1000 10000 100000]
+        [--json out.json] [--compare baseline.json]
+
+Without --corpus a synthetic corpus is generated in memory (see make_corpus.py).
+Extraction and parser stages run over the corpus; the database stages run
+against a fresh temporary SQLite file filled to each --rows size. --json writes
+machine-readable results; --compare prints the change against an earlier
+run and exits non-zero when a stage got slower than --tolerance allows.
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from make_corpus import generate_corpus  # noqa: E402
+
+from resume_parser import db  # noqa: E402
+from resume_parser.dedupe import minhash_signature  # noqa: E402
+from resume_parser.extract import extract_text_docx, extract_text_pdf  # noqa: E402
+from resume_parser.parsing import (PARSER_VERSION, build_result, load_nlp,  # noqa: E402
+                                   nlp_pipe, parse_education, parse_experience)
+from resume_parser.sections import sectionize  # noqa: E402
+from resume_parser.similar import term_vector  # noqa: E402
+from resume_parser.skills import parse_skills  # noqa: E402
+
+
+def summarize(stage: str, times: list, rows: int = None, total: float = None) -> dict:
+    # ``times`` are per-item seconds; batched stages pass only ``total``
+    total = sum(times) if total is None else total
+    n = len(times)
+    result = {
+        "stage": stage,
+        "rows": rows,
+        "n": n,
+        "total_s": round(total, 6),
+        "mean_ms": round(total / n * 1e3, 4) if n else None,
+        "p50_ms": None,
+        "p95_ms": None,
+        "per_s": round(n / total, 2) if total else None,
+    }
+    if n > 1 and any(times):
+        q = statistics.quantiles(times, n=20)
+        result["p50_ms"] = round(statistics.median(times) * 1e3, 4)
+        result["p95_ms"] = round(q[18] * 1e3, 4)
+    return result
+
+
+def timed(fn, items: list) -> tuple:
+    times, out = [], []
+    for item in items:
+        start = time.perf_counter()
+        out.append(fn(item))
+        times.append(time.perf_counter() - start)
+    return times, out
+
+
+# ══════════════════════════════════════════════════════════
+#  STAGES
+# ══════════════════════════════════════════════════════════
+
+
+def bench_parsing(corpus: list, batch_size: int) -> tuple:
+    results = []
+    pdfs = [data for name, data in corpus if name.lower().endswith(".pdf")]
+    docxs = [data for name, data in corpus if name.lower().endswith(".docx")]
+    texts = []
+    if pdfs:
+        times, out = timed(extract_text_pdf, pdfs)
+        results.append(summarize("extract_text_pdf", times))
+        texts += out
+    if docxs:
+        times, out = timed(extract_text_docx, docxs)
+        results.append(summarize("extract_text_docx", times))
+        texts += out
+    texts = [t for t in texts if t]
+
+    docs = None
+    try:
+        nlp = load_nlp()
+    except OSError as e:
+        print(f"skipping spacy_ner: {e}", file=sys.stderr)
+    else:
+        start = time.perf_counter()
+        docs = list(nlp_pipe(texts, nlp, batch_size=batch_size))
+        results.append(summarize("spacy_ner", [0.0] * len(texts),
+                                 total=time.perf_counter() - start))
+
+    times, _ = timed(parse_skills, texts)
+    results.append(summarize("parse_skills", times))
+    times, sections = timed(sectionize, texts)
+    results.append(summarize("sectionize", times))
+    times, _ = timed(parse_education, sections)
+    results.append(summarize("parse_education", times))
+    times, _ = timed(parse_experience, sections)
+    results.append(summarize("parse_experience", times))
+    times, _ = timed(minhash_signature, texts)
+    results.append(summarize("minhash_signature", times))
+    times, _ = timed(term_vector, texts)
+    results.append(summarize("term_vector", times))
+
+    # Rows for the database stages; without a model, names come from the
+    # line-based fallback only
+    empty_doc = type("Doc", (), {"ents": ()})()
+    parsed = [build_result(t, f"resume_{i}", docs[i] if docs else empty_doc)
+              for i, t in enumerate(texts)]
+    return results, parsed
+
+
+def _rows(template: list, start: int, count: int):
+    # Distinct candidates: repeated templates would otherwise all be flagged
+    # as duplicates of each other
+    for i in range(start, start + count):
+        row = dict(template[i % len(template)])
+        row["id"] = f"{i:016x}"
+        row["content_hash"] = f"{i:064x}"
+        row["email"] = f"candidate{i}@example.com"
+        row["phone"] = ""
+        row["minhash"] = b""
+        yield row
+
+
+def bench_database(template: list, sizes: list, save_sample: int, repeat: int) -> list:
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db.close_conn()
+            db.DB_PATH = str(Path(tmp) / "bench.db")
+            db.init_db()
+            loaded = max(0, size - save_sample)
+            start = time.perf_counter()
+            for chunk_start in range(0, loaded, 5000):
+                db.save_resumes(list(_rows(template, chunk_start,
+                                           min(5000, loaded - chunk_start))))
+            results.append(summarize("save_resumes (bulk)", [0.0] * loaded, size,
+                                     total=time.perf_counter() - start))
+
+            times, _ = timed(db.save_resume, list(_rows(template, loaded, size - loaded)))
+            results.append(summarize("save_resume", times, size))
+
+            def fetch_all(_):
+                db.READ_CACHE.clear()  # measure the query, not the cache
+                return db.fetch_all_resumes()
+            times, _ = timed(fetch_all, range(repeat))
+            results.append(summarize("fetch_all_resumes", times, size))
+
+            def fetch_table(_):
+                db.READ_CACHE.clear()
+                return db.search_table()
+            times, _ = timed(fetch_table, range(repeat))
+            results.append(summarize("search_table", times, size))
+            db.close_conn()
+    return results
+
+
+# ══════════════════════════════════════════════════════════
+#  REPORTING
+# ══════════════════════════════════════════════════════════
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _key(r: dict) -> tuple:
+    return r["stage"], r["rows"]
+
+
+def _metric(r: dict) -> float:
+    return r["p50_ms"] if r["p50_ms"] is not None else r["mean_ms"]
+
+
+def print_results(results: list):
+    print(f"{'stage':<22}{'rows':>8}{'n':>7}{'per/s':>11}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for r in results:
+        fmt = lambda v: f"{v:.3f}" if v is not None else "-"  # noqa: E731
+        print(f"{r['stage']:<22}{r['rows'] or '':>8}{r['n']:>7}{r['per_s'] or 0:>11.1f}"
+              f"{fmt(r['mean_ms']):>10}{fmt(r['p50_ms']):>10}{fmt(r['p95_ms']):>10}")
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> int:
+    before = {_key(r): r for r in baseline["stages"]}
+    regressions = 0
+    print(f"\nvs {baseline['meta'].get('git_rev') or 'baseline'} (p50, else mean):")
+    for r in results:
+        old = before.get(_key(r))
+        if not old or not _metric(old) or _metric(r) is None:
+            continue
+        ratio = _metric(r) / _metric(old)
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"  {r['stage']:<22}{r['rows'] or '':>8}{ratio:>8.2f}x{flag}")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--corpus", help="directory of PDF/DOCX resumes (default: synthetic)")
+    ap.add_argument("-n", type=int, default=200, help="synthetic resumes (default: %(default)s)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--rows", type=int, nargs="*", default=[1000, 10000, 100000],
+                    help="database sizes (default: %(default)s)")
+    ap.add_argument("--save-sample", type=int, default=500,
+                    help="rows written one by one with save_resume per size (default: %(default)s)")
+    ap.add_argument("--repeat", type=int, default=3, help="fetch_all_resumes/search_table runs per size")
+    ap.add_argument("--batch-size", type=int, default=32, help="spaCy batch size")
+    ap.add_argument("--json", help="write results to this file")
+    ap.add_argument("--compare", help="earlier --json output to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.2,
+                    help="allowed slowdown before a stage counts as a regression (default: %(default)s)")
+    args = ap.parse_args()
+
+    if args.corpus:
+        corpus = [(p.name, p.read_bytes()) for p in sorted(Path(args.corpus).rglob("*"))
+                  if p.suffix.lower() in (".pdf", ".docx")]
+    else:
+        corpus = generate_corpus(args.n, seed=args.seed)
+    if not corpus:
+        sys.exit("no PDF/DOCX files found")
+
+    results, parsed = bench_parsing(corpus, args.batch_size)
+    if parsed:
+        results += bench_database(parsed, args.rows, args.save_sample, args.repeat)
+    print_results(results)
+
+    report = {
+        "meta": {
+            "git_rev": _git_rev(),
+            "parser_version": PARSER_VERSION,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "corpus": args.corpus or f"synthetic n={args.n} seed={args.seed}",
+            "files": len(corpus),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "stages": results,
+    }
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""Generate a synthetic corpus of PDF and DOCX resumes.
+
+    python benchmarks/make_corpus.py out_dir [-n 200] [--formats pdf docx]
+        [--sections 6] [--lines 8] [--table-rows 4] [--skill-density 0.15] [--seed 0]
+
+Output is deterministic for a given seed. PDFs are written by a tiny built-in
+writer (Helvetica text plus ruled tables), so only python-docx is needed.
+"""
+import argparse
+import io
+import random
+import sys
+from pathlib import Path
+
+import docx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from resume_parser.skills import SKILLS_DB  # noqa: E402
+
+FIRST_NAMES = ["Aarav", "Priya", "Rahul", "Ananya", "Vikram", "Sneha", "Arjun", "Meera",
+               "James", "Emily", "Daniel", "Sofia", "Lucas", "Olivia", "Noah", "Chloe"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Reddy", "Gupta", "Nair", "Khan", "Singh",
+              "Smith", "Johnson", "Brown", "Garcia", "Miller", "Davis", "Wilson", "Moore"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries",
+             "Wayne Enterprises", "Hooli", "Pied Piper", "Soylent", "Cyberdyne"]
+TITLES = ["Software Engineer", "Data Scientist", "Backend Developer", "ML Engineer",
+          "DevOps Engineer", "Frontend Developer", "Data Analyst", "Product Engineer"]
+DEGREES = ["B.Tech in Computer Science", "M.Tech in Data Science", "BSc Mathematics",
+           "MSc Statistics", "MBA", "Bachelor of Engineering", "Master of Computer Applications"]
+SCHOOLS = ["IIT Bombay", "NIT Trichy", "BITS Pilani", "Anna University", "Delhi University",
+           "State University", "Institute of Technology"]
+FILLER = ("designed built shipped owned maintained improved reduced latency by migrated "
+          "services to led a team of engineers across product analytics and platform "
+          "delivering reliable features for customers with measurable impact on revenue "
+          "and cost while mentoring juniors reviewing code and writing documentation").split()
+SECTION_ORDER = ["Summary", "Experience", "Education", "Skills", "Projects",
+                 "Certifications", "Achievements", "Interests"]
+SKILL_LIST = sorted(SKILLS_DB)
+
+
+# ══════════════════════════════════════════════════════════
+#  CONTENT
+# ══════════════════════════════════════════════════════════
+# A resume is a list of blocks: ("title", text), ("line", text),
+# ("heading", text) or ("table", [row, ...]) with the header as the first row.
+
+
+def _sentence(rng: random.Random, words: int, skill_density: float) -> str:
+    out = []
+    for _ in range(words):
+        if rng.random() < skill_density:
+            out.append(rng.choice(SKILL_LIST).title())
+        else:
+            out.append(rng.choice(FILLER))
+    out[0] = out[0].capitalize()
+    return " ".join(out) + "."
+
+
+def _dates(rng: random.Random) -> str:
+    start = rng.randint(2008, 2021)
+    return f"{start} - {rng.choice([start + rng.randint(1, 3), 'Present'])}"
+
+
+def _section_body(name: str, rng: random.Random, lines: int, table_rows: int,
+                  skill_density: float) -> list:
+    if name == "Experience":
+        blocks = []
+        for _ in range(max(1, lines // 4)):
+            blocks.append(("line", f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} ({_dates(rng)})"))
+            blocks += [("line", "- " + _sentence(rng, rng.randint(8, 16), skill_density))
+                       for _ in range(3)]
+        return blocks
+    if name == "Education":
+        if table_rows:
+            rows = [["Degree", "Institution", "Year"]]
+            rows += [[rng.choice(DEGREES), rng.choice(SCHOOLS), str(rng.randint(2005, 2022))]
+                     for _ in range(table_rows)]
+            return [("table", rows)]
+        return [("line", f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)} {rng.randint(2005, 2022)}")
+                for _ in range(max(1, lines // 3))]
+    if name == "Skills":
+        picked = rng.sample(SKILL_LIST, min(len(SKILL_LIST), max(3, int(40 * skill_density) + 3)))
+        if table_rows:
+            rows = [["Area", "Skills"]]
+            for i in range(table_rows):
+                rows.append([f"Group {i + 1}", ", ".join(s.title() for s in picked[i::table_rows])])
+            return [("table", rows)]
+        return [("line", ", ".join(s.title() for s in picked))]
+    return [("line", _sentence(rng, rng.randint(10, 20), skill_density)) for _ in range(lines)]
+
+
+def generate_resume(rng: random.Random, sections: int = 6, lines: int = 8, table_rows: int = 4,
+                    skill_density: float = 0.15) -> list:
+    """Blocks of one resume with ``sections`` headed sections of about ``lines`` lines."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", "")
+    blocks = [
+        ("title", name),
+        ("line", f"{handle}@example.com | +91 9{rng.randint(100000000, 999999999)}"),
+        ("line", f"linkedin.com/in/{handle} | github.com/{handle}"),
+    ]
+    names = SECTION_ORDER[:sections] + [f"Additional {i}" for i in range(sections - len(SECTION_ORDER))]
+    for section in names:
+        blocks.append(("heading", section.upper()))
+        blocks += _section_body(section, rng, lines, table_rows, skill_density)
+    return blocks
+
+
+# ══════════════════════════════════════════════════════════
+#  PDF
+# ══════════════════════════════════════════════════════════
+PAGE_W, PAGE_H, MARGIN = 612, 792, 54
+WRAP_CHARS = 95
+
+
+def _pdf_str(text: str) -> str:
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def _wrap(text: str, width: int) -> list:
+    out, line = [], ""
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            out.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    return out + [line] if line else out
+
+
+def render_pdf(blocks: list) -> bytes:
+    pages, ops, y = [], [], PAGE_H - MARGIN
+
+    def need(height):
+        nonlocal ops, y
+        if y - height < MARGIN:
+            pages.append(ops)
+            ops, y = [], PAGE_H - MARGIN
+
+    def text(s, x, size, font="F1"):
+        ops.append(f"BT /{font} {size} Tf {x:.1f} {y:.1f} Td {_pdf_str(s)} Tj ET")
+
+    for kind, value in blocks:
+        if kind == "title":
+            need(26)
+            text(value, MARGIN, 18, "F2")
+            y -= 26
+        elif kind == "heading":
+            need(24)
+            y -= 6
+            text(value, MARGIN, 12, "F2")
+            y -= 18
+        elif kind == "line":
+            for part in _wrap(value, WRAP_CHARS):
+                need(14)
+                text(part, MARGIN, 10)
+                y -= 14
+        elif kind == "table":
+            col_w = (PAGE_W - 2 * MARGIN) / len(value[0])
+            chars = int(col_w / 5.2)
+            for i, row in enumerate(value):
+                cells = [_wrap(c, chars) or [""] for c in row]
+                height = 14 * max(len(c) for c in cells) + 4
+                need(height)
+                for j, cell in enumerate(cells):
+                    x = MARGIN + j * col_w
+                    ops.append(f"{x:.1f} {y - height + 10:.1f} {col_w:.1f} {height:.1f} re S")
+                    top = y
+                    for part in cell:
+                        text(part, x + 3, 9, "F2" if i == 0 else "F1")
+                        y -= 14
+                    y = top
+                y -= height
+            y -= 6
+    pages.append(ops)
+
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page objects are numbered
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for page_ops in pages:
+        stream = "\n".join(page_ops).encode("latin-1")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode("latin-1") + stream
+                       + b"\nendstream")
+        kids.append(len(objects) + 1)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_W} {PAGE_H}] "
+                       f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> "
+                       f"/Contents {len(objects)} 0 R >>")
+    objects[1] = (f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] "
+                  f"/Count {len(kids)} >>")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(out.tell())
+        body = obj if isinstance(obj, bytes) else obj.encode("latin-1")
+        out.write(f"{i} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for off in offsets:
+        out.write(f"{off:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+              f"startxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+# ══════════════════════════════════════════════════════════
+#  DOCX
+# ══════════════════════════════════════════════════════════
+
+
+def render_docx(blocks: list) -> bytes:
+    document = docx.Document()
+    for kind, value in blocks:
+        if kind == "title":
+            document.add_heading(value, level=0)
+        elif kind == "heading":
+            document.add_heading(value, level=1)
+        elif kind == "line":
+            document.add_paragraph(value)
+        elif kind == "table":
+            table = document.add_table(rows=len(value), cols=len(value[0]))
+            table.style = "Table Grid"
+            for row, values in zip(table.rows, value):
+                for cell, v in zip(row.cells, values):
+                    cell.text = v
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+RENDERERS = {"pdf": render_pdf, "docx": render_docx}
+
+
+def generate_corpus(n: int, formats=("pdf", "docx"), seed: int = 0, **options) -> list:
+    """``n`` synthetic resumes as ``(filename, file_bytes)`` pairs, formats alternating."""
+    rng = random.Random(seed)
+    files = []
+    for i in range(n):
+        fmt = formats[i % len(formats)]
+        files.append((f"resume_{i:05d}.{fmt}", RENDERERS[fmt](generate_resume(rng, **options))))
+    return files
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("out_dir")
+    ap.add_argument("-n", type=int, default=200, help="number of resumes (default: %(default)s)")
+    ap.add_argument("--formats", nargs="+", choices=sorted(RENDERERS), default=["pdf", "docx"])
+    ap.add_argument("--sections", type=int, default=6, help="headed sections per resume")
+    ap.add_argument("--lines", type=int, default=8, help="approximate lines per section")
+    ap.add_argument("--table-rows", type=int, default=4,
+                    help="rows in the education/skills tables, 0 = no tables")
+    ap.add_argument("--skill-density", type=float, default=0.15,
+                    help="fraction of body words that are taxonomy skills")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    out = Path(args.out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    total = 0
+    for name, data in generate_corpus(args.n, args.formats, args.seed, sections=args.sections,
+                                      lines=args.lines, table_rows=args.table_rows,
+                                      skill_density=args.skill_density):
+        (out / name).write_bytes(data)
+        total += len(data)
+    print(f"wrote {args.n} resume(s), {total / 1e6:.1f} MB, to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+from .db import (READ_CACHE, ResumeWriter, clear_all_resumes, count_resumes, delete_resume,
+                 duplicate_groups, duplicate_pairs, fetch_all_resumes, fetch_cached_resumes,
+                 fetch_metrics, fetch_resume_text, fts_query, get_conn, get_stats, init_db,
+                 iter_resumes, save_resume, save_resumes, search_resumes, top_skills)
+from .dedupe import identity_keys, minhash_signature
+from .export import EXPORT_FORMATS, export_resumes
+from .extract import extract_text, extract_text_docx, extract_text_pdf
+from .jobs import get_job, list_jobs, submit_job
+from .matching import JobSkills, Match, SkillIndex, match_candidates, parse_job_description
+from .parsing import PARSER_VERSION, load_nlp, parse_resume, parse_resumes
+from .pipeline import (ParseOutcome, index_stored_duplicates, index_stored_terms, ingest_files,
+                       merge_duplicates, parse_files, reparse_resumes)
+from .sections import Sections, sectionize
+from .similar import Similar, SimilarIndex, similar_candidates, term_vector
+from .skills import SKILLS_DB, SKILL_MATCHER, SkillMatcher, parse_skills
+from .timing import STAGES, StageTimer, profile
+
+__all__ = [
+    "EXPORT_FORMATS", "JobSkills", "Match", "PARSER_VERSION", "ParseOutcome", "READ_CACHE",
+    "ResumeWriter", "SKILLS_DB", "SKILL_MATCHER", "STAGES", "Sections", "Similar", "SimilarIndex",
+    "SkillIndex", "SkillMatcher", "StageTimer", "clear_all_resumes", "count_resumes",
+    "delete_resume", "duplicate_groups", "duplicate_pairs", "export_resumes", "extract_text",
+    "extract_text_docx", "extract_text_pdf", "fetch_all_resumes", "fetch_cached_resumes",
+    "fetch_metrics", "fetch_resume_text", "fts_query", "get_conn", "get_job", "get_stats",
+    "identity_keys", "index_stored_duplicates", "index_stored_terms", "ingest_files", "init_db",
+    "iter_resumes", "list_jobs", "load_nlp", "match_candidates", "merge_duplicates",
+    "minhash_signature", "parse_files", "parse_job_description", "parse_resume", "parse_resumes",
+    "parse_skills", "profile", "reparse_resumes", "save_resume", "save_resumes", "search_resumes",
+    "sectionize", "similar_candidates", "submit_job", "term_vector", "top_skills",
+]
@@ -0,0 +1,378 @@
+import argparse
+import logging
+import os
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from . import db
+from .export import EXPORT_CHUNK_ROWS, EXPORT_FORMATS, export_resumes
+from .extract import MAX_CHARS, MAX_PAGES, PDF_BACKEND_ENV, SUPPORTED_EXTENSIONS
+from .matching import METRICS, REQUIRED_WEIGHT, match_candidates, parse_job_description
+from .parsing import NLP_BATCH_SIZE
+from .pdf_backends import PDF_BACKENDS
+from .pipeline import (default_workers, index_stored_duplicates, index_stored_terms, ingest_files,
+                       merge_duplicates, reparse_resumes, worker_pool)
+from .similar import similar_candidates
+from .timing import PROFILERS, profile
+
+# Files are read and handed to the pipeline in groups so a large directory
+# never has to sit in memory all at once
+INGEST_GROUP_SIZE = 256
+FAILURES_SHOWN = 20
+
+
+def iter_resume_paths(paths: list):
+    # Walks lazily (and in a stable order), so a 200k-file tree is never
+    # listed into memory up front
+    for p in map(Path, paths):
+        if p.is_dir():
+            for root, dirs, names in os.walk(p):
+                dirs.sort()
+                for name in sorted(names):
+                    if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                        yield Path(root, name)
+        elif p.is_file():
+            yield p
+        else:
+            print(f"skipping {p}: no such file or directory", file=sys.stderr)
+
+
+def _groups(iterable, size: int):
+    group = []
+    for item in iterable:
+        group.append(item)
+        if len(group) == size:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+def _outcome_status(outcome) -> str:
+    if outcome.cached:
+        return "cached"
+    if outcome.result:
+        return "parsed"
+    return "failed" if outcome.error else "no_text"
+
+
+def cmd_ingest(args) -> int:
+    if args.pdf_backend:
+        # Through the environment so spawned parser processes pick it up too
+        os.environ[PDF_BACKEND_ENV] = args.pdf_backend
+    db.init_db()
+    counts = {"files": 0, "parsed": 0, "cached": 0, "duplicate": 0, "likely_duplicate": 0,
+              "no_text": 0, "failed": 0, "truncated": 0, "skipped": 0}
+    failures = []
+    total_bytes = 0
+    start = time.perf_counter()
+    # Only needed for real parallelism; kept for the whole run so workers
+    # load spaCy once, not once per group
+    pool = worker_pool(args.workers) if args.workers > 1 else None
+
+    with pool if pool is not None else nullcontext(), (profile(args.profile) if args.profile else nullcontext()) as prof:
+        for group in _groups(iter_resume_paths(args.paths), INGEST_GROUP_SIZE):
+            stats = {}
+            for path in group:
+                try:
+                    st = path.stat()
+                except OSError as e:
+                    counts["failed"] += 1
+                    failures.append((str(path), str(e)))
+                    print(f"FAILED {path}: {e}", file=sys.stderr)
+                    continue
+                stats[str(path.resolve())] = (path, st.st_mtime_ns, st.st_size)
+
+            # Files already ingested with the same mtime and size are skipped
+            # without being read
+            done = db.fetch_checkpoints(list(stats)) if args.checkpoint else {}
+            files, keys = [], {}
+            for key, (path, mtime_ns, size) in stats.items():
+                cp = done.get(key)
+                if cp and cp[:2] == (mtime_ns, size) and (cp[2] != "failed" or not args.retry_failed):
+                    counts["skipped"] += 1
+                    continue
+                try:
+                    data = path.read_bytes()
+                except OSError as e:
+                    counts["failed"] += 1
+                    failures.append((str(path), str(e)))
+                    print(f"FAILED {path}: {e}", file=sys.stderr)
+                    continue
+                total_bytes += len(data)
+                files.append((str(path), data))
+                keys[str(path)] = key
+            counts["files"] += len(files)
+
+            checkpoints, parsed_ids = {}, set()
+            for outcome in ingest_files(files, workers=args.workers, batch_size=args.batch_size,
+                                        max_pages=args.max_pages, max_chars=args.max_chars,
+                                        pool=pool):
+                status = _outcome_status(outcome)
+                counts[status] += 1
+                if outcome.result and outcome.result.get("truncated"):
+                    counts["truncated"] += 1
+                if status == "parsed":
+                    parsed_ids.add(outcome.result["id"])
+                if status == "failed":
+                    failures.append((outcome.filename, outcome.error))
+                    print(f"FAILED {outcome.filename}: {outcome.error}", file=sys.stderr)
+                elif status == "no_text":
+                    print(f"NO TEXT {outcome.filename}", file=sys.stderr)
+                if args.verbose and outcome.result:
+                    print(f"{status} {outcome.filename}")
+                checkpoints[outcome.filename] = (status, outcome.result and outcome.result["id"],
+                                                 outcome.error)
+            # New rows flagged as the same candidate as a stored or earlier one
+            if parsed_ids:
+                counts["likely_duplicate"] += len(parsed_ids & {
+                    i for p in db.duplicate_pairs(sorted(parsed_ids)) for i in (p["a"], p["b"])})
+            # Byte-identical copies within the group get no outcome of their own
+            for filename, _ in files:
+                if filename not in checkpoints:
+                    counts["duplicate"] += 1
+                    checkpoints[filename] = ("duplicate", None, None)
+
+            # Written only once ingest_files has committed the group's rows, so
+            # a checkpoint never claims a file whose resume was lost
+            if args.checkpoint:
+                db.save_checkpoints([(keys[f], *stats[keys[f]][1:], *cp)
+                                     for f, cp in checkpoints.items()])
+            elapsed = max(time.perf_counter() - start, 1e-9)
+            if args.progress:
+                print(f"... {counts['files']} read, {counts['skipped']} skipped, "
+                      f"{counts['failed']} failed — {counts['files'] / elapsed:.1f} files/s",
+                      file=sys.stderr)
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"Ingested {counts['files']} file(s) into {db.DB_PATH} in {elapsed:.1f}s — "
+          f"{counts['files'] / elapsed:.1f} files/s, {total_bytes / 1e6 / elapsed:.2f} MB/s")
+    print(f"  parsed {counts['parsed']} · cached {counts['cached']} · "
+          f"duplicates {counts['duplicate']} · no text {counts['no_text']} · failed {counts['failed']} · "
+          f"truncated {counts['truncated']} · skipped (checkpoint) {counts['skipped']}")
+    if counts["likely_duplicate"]:
+        print(f"  {counts['likely_duplicate']} new resume(s) look like the same candidate as "
+              f"another — review with `resume-parser dedupe`")
+    if failures:
+        print(f"  {len(failures)} failure(s):")
+        for path, error in failures[:FAILURES_SHOWN]:
+            print(f"    {path}: {error}")
+        if len(failures) > FAILURES_SHOWN:
+            print(f"    … and {len(failures) - FAILURES_SHOWN} more")
+    if args.profile:
+        print(prof.report(), file=sys.stderr)
+    return 1 if counts["failed"] else 0
+
+
+def _export_format(path: str) -> str:
+    for fmt in EXPORT_FORMATS:
+        if path.lower().endswith("." + EXPORT_FORMATS[fmt][1]):
+            return fmt
+    return "ndjson"
+
+
+def cmd_export(args) -> int:
+    db.init_db()
+    fmt = args.format or _export_format(args.output)
+    filters = {"text": args.text, "skills": args.skills, "match_all": args.match_all,
+               "min_score": args.min_score, "keywords": args.keywords}
+    start = time.perf_counter()
+    if args.output == "-":
+        n = export_resumes(sys.stdout.buffer, fmt, args.chunk_size, **filters)
+        sys.stdout.buffer.flush()
+    else:
+        n = export_resumes(args.output, fmt, args.chunk_size, **filters)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"Exported {n} candidate(s) as {fmt} to {args.output} in {elapsed:.1f}s "
+          f"({n / elapsed:.0f} rows/s)", file=sys.stderr)
+    return 0
+
+
+def cmd_reparse(args) -> int:
+    # Brings rows up to the current parser from their stored text, no files needed
+    db.init_db()
+    ids = [r["id"] for r in db.iter_resumes()] if args.all else None
+    counts = {"parsed": 0, "skipped": 0}
+    start = time.perf_counter()
+    for outcome in reparse_resumes(ids, batch_size=args.batch_size):
+        if outcome.result:
+            counts["parsed"] += 1
+            if args.verbose:
+                print(f"parsed {outcome.filename}")
+        else:
+            counts["skipped"] += 1
+            print(f"SKIPPED {outcome.filename}: {outcome.error}", file=sys.stderr)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"Re-parsed {counts['parsed']} resume(s) in {elapsed:.1f}s, "
+          f"{counts['skipped']} skipped")
+    return 1 if counts["skipped"] else 0
+
+
+def cmd_match(args) -> int:
+    db.init_db()
+    text = sys.stdin.read() if args.jd == "-" else Path(args.jd).read_text(encoding="utf-8")
+    detected = parse_job_description(text)
+    required = args.required if args.required is not None else detected.required
+    optional = args.optional if args.optional is not None else detected.optional
+    print(f"required: {', '.join(required) or '—'}", file=sys.stderr)
+    print(f"optional: {', '.join(optional) or '—'}", file=sys.stderr)
+    matches = match_candidates(required, optional, args.top, args.metric,
+                               args.required_weight, args.require_all)
+    resumes = {r["id"]: r for r in db.fetch_resumes([m.resume_id for m in matches])}
+    for rank, m in enumerate(matches, 1):
+        r = resumes.get(m.resume_id)
+        if r is None:
+            continue
+        missing = f"  missing: {', '.join(m.missing)}" if m.missing else ""
+        print(f"{rank:>4}. {m.score * 100:5.1f}%  {r['name'] or '—'} <{r['email'] or '—'}>  "
+              f"{r['filename']}{missing}")
+    return 0 if matches else 1
+
+
+def cmd_dedupe(args) -> int:
+    db.init_db()
+    if args.index:
+        start = time.perf_counter()
+        n = index_stored_duplicates()
+        print(f"Indexed {n} stored resume(s) in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    groups = db.duplicate_groups()
+    for group in groups:
+        rows = {r["id"]: r for r in db.fetch_resumes(group)}
+        for n, resume_id in enumerate(group):
+            r = rows[resume_id]
+            print(f"{'*' if n == 0 else ' '} {r['parsed_at']}  {r['name'] or '—'} "
+                  f"<{r['email'] or '—'}>  {r['phone'] or '—'}  {r['filename']}")
+        print()
+    print(f"{len(groups)} candidate(s) with likely duplicates "
+          f"({sum(map(len, groups)) - len(groups)} extra resume(s)); * = most recent",
+          file=sys.stderr)
+    if args.merge or args.keep_latest:
+        for group in groups:
+            merge_duplicates(group, merge=args.merge)
+        print(f"{'Merged' if args.merge else 'Removed older resumes of'} {len(groups)} candidate(s)",
+              file=sys.stderr)
+    return 0
+
+
+def cmd_similar(args) -> int:
+    db.init_db()
+    if args.index:
+        start = time.perf_counter()
+        n = index_stored_terms()
+        print(f"Indexed {n} stored resume(s) in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    if not args.resume_id:
+        return 0
+    matches = similar_candidates(args.resume_id, args.top)
+    if not matches:
+        print(f"{args.resume_id}: no such resume, or it has no indexed text "
+              f"(run with --index for resumes stored before this existed)", file=sys.stderr)
+        return 1
+    resumes = {r["id"]: r for r in db.fetch_resumes([m.resume_id for m in matches])}
+    for rank, m in enumerate(matches, 1):
+        r = resumes.get(m.resume_id)
+        if r is None:
+            continue
+        print(f"{rank:>4}. {m.score * 100:5.1f}%  {r['id']}  {r['name'] or '—'} "
+              f"<{r['email'] or '—'}>  {r['filename']}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="resume-parser",
+                                     description="Headless resume parsing into resumes.db")
+    parser.add_argument("--db", default=db.DB_PATH,
+                        help="SQLite database path (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="parse PDF/DOCX files into the database")
+    ingest.add_argument("paths", nargs="+", help="files or directories (searched recursively)")
+    ingest.add_argument("-w", "--workers", type=int, default=default_workers(),
+                        help="parser processes (default: %(default)s)")
+    ingest.add_argument("--batch-size", type=int, default=NLP_BATCH_SIZE,
+                        help="documents per spaCy batch (default: %(default)s)")
+    ingest.add_argument("--max-pages", type=int, default=MAX_PAGES,
+                        help="stop reading a PDF after this many pages, 0 = no limit (default: %(default)s)")
+    ingest.add_argument("--max-chars", type=int, default=MAX_CHARS,
+                        help="stop reading a document after this many characters, 0 = no limit "
+                             "(default: %(default)s)")
+    ingest.add_argument("--pdf-backend", choices=["auto", *sorted(PDF_BACKENDS)],
+                        help=f"PDF text extraction engine (default: ${PDF_BACKEND_ENV} or auto)")
+    ingest.add_argument("--profile", choices=PROFILERS,
+                        help="profile the run and print the report to stderr (use with -w 1 "
+                             "to include the parsing itself)")
+    ingest.add_argument("--no-checkpoint", dest="checkpoint", action="store_false",
+                        help="don't skip files already ingested or record progress")
+    ingest.add_argument("--retry-failed", action="store_true",
+                        help="re-read files that failed in an earlier run even if unchanged")
+    ingest.add_argument("--progress", action="store_true",
+                        help="print running totals after every group of files")
+    ingest.add_argument("-v", "--verbose", action="store_true", help="print every file")
+    ingest.set_defaults(func=cmd_ingest)
+
+    export = sub.add_parser("export", help="stream candidates from the database to a file")
+    export.add_argument("output", help="output file, or - for stdout")
+    export.add_argument("-f", "--format", choices=sorted(EXPORT_FORMATS),
+                        help="output format (default: from the file extension, else ndjson)")
+    export.add_argument("--text", default="", help="name or email contains")
+    export.add_argument("--skills", nargs="+", default=[], metavar="SKILL",
+                        help="candidates with any of these skills")
+    export.add_argument("--match-all", action="store_true",
+                        help="require all --skills instead of any")
+    export.add_argument("--min-score", type=int, default=0,
+                        help="minimum completion score %% (default: %(default)s)")
+    export.add_argument("--keywords", default="", help="full-text keyword search")
+    export.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_ROWS,
+                        help="rows fetched per round trip (default: %(default)s)")
+    export.set_defaults(func=cmd_export)
+
+    match = sub.add_parser("match", help="rank candidates against a job description")
+    match.add_argument("jd", help="job description text file, or - for stdin")
+    match.add_argument("-k", "--top", type=int, default=20, help="candidates to show (default: %(default)s)")
+    match.add_argument("--metric", choices=METRICS, default="overlap")
+    match.add_argument("--required", nargs="+", metavar="SKILL",
+                       help="required skills, instead of those found in the description")
+    match.add_argument("--optional", nargs="+", metavar="SKILL",
+                       help="optional skills, instead of those found in the description")
+    match.add_argument("--required-weight", type=float, default=REQUIRED_WEIGHT,
+                       help="weight of a required skill vs an optional one (default: %(default)s)")
+    match.add_argument("--require-all", action="store_true",
+                       help="only rank candidates with every required skill")
+    match.set_defaults(func=cmd_match)
+
+    reparse = sub.add_parser("reparse",
+                             help="re-parse stored resume text with the current parser version")
+    reparse.add_argument("--all", action="store_true",
+                         help="every stored resume, not just those from older parser versions")
+    reparse.add_argument("--batch-size", type=int, default=NLP_BATCH_SIZE,
+                         help="documents per spaCy batch (default: %(default)s)")
+    reparse.add_argument("-v", "--verbose", action="store_true", help="print every resume")
+    reparse.set_defaults(func=cmd_reparse)
+
+    dedupe = sub.add_parser("dedupe", help="list (and merge) resumes that look like the same candidate")
+    dedupe.add_argument("--index", action="store_true",
+                        help="first index resumes stored before duplicate detection existed")
+    action = dedupe.add_mutually_exclusive_group()
+    action.add_argument("--merge", action="store_true",
+                        help="merge each group into its most recent resume, filling in missing "
+                             "contacts and combining skills, education and experience")
+    action.add_argument("--keep-latest", action="store_true",
+                        help="keep each group's most recent resume and delete the others")
+    dedupe.set_defaults(func=cmd_dedupe)
+
+    similar = sub.add_parser("similar", help="candidates most like a stored resume")
+    similar.add_argument("resume_id", nargs="?", help="id of the resume to compare against")
+    similar.add_argument("-k", "--top", type=int, default=20,
+                         help="candidates to show (default: %(default)s)")
+    similar.add_argument("--index", action="store_true",
+                         help="first index resumes stored before similar-candidate search existed")
+    similar.set_defaults(func=cmd_similar)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    db.DB_PATH = args.db
+    return args.func(args)
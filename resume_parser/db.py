@@ -0,0 +1,1517 @@
+import atexit
+import functools
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+from typing import Iterator
+
+from .dedupe import (NEAR_DUP_THRESHOLD, identity_keys, lsh_buckets, normalize_phone,
+                     signature_similarity)
+from .skills import SKILL_MATCHER, SKILLS_DB
+
+# ══════════════════════════════════════════════════════════
+#  CONNECTIONS
+# ══════════════════════════════════════════════════════════
+DB_PATH = os.environ.get("RESUME_PARSER_DB", "resumes.db")
+
+# Applied to every new connection. WAL lets readers proceed while a writer
+# commits; NORMAL sync is durable across app crashes in WAL mode and skips an
+# fsync per commit; busy_timeout makes concurrent writers wait instead of
+# failing with "database is locked".
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-32000",        # KiB, i.e. ~32 MB of page cache
+    "PRAGMA mmap_size=268435456",      # 256 MB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+# sqlite3 keeps compiled statements per connection, keyed by SQL text. All SQL
+# below is constant text so every call after the first reuses its statement.
+STATEMENT_CACHE_SIZE = 256
+
+# FTS5's trigram tokenizer (SQLite 3.34+) backs substring search on name/email.
+# Older SQLite builds skip that index and fall back to a LIKE scan.
+HAS_TRIGRAM = sqlite3.sqlite_version_info >= (3, 34, 0)
+
+# Idle connections kept per database for the next thread that needs one
+MAX_IDLE_CONNECTIONS = 8
+
+_local = threading.local()
+_pool_lock = threading.Lock()
+_idle = {}          # path -> [connection, ...]
+_migrate_lock = threading.Lock()
+_migrated = set()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    # Not bound to its thread: pooled connections move to the next thread
+    conn = sqlite3.connect(path, timeout=5.0, cached_statements=STATEMENT_CACHE_SIZE,
+                           check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    # The keyword index reads its content through these (see _fts_over_text)
+    conn.create_function("text_body", 2, _text_body, deterministic=True)
+    conn.create_function("list_text", 1, _list_text, deterministic=True)
+    return conn
+
+
+def _release(conns: dict):
+    # A thread ended: its connections go back to the pool, open and configured
+    with _pool_lock:
+        for path, conn in conns.items():
+            if conn.in_transaction:
+                conn.rollback()
+            idle = _idle.setdefault(path, [])
+            if len(idle) < MAX_IDLE_CONNECTIONS:
+                idle.append(conn)
+            else:
+                conn.close()
+    conns.clear()
+
+
+class _Lease:
+    """The connections one thread holds, by path; released when the thread ends."""
+
+    def __init__(self):
+        self.conns = {}
+        weakref.finalize(self, _release, self.conns).atexit = False
+
+
+def get_conn() -> sqlite3.Connection:
+    """This thread's connection to DB_PATH, migrated on first use.
+
+    A thread keeps its connection for its lifetime, then hands it back to a
+    process-wide pool. Streamlit runs most reruns on a new thread, and those
+    pick up a pooled connection instead of reconnecting.
+    """
+    lease = getattr(_local, "lease", None)
+    if lease is None:
+        lease = _local.lease = _Lease()
+    conn = lease.conns.get(DB_PATH)
+    if conn is None:
+        with _pool_lock:
+            idle = _idle.get(DB_PATH)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            conn = _connect(DB_PATH)
+            migrate(conn, DB_PATH)
+        lease.conns[DB_PATH] = conn
+    return conn
+
+
+def close_conn():
+    # This thread's connections and every idle one; also run at exit
+    lease = getattr(_local, "lease", None)
+    if lease is not None:
+        for conn in lease.conns.values():
+            conn.close()
+        lease.conns.clear()
+    with _pool_lock:
+        for idle in _idle.values():
+            for conn in idle:
+                conn.close()
+        _idle.clear()
+
+
+atexit.register(close_conn)
+
+
+# ══════════════════════════════════════════════════════════
+#  SCHEMA MIGRATIONS
+# ══════════════════════════════════════════════════════════
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, decl: str):
+    # Pre-migration databases may already have some of the later columns
+    cols = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in cols:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _m001_resumes(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS resumes (
+            id          TEXT PRIMARY KEY,
+            filename    TEXT,
+            name        TEXT,
+            email       TEXT,
+            phone       TEXT,
+            linkedin    TEXT,
+            github      TEXT,
+            skills      TEXT,
+            education   TEXT,
+            experience  TEXT,
+            score       INTEGER,
+            parsed_at   TEXT,
+            raw_text    TEXT
+        )""")
+
+
+def _m002_content_hash(conn):
+    _add_column(conn, "resumes", "content_hash", "TEXT")
+    _add_column(conn, "resumes", "parser_version", "TEXT")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_resumes_content_hash ON resumes(content_hash)")
+
+
+def _m003_truncated(conn):
+    _add_column(conn, "resumes", "truncated", "INTEGER DEFAULT 0")
+
+
+def _run(conn, statements):
+    # Not executescript(): that commits first and would break the migration transaction
+    for sql in statements:
+        conn.execute(sql)
+
+
+def _m004_filter_indexes(conn):
+    # One row per (resume, lower-cased skill), kept in sync by triggers so every
+    # write path (save, replace, delete, clear) maintains it in its own transaction
+    _run(conn, [
+        """CREATE TABLE IF NOT EXISTS resume_skills (
+            resume_id   TEXT NOT NULL,
+            skill       TEXT NOT NULL,
+            PRIMARY KEY (resume_id, skill)
+        ) WITHOUT ROWID""",
+        "CREATE INDEX IF NOT EXISTS idx_resume_skills_skill ON resume_skills(skill, resume_id)",
+        "CREATE INDEX IF NOT EXISTS idx_resumes_score ON resumes(score)",
+        """CREATE TRIGGER IF NOT EXISTS resume_skills_ai AFTER INSERT ON resumes BEGIN
+            INSERT OR IGNORE INTO resume_skills(resume_id, skill)
+            SELECT new.id, lower(value) FROM json_each(new.skills);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS resume_skills_au AFTER UPDATE OF id, skills ON resumes BEGIN
+            DELETE FROM resume_skills WHERE resume_id = old.id;
+            INSERT OR IGNORE INTO resume_skills(resume_id, skill)
+            SELECT new.id, lower(value) FROM json_each(new.skills);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS resume_skills_ad AFTER DELETE ON resumes BEGIN
+            DELETE FROM resume_skills WHERE resume_id = old.id;
+        END""",
+        """INSERT OR IGNORE INTO resume_skills(resume_id, skill)
+           SELECT r.id, lower(j.value) FROM resumes r, json_each(r.skills) j""",
+    ])
+    if not HAS_TRIGRAM:
+        return
+    # Trigram index for substring search on name/email; external content, so
+    # the text itself stays in resumes and only the index lives here
+    _run(conn, [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS resume_contacts USING fts5(
+            name, email, content='resumes', content_rowid='rowid', tokenize='trigram')""",
+        """CREATE TRIGGER IF NOT EXISTS resume_contacts_ai AFTER INSERT ON resumes BEGIN
+            INSERT INTO resume_contacts(rowid, name, email) VALUES (new.rowid, new.name, new.email);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS resume_contacts_au AFTER UPDATE OF name, email ON resumes BEGIN
+            INSERT INTO resume_contacts(resume_contacts, rowid, name, email)
+            VALUES ('delete', old.rowid, old.name, old.email);
+            INSERT INTO resume_contacts(rowid, name, email) VALUES (new.rowid, new.name, new.email);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS resume_contacts_ad AFTER DELETE ON resumes BEGIN
+            INSERT INTO resume_contacts(resume_contacts, rowid, name, email)
+            VALUES ('delete', old.rowid, old.name, old.email);
+        END""",
+        "INSERT INTO resume_contacts(resume_contacts) VALUES ('rebuild')",
+    ])
+
+
+FTS_COLUMNS = ("name", "email", "education", "experience", "body")
+# The index's columns before the text left resumes (migrations 005 and 016)
+_FTS_V1_COLUMNS = ("name", "email", "education", "experience", "raw_text")
+
+
+def _m005_fulltext(conn):
+    # Keyword index over the resume body. External content like resume_contacts;
+    # prefix indexes make "kube*" style queries a range lookup
+    cols = ", ".join(_FTS_V1_COLUMNS)
+    new_vals = ", ".join(f"new.{c}" for c in _FTS_V1_COLUMNS)
+    old_vals = ", ".join(f"old.{c}" for c in _FTS_V1_COLUMNS)
+    _run(conn, [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5(
+            {cols}, content='resumes', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+        f"""CREATE TRIGGER IF NOT EXISTS resume_fts_ai AFTER INSERT ON resumes BEGIN
+            INSERT INTO resume_fts(rowid, {cols}) VALUES (new.rowid, {new_vals});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS resume_fts_au AFTER UPDATE OF {cols} ON resumes BEGIN
+            INSERT INTO resume_fts(resume_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+            INSERT INTO resume_fts(rowid, {cols}) VALUES (new.rowid, {new_vals});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS resume_fts_ad AFTER DELETE ON resumes BEGIN
+            INSERT INTO resume_fts(resume_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+        END""",
+        "INSERT INTO resume_fts(resume_fts) VALUES ('rebuild')",
+    ])
+
+
+def _m006_list_order(conn):
+    # Serves ORDER BY parsed_at DESC, id DESC and keyset pagination without a sort
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_parsed_at ON resumes(parsed_at, id)")
+
+
+def _m007_aggregates(conn):
+    # Dashboard numbers maintained by triggers inside each write's own
+    # transaction, so reading them is O(1) (totals) or O(k) (top skills).
+    # skill_counts follows resume_skills, whose rows come from the resumes triggers.
+    _run(conn, [
+        """CREATE TABLE IF NOT EXISTS resume_stats (
+            id          INTEGER PRIMARY KEY CHECK (id = 1),
+            total       INTEGER NOT NULL,
+            score_sum   INTEGER NOT NULL,
+            skill_sum   INTEGER NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS skill_counts (
+            skill       TEXT PRIMARY KEY,
+            count       INTEGER NOT NULL
+        ) WITHOUT ROWID""",
+        "CREATE INDEX IF NOT EXISTS idx_skill_counts_count ON skill_counts(count)",
+        """CREATE TRIGGER IF NOT EXISTS resume_stats_ai AFTER INSERT ON resumes BEGIN
+            UPDATE resume_stats SET total = total + 1,
+                score_sum = score_sum + COALESCE(new.score, 0),
+                skill_sum = skill_sum + json_array_length(COALESCE(new.skills, '[]'))
+            WHERE id = 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS resume_stats_au AFTER UPDATE OF score, skills ON resumes BEGIN
+            UPDATE resume_stats SET
+                score_sum = score_sum - COALESCE(old.score, 0) + COALESCE(new.score, 0),
+                skill_sum = skill_sum - json_array_length(COALESCE(old.skills, '[]'))
+                                      + json_array_length(COALESCE(new.skills, '[]'))
+            WHERE id = 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS resume_stats_ad AFTER DELETE ON resumes BEGIN
+            UPDATE resume_stats SET total = total - 1,
+                score_sum = score_sum - COALESCE(old.score, 0),
+                skill_sum = skill_sum - json_array_length(COALESCE(old.skills, '[]'))
+            WHERE id = 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS skill_counts_ai AFTER INSERT ON resume_skills BEGIN
+            INSERT INTO skill_counts(skill, count) VALUES (new.skill, 1)
+            ON CONFLICT(skill) DO UPDATE SET count = count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS skill_counts_ad AFTER DELETE ON resume_skills BEGIN
+            UPDATE skill_counts SET count = count - 1 WHERE skill = old.skill;
+            DELETE FROM skill_counts WHERE skill = old.skill AND count <= 0;
+        END""",
+        "DELETE FROM resume_stats",
+        """INSERT INTO resume_stats(id, total, score_sum, skill_sum)
+           SELECT 1, COUNT(*), COALESCE(SUM(score), 0),
+                  COALESCE(SUM(json_array_length(COALESCE(skills, '[]'))), 0)
+           FROM resumes""",
+        "DELETE FROM skill_counts",
+        """INSERT INTO skill_counts(skill, count)
+           SELECT skill, COUNT(*) FROM resume_skills GROUP BY skill""",
+    ])
+
+
+def _m008_generation(conn):
+    # Bumped by any change to resumes, from any connection or process, so read
+    # caches can tell with one primary-key lookup whether they're stale
+    _add_column(conn, "resume_stats", "generation", "INTEGER NOT NULL DEFAULT 0")
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS resume_generation_{event.lower()}
+            AFTER {event} ON resumes BEGIN
+                UPDATE resume_stats SET generation = generation + 1 WHERE id = 1;
+            END""")
+
+
+def _m009_metrics(conn):
+    # Per-resume stage timings (JSON, milliseconds) plus document size. A side
+    # table rather than resumes columns: writing it never touches the search
+    # triggers or bumps the read-cache generation.
+    _run(conn, [
+        """CREATE TABLE IF NOT EXISTS resume_metrics (
+            resume_id   TEXT PRIMARY KEY,
+            filename    TEXT,
+            pages       INTEGER,
+            chars       INTEGER,
+            total_ms    REAL,
+            timings     TEXT NOT NULL,
+            measured_at TEXT
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_resume_metrics_measured ON resume_metrics(measured_at)",
+        """CREATE TRIGGER IF NOT EXISTS resume_metrics_ad AFTER DELETE ON resumes BEGIN
+            DELETE FROM resume_metrics WHERE resume_id = old.id;
+        END""",
+    ])
+
+
+def _m010_jobs(conn):
+    # Background parse queue (see jobs.py). Uploaded bytes stay in job_files
+    # until their job finishes, so a job interrupted by a restart can resume.
+    _run(conn, [
+        """CREATE TABLE IF NOT EXISTS parse_jobs (
+            id           TEXT PRIMARY KEY,
+            status       TEXT NOT NULL DEFAULT 'queued',
+            total        INTEGER NOT NULL,
+            done         INTEGER NOT NULL DEFAULT 0,
+            workers      INTEGER NOT NULL DEFAULT 1,
+            profiler     TEXT,
+            profile      TEXT,
+            error        TEXT,
+            worker       TEXT,
+            heartbeat_at REAL,
+            created_at   TEXT NOT NULL,
+            started_at   TEXT,
+            finished_at  TEXT
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_parse_jobs_status ON parse_jobs(status, created_at)",
+        """CREATE TABLE IF NOT EXISTS job_files (
+            job_id     TEXT NOT NULL,
+            seq        INTEGER NOT NULL,
+            filename   TEXT NOT NULL,
+            data       BLOB,
+            status     TEXT NOT NULL DEFAULT 'queued',
+            resume_id  TEXT,
+            error      TEXT,
+            PRIMARY KEY (job_id, seq)
+        ) WITHOUT ROWID""",
+    ])
+
+
+def _m011_ingest_checkpoint(conn):
+    # Bulk directory ingest progress: a path is done while its mtime and size
+    # match, so a rerun skips it without reading the file
+    conn.execute("""CREATE TABLE IF NOT EXISTS ingest_checkpoint (
+        path        TEXT PRIMARY KEY,
+        mtime_ns    INTEGER NOT NULL,
+        size        INTEGER NOT NULL,
+        status      TEXT NOT NULL,
+        resume_id   TEXT,
+        error       TEXT,
+        ingested_at TEXT NOT NULL
+    ) WITHOUT ROWID""")
+
+
+def _m012_resume_text(conn):
+    # Full extracted text, compressed and kept out of ``resumes`` so list and
+    # search queries never read it
+    _run(conn, [
+        """CREATE TABLE IF NOT EXISTS resume_text (
+            resume_id TEXT PRIMARY KEY,
+            codec     TEXT NOT NULL,
+            chars     INTEGER NOT NULL,
+            body      BLOB NOT NULL
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS resume_text_ad AFTER DELETE ON resumes BEGIN
+            DELETE FROM resume_text WHERE resume_id = old.id;
+        END""",
+    ])
+
+
+def _m013_skill_bits(conn):
+    # Each resume's skills as a packed bitset for JD matching (see matching.py).
+    # Bit i is skill_ids.id i; ids are never reassigned, so stored bitsets stay
+    # valid as the taxonomy grows. Taxonomy skills get the low, dense ids.
+    _run(conn, [
+        """CREATE TABLE IF NOT EXISTS skill_ids (
+            skill TEXT PRIMARY KEY,
+            id    INTEGER NOT NULL UNIQUE
+        )""",
+        """CREATE TABLE IF NOT EXISTS resume_skill_bits (
+            resume_id TEXT PRIMARY KEY,
+            bits      BLOB NOT NULL
+        ) WITHOUT ROWID""",
+        """CREATE TRIGGER IF NOT EXISTS resume_skill_bits_ad AFTER DELETE ON resumes BEGIN
+            DELETE FROM resume_skill_bits WHERE resume_id = old.id;
+        END""",
+    ])
+    conn.executemany("INSERT OR IGNORE INTO skill_ids (skill, id) VALUES (?, ?)",
+                     [(skill, i) for i, skill in enumerate(sorted(SKILLS_DB))])
+    _save_skill_bits(conn, [(resume_id, {s.lower() for s in json.loads(skills or "[]")})
+                            for resume_id, skills in conn.execute("SELECT id, skills FROM resumes")])
+
+
+def _m014_duplicates(conn):
+    # Near-duplicate detection (see dedupe.py): exact identity keys, MinHash
+    # signatures and their LSH buckets, and the likely-duplicate pairs found
+    # when each resume was written. Pairs are stored once, with a < b.
+    _run(conn, [
+        """CREATE TABLE IF NOT EXISTS resume_identity (
+            key       TEXT NOT NULL,
+            resume_id TEXT NOT NULL,
+            PRIMARY KEY (key, resume_id)
+        ) WITHOUT ROWID""",
+        "CREATE INDEX IF NOT EXISTS idx_resume_identity_resume ON resume_identity(resume_id)",
+        """CREATE TABLE IF NOT EXISTS resume_minhash (
+            resume_id TEXT PRIMARY KEY,
+            signature BLOB NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS resume_lsh (
+            band      INTEGER NOT NULL,
+            bucket    INTEGER NOT NULL,
+            resume_id TEXT NOT NULL,
+            PRIMARY KEY (band, bucket, resume_id)
+        ) WITHOUT ROWID""",
+        "CREATE INDEX IF NOT EXISTS idx_resume_lsh_resume ON resume_lsh(resume_id)",
+        """CREATE TABLE IF NOT EXISTS resume_duplicates (
+            a          TEXT NOT NULL,
+            b          TEXT NOT NULL,
+            reason     TEXT NOT NULL,
+            similarity REAL,
+            found_at   TEXT NOT NULL,
+            PRIMARY KEY (a, b)
+        ) WITHOUT ROWID""",
+        "CREATE INDEX IF NOT EXISTS idx_resume_duplicates_b ON resume_duplicates(b)",
+        """CREATE TRIGGER IF NOT EXISTS resume_duplicates_ad AFTER DELETE ON resumes BEGIN
+            DELETE FROM resume_identity WHERE resume_id = old.id;
+            DELETE FROM resume_minhash WHERE resume_id = old.id;
+            DELETE FROM resume_lsh WHERE resume_id = old.id;
+            DELETE FROM resume_duplicates WHERE a = old.id OR b = old.id;
+        END""",
+    ])
+    # Cached duplicate listings go stale when pairs change, including from a
+    # backfill that doesn't touch resumes
+    for event in ("INSERT", "DELETE"):
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS resume_duplicates_generation_{event.lower()}
+            AFTER {event} ON resume_duplicates BEGIN
+                UPDATE resume_stats SET generation = generation + 1 WHERE id = 1;
+            END""")
+
+
+def _m015_terms(conn):
+    # Hashed term counts per resume for "more like this" search (see similar.py).
+    # Every write or delete is logged, so an in-memory index can apply just the
+    # rows that changed since it last looked.
+    _run(conn, [
+        """CREATE TABLE IF NOT EXISTS resume_terms (
+            resume_id TEXT PRIMARY KEY,
+            terms     BLOB NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS resume_terms_log (
+            seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+            resume_id TEXT NOT NULL
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS resume_terms_ad AFTER DELETE ON resumes BEGIN
+            DELETE FROM resume_terms WHERE resume_id = old.id;
+        END""",
+    ])
+    for event, row in (("INSERT", "new"), ("UPDATE", "new"), ("DELETE", "old")):
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS resume_terms_log_{event.lower()}
+            AFTER {event} ON resume_terms BEGIN
+                INSERT INTO resume_terms_log (resume_id) VALUES ({row}.resume_id);
+            END""")
+
+
+def _m016_fulltext_body(conn):
+    # The keyword index's body column holds the full text, not the raw_text
+    # preview. resume_fts now keeps its own copy of what it indexes: the full
+    # text only exists compressed, so an external-content table can't read it
+    # back. The triggers keep name/email/education/experience in step and seed
+    # the body with the preview; _write_resumes then sets the full text.
+    cols = ", ".join(_FTS_V1_COLUMNS)
+    _run(conn, [
+        "DROP TRIGGER IF EXISTS resume_fts_ai",
+        "DROP TRIGGER IF EXISTS resume_fts_au",
+        "DROP TRIGGER IF EXISTS resume_fts_ad",
+        "DROP TABLE IF EXISTS resume_fts",
+        f"""CREATE VIRTUAL TABLE resume_fts USING fts5(
+            {cols}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+        f"""CREATE TRIGGER resume_fts_ai AFTER INSERT ON resumes BEGIN
+            INSERT INTO resume_fts(rowid, {cols})
+            VALUES (new.rowid, {", ".join(f"new.{c}" for c in _FTS_V1_COLUMNS)});
+        END""",
+        """CREATE TRIGGER resume_fts_au AFTER UPDATE OF name, email, education, experience ON resumes
+        BEGIN
+            UPDATE resume_fts SET name = new.name, email = new.email,
+                education = new.education, experience = new.experience
+            WHERE rowid = new.rowid;
+        END""",
+        """CREATE TRIGGER resume_fts_ad AFTER DELETE ON resumes BEGIN
+            DELETE FROM resume_fts WHERE rowid = old.rowid;
+        END""",
+        f"INSERT INTO resume_fts(rowid, {cols}) SELECT rowid, {cols} FROM resumes",
+    ])
+    cur = conn.execute("""
+        SELECT r.rowid, t.codec, t.body FROM resumes r JOIN resume_text t ON t.resume_id = r.id""")
+    conn.executemany("UPDATE resume_fts SET raw_text = ? WHERE rowid = ?",
+                     ((TEXT_CODECS[codec](body).decode("utf-8"), rowid) for rowid, codec, body in cur))
+
+
+def _m017_phone_keys(conn):
+    # Date ranges such as "2018 - 2020" were once read as phone numbers and
+    # keyed; rebuild the phone keys with normalize_phone and drop the phone
+    # reason from pairs that no longer share one
+    conn.execute("DELETE FROM resume_identity WHERE key LIKE 'phone:%'")
+    cur = conn.execute("SELECT id, phone FROM resumes WHERE id IN (SELECT resume_id FROM resume_minhash)")
+    conn.executemany("INSERT OR IGNORE INTO resume_identity (key, resume_id) VALUES (?, ?)",
+                     [("phone:" + key, resume_id) for resume_id, phone in cur
+                      if (key := normalize_phone(phone))])
+    pairs = conn.execute("""
+        SELECT a, b, reason FROM resume_duplicates d WHERE reason LIKE '%phone%' AND NOT EXISTS (
+            SELECT 1 FROM resume_identity x JOIN resume_identity y ON y.key = x.key
+            WHERE x.resume_id = d.a AND y.resume_id = d.b AND x.key LIKE 'phone:%')""").fetchall()
+    for a, b, reason in pairs:
+        why = "+".join(r for r in reason.split("+") if r != "phone")
+        if why:
+            conn.execute("UPDATE resume_duplicates SET reason = ? WHERE a = ? AND b = ?", (why, a, b))
+        else:
+            conn.execute("DELETE FROM resume_duplicates WHERE a = ? AND b = ?", (a, b))
+
+
+def _fts_over_text(conn, fields):
+    # Creates resume_fts over resume_fts_content (resumes joined to their
+    # decompressed resume_text) with the triggers that keep it in step.
+    # ``fields(row)`` is the SQL for the name, email, education and experience
+    # columns of ``row``, a resumes alias or trigger row.
+    cols = ", ".join(FTS_COLUMNS)
+    current = f"SELECT rid, {cols} FROM resume_fts_content WHERE id"
+
+    def delete(row: str, body: str) -> str:
+        return (f"INSERT INTO resume_fts(resume_fts, rowid, {cols}) "
+                f"VALUES ('delete', {row}.rowid, {fields(row)}, {body})")
+
+    def delete_text(body: str) -> str:
+        # The entry of the resume a resume_text row belongs to, with ``body`` as its text
+        return (f"INSERT INTO resume_fts(resume_fts, rowid, {cols}) "
+                f"SELECT 'delete', r.rowid, {fields('r')}, {body} FROM resumes r WHERE r.id")
+
+    old_body = "(SELECT text_body(codec, body) FROM resume_text WHERE resume_id = old.id)"
+    # Each trigger replaces the entry with the view's current row, so the old
+    # values handed to 'delete' are always the ones that were indexed
+    _run(conn, [
+        f"""CREATE VIEW resume_fts_content (rid, id, {cols}) AS
+            SELECT r.rowid, r.id, {fields("r")}, text_body(t.codec, t.body)
+            FROM resumes r LEFT JOIN resume_text t ON t.resume_id = r.id""",
+        f"""CREATE VIRTUAL TABLE resume_fts USING fts5(
+            {cols}, content='resume_fts_content', content_rowid='rid',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+        f"""CREATE TRIGGER resume_fts_ai AFTER INSERT ON resumes BEGIN
+            INSERT INTO resume_fts(rowid, {cols}) {current} = new.id;
+        END""",
+        f"""CREATE TRIGGER resume_fts_au AFTER UPDATE OF name, email, education, experience ON resumes
+        BEGIN
+            {delete("old", old_body)};
+            INSERT INTO resume_fts(rowid, {cols}) {current} = new.id;
+        END""",
+        # The text is deleted here, after the entry that still needs it
+        f"""CREATE TRIGGER resume_fts_ad AFTER DELETE ON resumes BEGIN
+            {delete("old", old_body)};
+            DELETE FROM resume_text WHERE resume_id = old.id;
+        END""",
+        f"""CREATE TRIGGER resume_text_fts_ai AFTER INSERT ON resume_text BEGIN
+            {delete_text("NULL")} = new.resume_id;
+            INSERT INTO resume_fts(rowid, {cols}) {current} = new.resume_id;
+        END""",
+        f"""CREATE TRIGGER resume_text_fts_au AFTER UPDATE ON resume_text BEGIN
+            {delete_text("text_body(old.codec, old.body)")} = old.resume_id;
+            INSERT INTO resume_fts(rowid, {cols}) {current} = new.resume_id;
+        END""",
+        f"""CREATE TRIGGER resume_text_fts_ad AFTER DELETE ON resume_text BEGIN
+            {delete_text("text_body(old.codec, old.body)")} = old.resume_id;
+            INSERT INTO resume_fts(rowid, {cols}) {current} = old.resume_id;
+        END""",
+        "INSERT INTO resume_fts(resume_fts) VALUES ('rebuild')",
+    ])
+
+
+def _m018_fulltext_content(conn):
+    # resume_fts goes back to external content, read through a view that
+    # decompresses resume_text with text_body(), so the index keeps no copy of
+    # the text. The preview leaves resumes: rows saved before the full text
+    # was kept move theirs to resume_text, marked partial.
+    _run(conn, [
+        "DROP TRIGGER IF EXISTS resume_fts_ai",
+        "DROP TRIGGER IF EXISTS resume_fts_au",
+        "DROP TRIGGER IF EXISTS resume_fts_ad",
+        "DROP TRIGGER IF EXISTS resume_text_ad",
+        "DROP TABLE IF EXISTS resume_fts",
+    ])
+    _add_column(conn, "resume_text", "partial", "INTEGER NOT NULL DEFAULT 0")
+    cur = conn.execute("""SELECT id, raw_text FROM resumes
+        WHERE raw_text IS NOT NULL AND id NOT IN (SELECT resume_id FROM resume_text)""")
+    conn.executemany(
+        "INSERT INTO resume_text (resume_id, codec, chars, body, partial) VALUES (?, ?, ?, ?, 1)",
+        [_text_params({"id": resume_id, "text": text}) for resume_id, text in cur])
+    if sqlite3.sqlite_version_info >= (3, 35, 0):
+        conn.execute("ALTER TABLE resumes DROP COLUMN raw_text")
+    else:
+        conn.execute("UPDATE resumes SET raw_text = NULL")
+
+    _fts_over_text(conn, lambda row: f"{row}.name, {row}.email, {row}.education, {row}.experience")
+
+
+def _m019_fulltext_lists(conn):
+    # Education and experience are indexed as their entries joined into text
+    # by list_text(), not as the raw JSON, so snippets don't show brackets and
+    # quotes. (json_each can't be used: FTS5 reads its content without virtual
+    # tables.)
+    _run(conn, [
+        *(f"DROP TRIGGER IF EXISTS {t}" for t in (
+            "resume_fts_ai", "resume_fts_au", "resume_fts_ad",
+            "resume_text_fts_ai", "resume_text_fts_au", "resume_text_fts_ad")),
+        "DROP TABLE IF EXISTS resume_fts",
+        "DROP VIEW IF EXISTS resume_fts_content",
+    ])
+    _fts_over_text(conn, lambda row: (f"{row}.name, {row}.email, list_text({row}.education), "
+                                      f"list_text({row}.experience)"))
+
+
+# Append only: a database at PRAGMA user_version N has run the first N entries
+MIGRATIONS = [
+    _m001_resumes,
+    _m002_content_hash,
+    _m003_truncated,
+    _m004_filter_indexes,
+    _m005_fulltext,
+    _m006_list_order,
+    _m007_aggregates,
+    _m008_generation,
+    _m009_metrics,
+    _m010_jobs,
+    _m011_ingest_checkpoint,
+    _m012_resume_text,
+    _m013_skill_bits,
+    _m014_duplicates,
+    _m015_terms,
+    _m016_fulltext_body,
+    _m017_phone_keys,
+    _m018_fulltext_content,
+    _m019_fulltext_lists,
+]
+
+
+def migrate(conn: sqlite3.Connection, path: str = None):
+    # Runs pending migrations once per process and database file
+    key = os.path.abspath(path or DB_PATH)
+    if key in _migrated:
+        return
+    with _migrate_lock:
+        if key in _migrated:
+            return
+        with conn:
+            # IMMEDIATE takes the write lock up front, so two processes starting
+            # together can't both apply the same step
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for step in MIGRATIONS[version:]:
+                step(conn)
+            if version < len(MIGRATIONS):
+                conn.execute(f"PRAGMA user_version={len(MIGRATIONS)}")
+        _migrated.add(key)
+
+
+def init_db():
+    get_conn()
+
+
+# ══════════════════════════════════════════════════════════
+#  READ CACHE
+# ══════════════════════════════════════════════════════════
+
+
+def current_generation() -> tuple:
+    return DB_PATH, get_conn().execute(
+        "SELECT generation FROM resume_stats WHERE id = 1").fetchone()[0]
+
+
+class ReadCache:
+    """Process-wide LRU of query results, valid for one DB generation.
+
+    Any write to ``resumes`` bumps the generation, and the first read that
+    sees a new generation drops every entry. Memory is bounded by the total
+    number of cached rows as well as the number of entries; a single result
+    larger than ``max_rows`` is returned but not kept.
+    """
+
+    def __init__(self, max_entries: int = 256, max_rows: int = 10_000):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()   # key -> (value, rows)
+        self._rows = 0
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, generation, load):
+        with self._lock:
+            if generation != self._generation:
+                self._entries.clear()
+                self._rows = 0
+                self._generation = generation
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+        value = load()  # outside the lock, so slow queries don't serialize readers
+        rows = len(value) if isinstance(value, list) else 1
+        with self._lock:
+            if generation == self._generation and rows <= self.max_rows:
+                old = self._entries.pop(key, None)
+                self._rows += rows - (old[1] if old else 0)
+                self._entries[key] = (value, rows)
+                while self._entries and (len(self._entries) > self.max_entries
+                                         or self._rows > self.max_rows):
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._rows -= evicted
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+            self._generation = None
+
+
+READ_CACHE = ReadCache()
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def cached_read(fn):
+    # Results are shared between callers (and sessions): treat them as read-only
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__name__, _freeze(args), _freeze(kwargs))
+        return READ_CACHE.get_or_load(key, current_generation(), lambda: fn(*args, **kwargs))
+    return wrapper
+
+
+# ══════════════════════════════════════════════════════════
+#  RESUMES
+# ══════════════════════════════════════════════════════════
+_RESUME_COLUMNS = ("id", "filename", "name", "email", "phone", "linkedin", "github", "skills",
+                   "education", "experience", "score", "parsed_at",
+                   "content_hash", "parser_version", "truncated")
+_SELECT_LIST = ", ".join(f"r.{c}" for c in _RESUME_COLUMNS)
+# An upsert rather than INSERT OR REPLACE: REPLACE deletes the old row without
+# firing DELETE triggers, which would leave the derived indexes stale
+SQL_SAVE_RESUME = f"""
+    INSERT INTO resumes ({",".join(_RESUME_COLUMNS)})
+    VALUES ({",".join("?" * len(_RESUME_COLUMNS))})
+    ON CONFLICT(id) DO UPDATE SET
+    {", ".join(f"{c}=excluded.{c}" for c in _RESUME_COLUMNS[1:])}
+"""
+SQL_CACHED_RESUMES = f"""
+    SELECT {_SELECT_LIST} FROM resumes r
+    WHERE r.parser_version=? AND r.content_hash IN (SELECT value FROM json_each(?))
+"""
+
+
+def _resume_params(data: dict) -> tuple:
+    return (
+        data["id"], data["filename"], data["name"], data["email"], data["phone"],
+        data["linkedin"], data["github"],
+        json.dumps(data["skills"]),
+        json.dumps(data["education"]),
+        json.dumps(data["experience"]),
+        data["score"], data["parsed_at"],
+        data.get("content_hash"), data.get("parser_version"), int(data.get("truncated", False)),
+    )
+
+
+SQL_SAVE_METRICS = """
+    INSERT OR REPLACE INTO resume_metrics
+        (resume_id, filename, pages, chars, total_ms, timings, measured_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _metrics_params(data: dict, db_write_ms: float) -> tuple:
+    timings = {**data["timings"], "db_write": db_write_ms}
+    return (data["id"], data["filename"], data.get("pages"), data.get("chars"),
+            sum(timings.values()), json.dumps(timings), data["parsed_at"])
+
+
+# codec -> decompress; the codec is stored per row so it can change later
+TEXT_CODECS = {"zlib": zlib.decompress}
+TEXT_CODEC = "zlib"
+TEXT_COMPRESS_LEVEL = 6
+# An upsert, so the keyword index triggers see the text being replaced
+SQL_SAVE_TEXT = """
+    INSERT INTO resume_text (resume_id, codec, chars, body) VALUES (?, ?, ?, ?)
+    ON CONFLICT(resume_id) DO UPDATE SET
+        codec = excluded.codec, chars = excluded.chars, body = excluded.body, partial = 0
+"""
+
+
+def _text_body(codec: str, body: bytes) -> str:
+    return None if body is None else TEXT_CODECS[codec](body).decode("utf-8")
+
+
+def _list_text(value: str) -> str:
+    # A JSON list column's entries as plain text, for the keyword index
+    return None if value is None else " | ".join(map(str, json.loads(value)))
+
+
+def _text_params(data: dict) -> tuple:
+    text = data["text"]
+    return (data["id"], TEXT_CODEC, len(text),
+            zlib.compress(text.encode("utf-8"), TEXT_COMPRESS_LEVEL))
+
+
+def _skill_ids(conn: sqlite3.Connection, skills: set) -> dict:
+    # skill -> bit position; skills not seen before get the next free ids
+    # inside the caller's write transaction
+    ids = dict(conn.execute("SELECT skill, id FROM skill_ids").fetchall())
+    new = sorted(skills - ids.keys())
+    if new:
+        base = max(ids.values(), default=-1) + 1
+        conn.executemany("INSERT INTO skill_ids (skill, id) VALUES (?, ?)",
+                         [(skill, base + i) for i, skill in enumerate(new)])
+        ids.update((skill, base + i) for i, skill in enumerate(new))
+    return ids
+
+
+def pack_skill_bits(skills, ids: dict) -> bytes:
+    # Little-endian 64-bit words, as short as the highest set bit allows
+    n = 0
+    for skill in skills:
+        n |= 1 << ids[skill]
+    return n.to_bytes((n.bit_length() + 63) // 64 * 8, "little")
+
+
+def _save_skill_bits(conn: sqlite3.Connection, rows: list):
+    # rows: [(resume_id, {lower-cased skill, ...}), ...]
+    ids = _skill_ids(conn, set().union(*(skills for _, skills in rows)))
+    conn.executemany("INSERT OR REPLACE INTO resume_skill_bits (resume_id, bits) VALUES (?, ?)",
+                     [(resume_id, pack_skill_bits(skills, ids)) for resume_id, skills in rows])
+
+
+# Upper bound on stored resumes compared with each new one, so a key or text
+# shared by thousands of rows can't make a write scan them all
+DUPLICATE_CANDIDATES_MAX = 50
+SQL_IDENTITY_MATCHES = """
+    SELECT i.resume_id, i.key FROM json_each(?) j JOIN resume_identity i ON i.key = j.value
+    WHERE i.resume_id != ? LIMIT ?
+"""
+# Buckets go in as a JSON array, so the array index is the band
+SQL_LSH_MATCHES = """
+    SELECT m.resume_id, m.signature FROM resume_minhash m
+    WHERE m.resume_id IN (
+        SELECT l.resume_id FROM json_each(?) j
+        JOIN resume_lsh l ON l.band = j.key AND l.bucket = j.value
+        WHERE l.resume_id != ? LIMIT ?)
+"""
+
+
+def _index_duplicates(conn: sqlite3.Connection, rows: list) -> list:
+    """Index ``(resume_id, identity_keys, signature)`` rows and record their likely duplicates.
+
+    Each row is looked up by exact key and by LSH bucket (index lookups, never
+    a scan) against everything indexed so far, earlier rows of the same batch
+    included. A ``None`` signature keeps the stored one. Returns the new pairs.
+    """
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+    pairs = []
+    for resume_id, keys, signature in rows:
+        if signature is None:
+            row = conn.execute("SELECT signature FROM resume_minhash WHERE resume_id = ?",
+                               (resume_id,)).fetchone()
+            signature = row[0] if row else b""
+        conn.execute("DELETE FROM resume_identity WHERE resume_id = ?", (resume_id,))
+        conn.execute("DELETE FROM resume_lsh WHERE resume_id = ?", (resume_id,))
+        conn.execute("DELETE FROM resume_duplicates WHERE a = ? OR b = ?", (resume_id, resume_id))
+
+        reasons, similarity = {}, {}
+        for other, key in conn.execute(SQL_IDENTITY_MATCHES,
+                                       (json.dumps(keys), resume_id, DUPLICATE_CANDIDATES_MAX)):
+            reasons.setdefault(other, set()).add(key.split(":", 1)[0])
+        buckets = lsh_buckets(signature)
+        if buckets:
+            for other, other_sig in conn.execute(
+                    SQL_LSH_MATCHES, (json.dumps(buckets), resume_id, DUPLICATE_CANDIDATES_MAX)):
+                similarity[other] = signature_similarity(signature, other_sig)
+                if similarity[other] >= NEAR_DUP_THRESHOLD:
+                    reasons.setdefault(other, set()).add("text")
+        unscored = [other for other in reasons if other not in similarity]
+        if signature and unscored:
+            for other, other_sig in conn.execute(
+                    "SELECT resume_id, signature FROM resume_minhash "
+                    "WHERE resume_id IN (SELECT value FROM json_each(?))", (json.dumps(unscored),)):
+                similarity[other] = signature_similarity(signature, other_sig)
+
+        conn.executemany("INSERT INTO resume_identity (key, resume_id) VALUES (?, ?)",
+                         [(key, resume_id) for key in keys])
+        conn.execute("INSERT OR REPLACE INTO resume_minhash (resume_id, signature) VALUES (?, ?)",
+                     (resume_id, signature))
+        conn.executemany("INSERT INTO resume_lsh (band, bucket, resume_id) VALUES (?, ?, ?)",
+                         [(band, bucket, resume_id) for band, bucket in enumerate(buckets)])
+        new = [(min(resume_id, other), max(resume_id, other), "+".join(sorted(why)),
+                similarity.get(other), now) for other, why in reasons.items()]
+        conn.executemany("""INSERT OR REPLACE INTO resume_duplicates (a, b, reason, similarity, found_at)
+                            VALUES (?, ?, ?, ?, ?)""", new)
+        pairs += new
+    return pairs
+
+
+def save_resume(data: dict):
+    save_resumes([data])
+
+
+def _write_resumes(conn: sqlite3.Connection, rows: list):
+    start = time.perf_counter()
+    conn.executemany(SQL_SAVE_RESUME, [_resume_params(d) for d in rows])
+    conn.executemany(SQL_SAVE_TEXT, [_text_params(d) for d in rows if d.get("text")])
+    _save_skill_bits(conn, [(d["id"], {s.lower() for s in d["skills"]}) for d in rows])
+    _index_duplicates(conn, [(d["id"], identity_keys(d), d.get("minhash")) for d in rows])
+    _save_terms(conn, [(d["id"], d["terms"]) for d in rows if d.get("terms") is not None])
+    # Upserts, index triggers, text compression and duplicate lookups, shared
+    # across the batch; the commit itself lands after the metrics are written
+    # and isn't counted
+    db_write_ms = (time.perf_counter() - start) * 1000 / len(rows)
+    metrics = [_metrics_params(d, db_write_ms) for d in rows if d.get("timings")]
+    if metrics:
+        conn.executemany(SQL_SAVE_METRICS, metrics)
+
+
+def save_resumes(rows: list):
+    # All rows in one transaction: one commit (and at most one fsync) per batch
+    if not rows:
+        return
+    conn = get_conn()
+    with conn:
+        _write_resumes(conn, rows)
+
+
+class ResumeWriter:
+    """Group-commit buffer for bulk loads.
+
+    Rows are written with ``save_resumes`` once ``max_rows`` are pending or the
+    oldest pending row is ``max_delay_ms`` old (checked on ``add``/``tick``).
+    Use it as a context manager: leaving the block flushes whatever is left,
+    also on errors, so a batch is never reported done with rows still buffered.
+    """
+
+    def __init__(self, max_rows: int = 200, max_delay_ms: int = 500):
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self.pending = []
+        self.written = 0
+        self._first_pending_at = None
+
+    def add(self, data: dict):
+        if not self.pending:
+            self._first_pending_at = time.monotonic()
+        self.pending.append(data)
+        self.tick()
+
+    def tick(self):
+        # Call between rows so a slow trickle still commits every max_delay_ms
+        if len(self.pending) >= self.max_rows or (
+                self.pending and time.monotonic() - self._first_pending_at >= self.max_delay):
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            save_resumes(self.pending)
+            self.written += len(self.pending)
+            self.pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+        return False
+
+
+def _row_to_resume(r: sqlite3.Row) -> dict:
+    d = dict(r)
+    d["skills"] = json.loads(d["skills"] or "[]")
+    d["education"] = json.loads(d["education"] or "[]")
+    d["experience"] = json.loads(d["experience"] or "[]")
+    d["truncated"] = bool(d.get("truncated"))
+    return d
+
+
+@cached_read
+def fetch_all_resumes() -> list:
+    cur = get_conn().execute(f"SELECT {_SELECT_LIST} FROM resumes r ORDER BY r.parsed_at DESC")
+    return [_row_to_resume(r) for r in cur.fetchall()]
+
+
+def fetch_cached_resumes(hashes: list, parser_version: str) -> dict:
+    # content_hash -> stored result, for rows parsed by that parser version.
+    # Hashes go in as one JSON array so the statement text never changes.
+    if not hashes:
+        return {}
+    cur = get_conn().execute(SQL_CACHED_RESUMES, (parser_version, json.dumps(list(hashes))))
+    return {r["content_hash"]: _row_to_resume(r) for r in cur.fetchall()}
+
+
+def fetch_resumes(ids: list) -> list:
+    # Rows for the given ids, in that order; ids with no row are skipped
+    if not ids:
+        return []
+    cur = get_conn().execute(
+        f"SELECT {_SELECT_LIST} FROM resumes r WHERE r.id IN (SELECT value FROM json_each(?))",
+        (json.dumps(ids),))
+    rows = {r["id"]: _row_to_resume(r) for r in cur.fetchall()}
+    return [rows[i] for i in ids if i in rows]
+
+
+def fetch_resume_text(resume_id: str, preview: bool = True) -> str:
+    """The full extracted text of one resume, or None if there is no such row.
+
+    Rows saved before the full text was kept only have the first 3,000
+    characters; those are returned unless ``preview`` is False.
+    """
+    row = get_conn().execute("SELECT codec, body, partial FROM resume_text WHERE resume_id = ?",
+                             (resume_id,)).fetchone()
+    if row is None or (row["partial"] and not preview):
+        return None
+    return _text_body(row["codec"], row["body"])
+
+
+def fetch_skill_bits() -> tuple:
+    """``(resume_ids, bitsets, skill_ids)`` for every resume, unpadded.
+
+    The id map is read last, so it covers every bit set in the bitsets.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.row_factory = None
+    rows = cur.execute("SELECT resume_id, bits FROM resume_skill_bits").fetchall()
+    skill_ids = dict(conn.execute("SELECT skill, id FROM skill_ids").fetchall())
+    return [r[0] for r in rows], [r[1] for r in rows], skill_ids
+
+
+def stale_resume_ids(parser_version: str) -> list:
+    # Rows an older parser produced that can be re-parsed from their stored text
+    cur = get_conn().execute("""
+        SELECT r.id FROM resumes r JOIN resume_text t ON t.resume_id = r.id
+        WHERE r.parser_version IS NOT ? AND NOT t.partial ORDER BY r.parsed_at DESC""",
+        (parser_version,))
+    return [r[0] for r in cur.fetchall()]
+
+
+def delete_resume(resume_id: str):
+    conn = get_conn()
+    with conn:
+        conn.execute("DELETE FROM resumes WHERE id=?", (resume_id,))
+
+
+def clear_all_resumes():
+    conn = get_conn()
+    with conn:
+        conn.execute("DELETE FROM resumes")
+
+
+def get_stats() -> dict:
+    # Reads the trigger-maintained aggregate row; cost doesn't grow with the table
+    total, score_sum, skill_sum = get_conn().execute(
+        "SELECT total, score_sum, skill_sum FROM resume_stats WHERE id = 1").fetchone()
+    return {
+        "total":      total,
+        "avg_score":  round(score_sum / total) if total else 0,
+        "avg_skills": round(skill_sum / total) if total else 0,
+    }
+
+
+@cached_read
+def top_skills(k: int = 15) -> list:
+    # [(Skill, count), ...] most common first, straight off the count index
+    cur = get_conn().execute(
+        "SELECT skill, count FROM skill_counts ORDER BY count DESC, skill LIMIT ?", (k,))
+    return [(skill.title(), count) for skill, count in cur.fetchall()]
+
+
+def fetch_metrics(limit: int = 5000) -> list:
+    # Most recently measured first; timings decoded to stage -> ms
+    cur = get_conn().execute("""
+        SELECT resume_id, filename, pages, chars, total_ms, timings, measured_at
+        FROM resume_metrics ORDER BY measured_at DESC LIMIT ?""", (limit,))
+    rows = []
+    for r in cur.fetchall():
+        d = dict(r)
+        d["timings"] = json.loads(d["timings"])
+        rows.append(d)
+    return rows
+
+
+def fetch_pages(ids: list) -> dict:
+    # resume id -> page count, for the ids that were measured
+    cur = get_conn().execute(
+        "SELECT resume_id, pages FROM resume_metrics WHERE resume_id IN (SELECT value FROM json_each(?))",
+        (json.dumps(list(ids)),))
+    return dict(cur.fetchall())
+
+
+# ══════════════════════════════════════════════════════════
+#  INGEST CHECKPOINTS
+# ══════════════════════════════════════════════════════════
+
+
+def fetch_checkpoints(paths: list) -> dict:
+    # path -> (mtime_ns, size, status) for the paths that have a checkpoint
+    if not paths:
+        return {}
+    cur = get_conn().execute("""
+        SELECT path, mtime_ns, size, status FROM ingest_checkpoint
+        WHERE path IN (SELECT value FROM json_each(?))""", (json.dumps(paths),))
+    return {r[0]: (r[1], r[2], r[3]) for r in cur.fetchall()}
+
+
+def save_checkpoints(rows: list):
+    # rows: [(path, mtime_ns, size, status, resume_id, error), ...]
+    if not rows:
+        return
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+    conn = get_conn()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO ingest_checkpoint VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(*row, now) for row in rows])
+
+
+# ══════════════════════════════════════════════════════════
+#  DUPLICATES
+# ══════════════════════════════════════════════════════════
+
+
+@cached_read
+def duplicate_pairs(resume_ids: list = None) -> list:
+    # Likely-duplicate pairs, newest first; only those touching ``resume_ids`` if given
+    if resume_ids is None:
+        cur = get_conn().execute("SELECT * FROM resume_duplicates ORDER BY found_at DESC, a, b")
+    else:
+        cur = get_conn().execute("""
+            SELECT * FROM resume_duplicates
+            WHERE a IN (SELECT value FROM json_each(?1)) OR b IN (SELECT value FROM json_each(?1))
+            ORDER BY found_at DESC, a, b""", (json.dumps(list(resume_ids)),))
+    return [dict(r) for r in cur.fetchall()]
+
+
+@cached_read
+def duplicate_groups() -> list:
+    """Resume ids that are likely the same candidate, grouped (pairs chained together).
+
+    Each group lists the most recently parsed resume first; groups come
+    largest first, then most recent first.
+    """
+    parent = {}
+
+    def find(x):
+        while parent.setdefault(x, x) != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for pair in duplicate_pairs():
+        parent[find(pair["a"])] = find(pair["b"])
+    parsed_at = dict(get_conn().execute(
+        "SELECT id, parsed_at FROM resumes WHERE id IN (SELECT value FROM json_each(?))",
+        (json.dumps(list(parent)),)).fetchall())
+    groups = {}
+    for resume_id in parent:
+        if resume_id in parsed_at:
+            groups.setdefault(find(resume_id), []).append(resume_id)
+    ordered = [sorted(g, key=lambda i: (parsed_at[i], i), reverse=True)
+               for g in groups.values() if len(g) > 1]
+    return sorted(ordered, key=lambda g: (len(g), parsed_at[g[0]]), reverse=True)
+
+
+def unindexed_resume_ids() -> list:
+    # Rows stored before duplicate detection existed
+    cur = get_conn().execute(
+        "SELECT id FROM resumes WHERE id NOT IN (SELECT resume_id FROM resume_minhash)")
+    return [r[0] for r in cur.fetchall()]
+
+
+def index_duplicates(rows: list) -> list:
+    # Public, self-committing form of _index_duplicates, for backfills
+    conn = get_conn()
+    with conn:
+        return _index_duplicates(conn, rows)
+
+
+def collapse_resumes(drop_ids: list, kept: dict = None):
+    """Delete ``drop_ids`` and, in the same transaction, save ``kept`` (a merged row)."""
+    conn = get_conn()
+    with conn:
+        conn.execute("DELETE FROM resumes WHERE id IN (SELECT value FROM json_each(?))",
+                     (json.dumps(list(drop_ids)),))
+        if kept is not None:
+            _write_resumes(conn, [kept])
+
+
+# ══════════════════════════════════════════════════════════
+#  SIMILAR-CANDIDATE TERMS
+# ══════════════════════════════════════════════════════════
+# resume_terms_log entries kept; an index further behind than this rebuilds
+TERMS_LOG_KEEP = 100_000
+SQL_SAVE_TERMS = """
+    INSERT INTO resume_terms (resume_id, terms) VALUES (?, ?)
+    ON CONFLICT(resume_id) DO UPDATE SET terms = excluded.terms
+"""
+
+
+def _save_terms(conn: sqlite3.Connection, rows: list):
+    # rows: [(resume_id, packed term counts), ...]
+    if not rows:
+        return
+    conn.executemany(SQL_SAVE_TERMS, rows)
+    conn.execute("DELETE FROM resume_terms_log WHERE seq <= ?", (_terms_seq(conn) - TERMS_LOG_KEEP,))
+
+
+def save_terms(rows: list):
+    # Public, self-committing form of _save_terms, for backfills
+    conn = get_conn()
+    with conn:
+        _save_terms(conn, rows)
+
+
+def _terms_seq(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM resume_terms_log").fetchone()[0]
+
+
+def fetch_terms() -> tuple:
+    """``(seq, resume_ids, term blobs)`` for every resume with stored terms.
+
+    ``seq`` is the last change the rows include, read in the same snapshot.
+    """
+    conn = get_conn()
+    with conn:
+        conn.execute("BEGIN")
+        seq = _terms_seq(conn)
+        cur = conn.cursor()
+        cur.row_factory = None
+        rows = cur.execute("SELECT resume_id, terms FROM resume_terms").fetchall()
+    return seq, [r[0] for r in rows], [r[1] for r in rows]
+
+
+def fetch_term_changes(since: int):
+    """``(seq, {resume_id: term blob, or None if deleted})`` for changes after ``since``.
+
+    None when the log no longer reaches back that far.
+    """
+    conn = get_conn()
+    with conn:
+        conn.execute("BEGIN")
+        seq = _terms_seq(conn)
+        if seq == since:
+            return seq, {}
+        first = conn.execute("SELECT MIN(seq) FROM resume_terms_log").fetchone()[0]
+        if seq < since or first is None or first > since + 1:
+            return None
+        cur = conn.cursor()
+        cur.row_factory = None
+        changed = dict(cur.execute("""
+            SELECT l.resume_id, t.terms FROM (
+                SELECT DISTINCT resume_id FROM resume_terms_log WHERE seq > ?
+            ) l LEFT JOIN resume_terms t ON t.resume_id = l.resume_id""", (since,)).fetchall())
+    return seq, changed
+
+
+def count_terms() -> int:
+    return get_conn().execute("SELECT COUNT(*) FROM resume_terms").fetchone()[0]
+
+
+def resumes_without_terms() -> list:
+    # Rows stored before similar-candidate search existed
+    cur = get_conn().execute(
+        "SELECT id FROM resumes WHERE id NOT IN (SELECT resume_id FROM resume_terms)")
+    return [r[0] for r in cur.fetchall()]
+
+
+# ══════════════════════════════════════════════════════════
+#  SEARCH
+# ══════════════════════════════════════════════════════════
+
+
+def expand_skill_term(term: str) -> list:
+    # Keeps the substring behaviour of the old Python filter ("py" finds Python)
+    # by resolving terms against the taxonomy, so SQL only does exact,
+    # indexed lookups on resume_skills
+    term = term.strip().lower()
+    if not term:
+        return []
+    return sorted({term} | {s for s in SKILL_MATCHER.skills if term in s})
+
+
+def _like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_filters(text: str = "", skills=(), match_all: bool = False,
+                  min_score: int = 0) -> tuple:
+    """Return ``(where_sql, params)`` for the Search tab filters on ``resumes r``.
+
+    ``skills`` is a list of terms; each matches any skill containing it, and
+    ``match_all`` decides whether a candidate needs every term (AND) or any (OR).
+    """
+    clauses, params = [], []
+    text = text.strip()
+    if text:
+        if HAS_TRIGRAM and len(text) >= 3:
+            clauses.append(
+                "r.rowid IN (SELECT rowid FROM resume_contacts WHERE resume_contacts MATCH ?)")
+            params.append('"' + text.replace('"', '""') + '"')
+        else:
+            # Trigrams need 3+ characters; shorter queries scan, still without JSON decoding
+            pattern = "%" + _like_escape(text) + "%"
+            clauses.append("(r.name LIKE ? ESCAPE '\\' OR r.email LIKE ? ESCAPE '\\')")
+            params += [pattern, pattern]
+
+    terms = [expand_skill_term(t) for t in skills if t.strip()]
+    skill_clauses = [
+        "r.id IN (SELECT resume_id FROM resume_skills WHERE skill IN (SELECT value FROM json_each(?)))"
+        for _ in terms
+    ]
+    params += [json.dumps(t) for t in terms]
+    if skill_clauses:
+        clauses.append("(" + (" AND " if match_all else " OR ").join(skill_clauses) + ")")
+
+    if min_score > 0:
+        clauses.append("r.score >= ?")
+        params.append(min_score)
+    return (" AND ".join(clauses) or "1"), params
+
+
+# bm25 column weights, in FTS_COLUMNS order: a hit in the name outranks one in the body
+FTS_WEIGHTS = (10.0, 5.0, 2.0, 3.0, 1.0)
+# snippet() markers; control characters so callers can escape the text first
+HIGHLIGHT_START, HIGHLIGHT_END = "\x02", "\x03"
+_FTS_TOKEN = re.compile(r'"([^"]+)"|(\S+)')
+
+
+def fts_query(keywords: str) -> str:
+    """Turn search-box input into an FTS5 query.
+
+    Words and "quoted phrases" are ANDed; a trailing ``*`` makes a prefix
+    search (``kube*``). Everything is quoted, so FTS operators and punctuation
+    in user input can't cause syntax errors.
+    """
+    terms = []
+    for phrase, word in _FTS_TOKEN.findall(keywords):
+        token = phrase or word
+        prefix = token.endswith("*")
+        token = token.rstrip("*").replace('"', '""').strip()
+        if token:
+            terms.append(f'"{token}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _search_sql(text: str = "", skills=(), match_all: bool = False, min_score: int = 0,
+                keywords: str = "", after: tuple = None, columns: str = None,
+                snippet: bool = False) -> tuple:
+    # ``columns`` replaces the resume columns (and the keyword snippet) in the
+    # SELECT; ``snippet`` appends a snippet column to them, NULL without keywords
+    where, params = build_filters(text, skills, match_all, min_score)
+    query = fts_query(keywords)
+    if not query:
+        if after is not None:
+            where += " AND (r.parsed_at, r.id) < (?, ?)"
+            params = [*params, *after]
+        if snippet:
+            columns += ", NULL AS snippet"
+        return (f"SELECT {columns or _SELECT_LIST} FROM resumes r WHERE {where} "
+                "ORDER BY r.parsed_at DESC, r.id DESC", params)
+    if columns is None or snippet:
+        columns = f"{columns or _SELECT_LIST}, snippet(resume_fts, -1, ?, ?, '…', 16) AS snippet"
+        params = [HIGHLIGHT_START, HIGHLIGHT_END, query, *params]
+    else:
+        params = [query, *params]
+    return f"""
+        SELECT {columns}
+        FROM resume_fts JOIN resumes r ON r.rowid = resume_fts.rowid
+        WHERE resume_fts MATCH ? AND {where}
+        ORDER BY bm25(resume_fts, {", ".join(map(str, FTS_WEIGHTS))})
+    """, params
+
+
+@cached_read
+def search_resumes(text: str = "", skills=(), match_all: bool = False, min_score: int = 0,
+                   keywords: str = "", limit: int = None, offset: int = 0,
+                   after: tuple = None) -> list:
+    """One page of filtered candidates.
+
+    Without keywords rows are newest first; pass ``after=(parsed_at, id)`` of
+    the previous page's last row for keyset paging, which stays cheap however
+    deep the page. With keywords, full-text matches are ranked by bm25 and carry
+    a highlighted ``snippet``; ranked results page with ``offset`` only.
+    """
+    sql, params = _search_sql(text, skills, match_all, min_score, keywords, after)
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params = [*params, limit, offset]
+    return [_row_to_resume(row) for row in get_conn().execute(sql, params).fetchall()]
+
+
+def _json_preview(column: str, sep: str, limit: int) -> str:
+    # The first ``limit`` items of a JSON list column joined into one string
+    return (f"COALESCE((SELECT group_concat(value, '{sep}') FROM "
+            f"(SELECT value FROM json_each({column}) LIMIT {limit})), '')")
+
+
+# The candidate grid: header -> SQL. List previews are joined in SQL, so grid
+# rows need no JSON decoding or per-row work in Python.
+TABLE_COLUMNS = (
+    ("ID",         "r.id"),
+    ("Name",       "r.name"),
+    ("Email",      "r.email"),
+    ("Phone",      "r.phone"),
+    ("Skills",     _json_preview("r.skills", ", ", 8)),
+    ("Education",  _json_preview("r.education", " | ", 2)),
+    ("Experience", _json_preview("r.experience", " | ", 2)),
+    ("Score %",    "r.score"),
+    ("File",       "r.filename"),
+    ("Parsed At",  "r.parsed_at"),
+)
+TABLE_HEADERS = tuple(h for h, _ in TABLE_COLUMNS)
+_SELECT_TABLE = ", ".join(sql for _, sql in TABLE_COLUMNS)
+
+
+@cached_read
+def search_table(text: str = "", skills=(), match_all: bool = False, min_score: int = 0,
+                 keywords: str = "", limit: int = None, offset: int = 0,
+                 after: tuple = None, snippet: bool = False) -> list:
+    """Grid rows for the candidate list: plain tuples in TABLE_HEADERS order.
+
+    Same filters, order and paging as ``search_resumes``, but only the grid's
+    columns are read, ready for ``DataFrame.from_records``. With ``snippet``
+    each row ends with the keyword snippet (None without keywords).
+    """
+    sql, params = _search_sql(text, skills, match_all, min_score, keywords, after, _SELECT_TABLE,
+                              snippet)
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params = [*params, limit, offset]
+    cur = get_conn().cursor()
+    cur.row_factory = None
+    return cur.execute(sql, params).fetchall()
+
+
+def iter_resumes(text: str = "", skills=(), match_all: bool = False, min_score: int = 0,
+                 keywords: str = "", chunk_size: int = 1000) -> Iterator[dict]:
+    # Every matching row in search order, pulled off one cursor ``chunk_size``
+    # rows at a time. Bypasses the read cache: exports would only evict it.
+    cur = get_conn().execute(*_search_sql(text, skills, match_all, min_score, keywords))
+    try:
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_resume(row)
+    finally:
+        cur.close()
+
+
+@cached_read
+def count_resumes(text: str = "", skills=(), match_all: bool = False, min_score: int = 0,
+                  keywords: str = "") -> int:
+    # Total for the pager, computed separately so pages never load extra rows
+    where, params = build_filters(text, skills, match_all, min_score)
+    query = fts_query(keywords)
+    if not query:
+        return get_conn().execute(
+            f"SELECT COUNT(*) FROM resumes r WHERE {where}", params).fetchone()[0]
+    return get_conn().execute(f"""
+        SELECT COUNT(*) FROM resume_fts JOIN resumes r ON r.rowid = resume_fts.rowid
+        WHERE resume_fts MATCH ? AND {where}
+    """, [query, *params]).fetchone()[0]
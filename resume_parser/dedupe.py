@@ -0,0 +1,110 @@
+import hashlib
+import re
+import zlib
+
+import numpy as np
+
+# ══════════════════════════════════════════════════════════
+#  IDENTITY KEYS
+# ══════════════════════════════════════════════════════════
+# Phone numbers compare on their last digits, so "+91 98765 43210" and
+# "098765-43210" are the same key; shorter numbers are too ambiguous to use
+PHONE_KEY_DIGITS = 10
+# parse_phone also picks date ranges out of work history ("2018 - 2020")
+_YEARS_RE = re.compile(r"\W*(?:(?:19|20)\d\d\W*)+")
+
+
+def normalize_email(email: str) -> str:
+    return (email or "").strip().lower()
+
+
+def normalize_phone(phone: str) -> str:
+    """The number's last PHONE_KEY_DIGITS digits, or "" if it doesn't look like a phone number.
+
+    >>> normalize_phone("+91 98765 43210"), normalize_phone("098765-43210")
+    ('9876543210', '9876543210')
+    >>> normalize_phone("(2018 - 2020)"), normalize_phone("2015-2017, 2019 – 2021")
+    ('', '')
+    >>> normalize_phone("555-0142")
+    ''
+    """
+    if not phone or _YEARS_RE.fullmatch(phone):
+        return ""
+    digits = re.sub(r"\D", "", phone)
+    return digits[-PHONE_KEY_DIGITS:] if len(digits) >= PHONE_KEY_DIGITS else ""
+
+
+def identity_keys(data: dict) -> list:
+    """Exact-match keys: two resumes sharing one are the same person.
+
+    >>> identity_keys({"email": " Ann@Example.com", "phone": "+1 (415) 555-0142"})
+    ['email:ann@example.com', 'phone:4155550142']
+    >>> identity_keys({"email": "", "phone": "2018 - 2020"})
+    []
+    """
+    keys = []
+    email, phone = normalize_email(data.get("email")), normalize_phone(data.get("phone"))
+    if email:
+        keys.append("email:" + email)
+    if phone:
+        keys.append("phone:" + phone)
+    return keys
+
+
+# ══════════════════════════════════════════════════════════
+#  MINHASH / LSH
+# ══════════════════════════════════════════════════════════
+# Signatures are MinHash over word 3-gram shingles, MINHASH_BANDS x MINHASH_ROWS
+# 32-bit values. LSH puts each band in a bucket; resumes sharing any bucket are
+# compared. 20 bands of 6 rows find pairs at Jaccard 0.7 with ~92% probability
+# and 0.8 with >99%; pairs at 0.4 share a bucket only ~8% of the time, and
+# those are then dropped by NEAR_DUP_THRESHOLD.
+SHINGLE_WORDS = 3
+MINHASH_BANDS, MINHASH_ROWS = 20, 6
+NUM_PERM = MINHASH_BANDS * MINHASH_ROWS
+# Estimated Jaccard similarity from which a text match counts as a duplicate
+NEAR_DUP_THRESHOLD = 0.7
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _hash_params(tag: str) -> np.ndarray:
+    # Fixed, version-independent 64-bit constants: signatures are stored, so
+    # they must come out the same in every process and NumPy release
+    return np.array([int.from_bytes(hashlib.blake2b(f"{tag}{i}".encode(), digest_size=8).digest(),
+                                    "little") for i in range(NUM_PERM)], dtype=np.uint64)
+
+
+# Multiply-shift hashing: h(x) = ((a * x + b) mod 2**64) >> 32, one (a, b) per permutation
+_A = _hash_params("a") | np.uint64(1)
+_B = _hash_params("b")
+
+
+def shingles(text: str) -> set:
+    words = _WORD_RE.findall(text.lower())
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash_signature(text: str) -> bytes:
+    """NUM_PERM little-endian uint32 minima; empty for texts under SHINGLE_WORDS words."""
+    found = shingles(text)
+    if not found:
+        return b""
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in found),
+                         dtype=np.uint64, count=len(found))
+    return ((hashes[:, None] * _A + _B) >> np.uint64(32)).min(axis=0).astype("<u4").tobytes()
+
+
+def lsh_buckets(signature: bytes) -> list:
+    # One signed 64-bit bucket per band (SQLite INTEGER range), band order
+    width = MINHASH_ROWS * 4
+    return [int.from_bytes(hashlib.blake2b(signature[i * width:(i + 1) * width],
+                                           digest_size=8).digest(), "little", signed=True)
+            for i in range(MINHASH_BANDS)] if signature else []
+
+
+def signature_similarity(a: bytes, b: bytes) -> float:
+    # Estimated Jaccard similarity of the two shingle sets
+    if not a or not b:
+        return 0.0
+    return float(np.count_nonzero(np.frombuffer(a, "<u4") == np.frombuffer(b, "<u4"))) / NUM_PERM
@@ -0,0 +1,165 @@
+import csv
+import gzip
+import io
+import json
+from contextlib import contextmanager
+from typing import IO, Iterable
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional, only needed for Parquet exports
+    pa = pq = None
+
+from . import db
+
+# Rows pulled from the cursor and, for Parquet, written per row group
+EXPORT_CHUNK_ROWS = 1000
+
+# Columns of the flat CSV export, matching the app's candidate table but
+# with every skill/education/experience entry instead of the first few
+CSV_COLUMNS = {
+    "ID":         lambda r: r["id"],
+    "Name":       lambda r: r["name"],
+    "Email":      lambda r: r["email"],
+    "Phone":      lambda r: r["phone"],
+    "LinkedIn":   lambda r: r["linkedin"],
+    "GitHub":     lambda r: r["github"],
+    "Skills":     lambda r: ", ".join(r["skills"]),
+    "Education":  lambda r: " | ".join(r["education"]),
+    "Experience": lambda r: " | ".join(r["experience"]),
+    "Score %":    lambda r: r["score"],
+    "File":       lambda r: r["filename"],
+    "Parsed At":  lambda r: r["parsed_at"],
+}
+
+# Fields of the JSON, NDJSON and Parquet records: everything but the full text
+RECORD_FIELDS = ("id", "filename", "name", "email", "phone", "linkedin", "github", "skills",
+                 "education", "experience", "score", "parsed_at", "truncated",
+                 "content_hash", "parser_version")
+
+
+def _record(r: dict) -> dict:
+    return {k: r.get(k) for k in RECORD_FIELDS}
+
+
+# ══════════════════════════════════════════════════════════
+#  WRITERS
+# ══════════════════════════════════════════════════════════
+# A writer streams resume dicts to a binary file object and returns the
+# number of rows written; nothing but the current row group is kept around.
+
+
+@contextmanager
+def _text(out: IO[bytes]):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    try:
+        yield text
+    finally:
+        text.flush()
+        text.detach()   # leave ``out`` open for the caller
+
+
+def write_csv(rows: Iterable[dict], out: IO[bytes]) -> int:
+    n = 0
+    with _text(out) as text:
+        writer = csv.writer(text)
+        writer.writerow(CSV_COLUMNS)
+        for r in rows:
+            writer.writerow([get(r) for get in CSV_COLUMNS.values()])
+            n += 1
+    return n
+
+
+def write_ndjson(rows: Iterable[dict], out: IO[bytes]) -> int:
+    n = 0
+    with _text(out) as text:
+        for r in rows:
+            text.write(json.dumps(_record(r), ensure_ascii=False) + "\n")
+            n += 1
+    return n
+
+
+def write_json(rows: Iterable[dict], out: IO[bytes]) -> int:
+    # One JSON array, written element by element
+    n = 0
+    with _text(out) as text:
+        text.write("[")
+        for r in rows:
+            text.write(("\n  " if not n else ",\n  ") + json.dumps(_record(r), ensure_ascii=False))
+            n += 1
+        text.write("\n]\n" if n else "]\n")
+    return n
+
+
+def _parquet_schema():
+    strings = pa.list_(pa.string())
+    return pa.schema([
+        ("id", pa.string()), ("filename", pa.string()), ("name", pa.string()),
+        ("email", pa.string()), ("phone", pa.string()), ("linkedin", pa.string()),
+        ("github", pa.string()), ("skills", strings), ("education", strings),
+        ("experience", strings), ("score", pa.int64()), ("parsed_at", pa.string()),
+        ("truncated", pa.bool_()), ("content_hash", pa.string()), ("parser_version", pa.string()),
+    ])
+
+
+def write_parquet(rows: Iterable[dict], out: IO[bytes]) -> int:
+    if pq is None:
+        raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+    schema = _parquet_schema()
+    n = 0
+    with pq.ParquetWriter(out, schema, compression="zstd") as writer:
+        chunk = []
+        for r in rows:
+            chunk.append(_record(r))
+            if len(chunk) == EXPORT_CHUNK_ROWS:
+                writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+                n += len(chunk)
+                chunk = []
+        if chunk or not n:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            n += len(chunk)
+    return n
+
+
+def _gzipped(write):
+    def write_gz(rows: Iterable[dict], out: IO[bytes]) -> int:
+        with gzip.GzipFile(fileobj=out, mode="wb", compresslevel=6) as gz:
+            return write(rows, gz)
+    return write_gz
+
+
+# format -> (writer, file extension, MIME type)
+EXPORT_FORMATS = {
+    "csv":       (write_csv, "csv", "text/csv"),
+    "csv.gz":    (_gzipped(write_csv), "csv.gz", "application/gzip"),
+    "json":      (write_json, "json", "application/json"),
+    "ndjson":    (write_ndjson, "ndjson", "application/x-ndjson"),
+    "ndjson.gz": (_gzipped(write_ndjson), "ndjson.gz", "application/gzip"),
+}
+if pq is not None:
+    EXPORT_FORMATS["parquet"] = (write_parquet, "parquet", "application/vnd.apache.parquet")
+
+
+# ══════════════════════════════════════════════════════════
+#  EXPORT
+# ══════════════════════════════════════════════════════════
+
+
+def export_resumes(out, fmt: str = "ndjson", chunk_size: int = EXPORT_CHUNK_ROWS,
+                   **filters) -> int:
+    """Stream the candidates matching ``filters`` to ``out`` in format ``fmt``.
+
+    ``out`` is a path or a binary file object; ``filters`` are the keyword
+    arguments of ``db.search_resumes``. Rows come off a database cursor
+    ``chunk_size`` at a time, so memory stays flat however many are exported.
+    Returns the number of rows written.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}, expected one of {sorted(EXPORT_FORMATS)}")
+    write = EXPORT_FORMATS[fmt][0]
+    rows = db.iter_resumes(chunk_size=chunk_size, **filters)
+    if isinstance(out, (str, bytes)) or hasattr(out, "__fspath__"):
+        with open(out, "wb") as f:
+            return write(rows, f)
+    return write(rows, out)
@@ -0,0 +1,124 @@
+import io
+import logging
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+import docx as docx_lib
+
+from .pdf_backends import ACCURATE_BACKEND, FAST_BACKEND, PDF_BACKENDS
+
+log = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".doc")
+
+# Budgets for oversized uploads (e.g. a 200-page portfolio sent as a "resume").
+# Parsing only ever looks at the start of a document, so stop reading there.
+MAX_PAGES = 25
+MAX_CHARS = 100_000
+
+# Per deployment: "auto" (fast backend, falling back to pdfplumber when it
+# returns too little text), or any name in PDF_BACKENDS
+PDF_BACKEND_ENV = "RESUME_PARSER_PDF_BACKEND"
+# Below this many characters per page the fast backend probably missed text
+# that layout analysis can recover (odd encodings, text drawn as positioned glyphs)
+MIN_CHARS_PER_PAGE = 200
+
+
+class Extraction(NamedTuple):
+    text: str
+    pages: int         # pages (or DOCX documents) actually read
+    truncated: bool    # a page or character budget cut the document short
+    backend: str = ""  # PDF backend that produced the text
+
+
+# ══════════════════════════════════════════════════════════
+#  TEXT EXTRACTION
+# ══════════════════════════════════════════════════════════
+
+
+def _collect(pieces, max_chars: int = None, skip_empty: bool = False):
+    # Join text pieces (pages, paragraphs) until the character budget runs out.
+    # Returns (text, pieces consumed, truncated); stops pulling from the
+    # generator as soon as the budget is spent.
+    parts, chars, consumed = [], 0, 0
+    for piece in pieces:
+        consumed += 1
+        if skip_empty and not piece:
+            continue
+        if max_chars and chars + len(piece) > max_chars:
+            parts.append(piece[:max_chars - chars])
+            return "\n".join(parts).strip(), consumed, True
+        parts.append(piece)
+        chars += len(piece) + 1
+    return "\n".join(parts).strip(), consumed, False
+
+
+def _extract_pdf_with(backend: str, file_bytes: bytes, max_pages: int,
+                      max_chars: int) -> Extraction:
+    with PDF_BACKENDS[backend](file_bytes, max_pages) as (pages, more_pages):
+        text, read, truncated = _collect(pages, max_chars, skip_empty=True)
+    return Extraction(text, read, truncated or more_pages, backend)
+
+
+def extract_pdf(file_bytes: bytes, max_pages: int = MAX_PAGES,
+                max_chars: int = MAX_CHARS, backend: str = None) -> Extraction:
+    backend = backend or os.environ.get(PDF_BACKEND_ENV, "auto")
+    if backend != "auto" and backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}; "
+                         f"choose 'auto' or one of {sorted(PDF_BACKENDS)}")
+    if backend == "auto" and FAST_BACKEND != ACCURATE_BACKEND:
+        try:
+            result = _extract_pdf_with(FAST_BACKEND, file_bytes, max_pages, max_chars)
+            if result.truncated or len(result.text) >= MIN_CHARS_PER_PAGE * max(result.pages, 1):
+                return result
+        except Exception as e:
+            log.debug("%s failed, retrying with %s: %s", FAST_BACKEND, ACCURATE_BACKEND, e)
+    if backend == "auto":
+        backend = ACCURATE_BACKEND
+    try:
+        return _extract_pdf_with(backend, file_bytes, max_pages, max_chars)
+    except Exception as e:
+        log.warning("PDF read error: %s", e)
+        return Extraction("", 0, False, backend)
+
+
+def iter_docx_lines(doc):
+    for para in doc.paragraphs:
+        yield para.text
+    for table in doc.tables:
+        for row in table.rows:
+            yield "".join(cell.text + " " for cell in row.cells)
+
+
+def extract_docx(file_bytes: bytes, max_chars: int = MAX_CHARS) -> Extraction:
+    try:
+        doc = docx_lib.Document(io.BytesIO(file_bytes))
+        text, _, truncated = _collect(iter_docx_lines(doc), max_chars)
+        # DOCX has no fixed pagination; report one "page" for the whole document
+        return Extraction(text, 1, truncated)
+    except Exception as e:
+        log.warning("DOCX read error: %s", e)
+        return Extraction("", 0, False)
+
+
+def extract_document(file_bytes: bytes, filename: str, max_pages: int = MAX_PAGES,
+                     max_chars: int = MAX_CHARS, pdf_backend: str = None) -> Extraction:
+    ext = Path(filename).suffix.lower()
+    if ext == ".pdf":
+        return extract_pdf(file_bytes, max_pages, max_chars, pdf_backend)
+    elif ext in (".docx", ".doc"):
+        return extract_docx(file_bytes, max_chars)
+    return Extraction("", 0, False)
+
+
+def extract_text_pdf(file_bytes: bytes) -> str:
+    return extract_pdf(file_bytes).text
+
+
+def extract_text_docx(file_bytes: bytes) -> str:
+    return extract_docx(file_bytes).text
+
+
+def extract_text(file_bytes: bytes, filename: str) -> str:
+    return extract_document(file_bytes, filename).text
@@ -0,0 +1,275 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from . import db
+from .parsing import content_hash
+from .pipeline import ingest_files
+from .timing import profile
+
+# A running job's worker refreshes its heartbeat this often, whether or not
+# files are finishing (pool start-up and slow chunks can take minutes)
+JOB_HEARTBEAT_SECONDS = 5
+# A running job whose heartbeat is older than this is considered orphaned (its
+# process died or restarted) and is picked up again. Many missed beats, so a
+# busy database (busy_timeout is 5s) can't make a live job look dead.
+JOB_STALE_SECONDS = 60
+# How often an idle worker looks for new jobs without being woken
+JOB_POLL_SECONDS = 2.0
+FINISHED = ("done", "failed")
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class Job(NamedTuple):
+    id: str
+    status: str                 # queued | running | done | failed
+    total: int
+    done: int
+    workers: int
+    error: Optional[str]
+    created_at: str
+    started_at: Optional[str]
+    finished_at: Optional[str]
+    profile: Optional[str]      # profiler report, when the job was profiled
+    counts: dict                # file status -> number of files
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    @property
+    def seconds(self) -> Optional[float]:
+        if not (self.started_at and self.finished_at):
+            return None
+        fmt = "%Y-%m-%d %H:%M:%S"
+        return (datetime.strptime(self.finished_at, fmt)
+                - datetime.strptime(self.started_at, fmt)).total_seconds()
+
+
+# ══════════════════════════════════════════════════════════
+#  QUEUE
+# ══════════════════════════════════════════════════════════
+
+
+def submit_job(files: list, workers: int = 1, profiler: str = None) -> str:
+    """Queue ``(filename, file_bytes)`` pairs for background parsing; returns the job id.
+
+    Starts this process's worker thread if it isn't running yet.
+    """
+    job_id = uuid.uuid4().hex[:12]
+    conn = db.get_conn()
+    with conn:
+        conn.execute(
+            "INSERT INTO parse_jobs (id, total, workers, profiler, created_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, len(files), max(1, workers), profiler, _now()))
+        conn.executemany(
+            "INSERT INTO job_files (job_id, seq, filename, data) VALUES (?, ?, ?, ?)",
+            [(job_id, seq, name, data) for seq, (name, data) in enumerate(files)])
+    ensure_worker().wake()
+    return job_id
+
+
+def get_job(job_id: str) -> Optional[Job]:
+    conn = db.get_conn()
+    row = conn.execute("SELECT * FROM parse_jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None:
+        return None
+    counts = dict(conn.execute(
+        "SELECT status, COUNT(*) FROM job_files WHERE job_id = ? GROUP BY status", (job_id,)).fetchall())
+    return Job(row["id"], row["status"], row["total"], row["done"], row["workers"], row["error"],
+               row["created_at"], row["started_at"], row["finished_at"], row["profile"], counts)
+
+
+def list_jobs(limit: int = 10) -> list:
+    ids = db.get_conn().execute(
+        "SELECT id FROM parse_jobs ORDER BY created_at DESC, rowid DESC LIMIT ?", (limit,)).fetchall()
+    return [get_job(r[0]) for r in ids]
+
+
+def job_files(job_id: str) -> list:
+    # Per-file progress, without the uploaded bytes
+    cur = db.get_conn().execute(
+        "SELECT seq, filename, status, resume_id, error FROM job_files WHERE job_id = ? ORDER BY seq",
+        (job_id,))
+    return [dict(r) for r in cur.fetchall()]
+
+
+def job_results(job_id: str) -> list:
+    # The stored resumes a job produced (parsed or served from cache), in upload order
+    ids = [f["resume_id"] for f in job_files(job_id) if f["resume_id"]]
+    return db.fetch_resumes(list(dict.fromkeys(ids)))
+
+
+# ══════════════════════════════════════════════════════════
+#  WORKER
+# ══════════════════════════════════════════════════════════
+
+
+class JobWorker:
+    """Daemon thread that runs queued jobs one at a time, oldest first.
+
+    Progress is committed per file, so after a crash or restart a job resumes
+    with the files that have no committed result.
+    """
+
+    def __init__(self):
+        self.name = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="resume-parse-jobs", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def wake(self):
+        self._wake.set()
+
+    def _loop(self):
+        while True:
+            try:
+                job_id = self._claim()
+            except sqlite3.Error:
+                job_id = None  # e.g. "database is locked": try again after the poll interval
+            if job_id is None:
+                self._wake.wait(JOB_POLL_SECONDS)
+                self._wake.clear()
+                continue
+            try:
+                self.run(job_id)
+            except Exception as e:
+                try:
+                    self._finish(job_id, "failed", f"{type(e).__name__}: {e}")
+                except sqlite3.Error:
+                    pass  # left running; claimed again once its heartbeat is stale
+
+    def _claim(self) -> Optional[str]:
+        conn = db.get_conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("""
+                SELECT id FROM parse_jobs
+                WHERE status = 'queued' OR (status = 'running' AND heartbeat_at < ?)
+                ORDER BY created_at, rowid LIMIT 1""", (time.time() - JOB_STALE_SECONDS,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("""
+                UPDATE parse_jobs SET status = 'running', worker = ?, heartbeat_at = ?,
+                    started_at = COALESCE(started_at, ?)
+                WHERE id = ?""", (self.name, time.time(), _now(), row[0]))
+        return row[0]
+
+    def run(self, job_id: str):
+        conn = db.get_conn()
+        job = conn.execute("SELECT workers, profiler FROM parse_jobs WHERE id = ?", (job_id,)).fetchone()
+        with conn:
+            # Results recorded by an earlier run whose resume row never got
+            # committed (the process died between the two) are redone
+            conn.execute("""
+                UPDATE job_files SET status = 'queued', resume_id = NULL
+                WHERE job_id = ? AND resume_id IS NOT NULL
+                  AND resume_id NOT IN (SELECT id FROM resumes)""", (job_id,))
+        pending = conn.execute(
+            "SELECT seq, filename, data FROM job_files WHERE job_id = ? AND status = 'queued' ORDER BY seq",
+            (job_id,)).fetchall()
+        by_hash = {}
+        for seq, _, data in pending:
+            by_hash.setdefault(content_hash(data), []).append(seq)
+
+        profiler = job["profiler"]
+        workers = 1 if profiler else job["workers"]  # profilers only see this process
+        resume_of = {}  # content hash -> resume id (None when the file produced no row)
+        with self._heartbeat(job_id), (profile(profiler) if profiler else nullcontext()) as prof:
+            for outcome in ingest_files([(f, d) for _, f, d in pending], workers=workers):
+                # One outcome per distinct content, reported under its first upload.
+                # Matched by content, not name: two uploads can share a filename.
+                file_hash = outcome.content_hash
+                if outcome.result:
+                    status = "cached" if outcome.cached else "parsed"
+                elif outcome.error:
+                    status = "failed"
+                else:
+                    status = "no_text"
+                resume_of[file_hash] = outcome.result and outcome.result["id"]
+                self._progress(job_id, [(status, resume_of[file_hash], outcome.error,
+                                         by_hash[file_hash][0])])
+
+        # Later byte-identical uploads point at the row their first copy produced
+        duplicates = [("duplicate", resume_of[h], None, seq)
+                      for h, seqs in by_hash.items() if h in resume_of for seq in seqs[1:]]
+        if duplicates:
+            self._progress(job_id, duplicates)
+        with conn:
+            conn.execute("UPDATE parse_jobs SET profile = ? WHERE id = ? AND worker = ?",
+                         (prof.report() if profiler else None, job_id, self.name))
+        self._finish(job_id, "done")
+
+    @contextmanager
+    def _heartbeat(self, job_id: str):
+        # Keeps the job claimed while it runs, independent of progress writes
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(JOB_HEARTBEAT_SECONDS):
+                try:
+                    conn = db.get_conn()
+                    with conn:
+                        conn.execute("UPDATE parse_jobs SET heartbeat_at = ? WHERE id = ? AND worker = ?",
+                                     (time.time(), job_id, self.name))
+                except sqlite3.Error:
+                    pass  # try again next beat; the stale threshold allows for misses
+
+        ticker = threading.Thread(target=beat, name="resume-parse-heartbeat", daemon=True)
+        ticker.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            ticker.join()
+
+    def _progress(self, job_id: str, updates: list):
+        # updates: [(status, resume_id, error, seq), ...], committed together
+        conn = db.get_conn()
+        with conn:
+            conn.executemany(
+                "UPDATE job_files SET status = ?, resume_id = ?, error = ? WHERE job_id = ? AND seq = ?",
+                [(status, resume_id, error, job_id, seq) for status, resume_id, error, seq in updates])
+            conn.execute("""
+                UPDATE parse_jobs SET heartbeat_at = ?,
+                    done = (SELECT COUNT(*) FROM job_files WHERE job_id = ? AND status != 'queued')
+                WHERE id = ? AND worker = ?""", (time.time(), job_id, job_id, self.name))
+
+    def _finish(self, job_id: str, status: str, error: str = None):
+        # A job another worker has claimed since (this one looked stale) is left to it
+        conn = db.get_conn()
+        with conn:
+            cur = conn.execute(
+                "UPDATE parse_jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND worker = ?",
+                (status, error, _now(), job_id, self.name))
+            if status == "done" and cur.rowcount:
+                # The bytes were only kept so an interrupted job could resume
+                conn.execute("UPDATE job_files SET data = NULL WHERE job_id = ?", (job_id,))
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def ensure_worker() -> JobWorker:
+    """Start (once per process) the thread that runs queued and orphaned jobs."""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = JobWorker()
+            _worker.start()
+    return _worker
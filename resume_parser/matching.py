@@ -0,0 +1,168 @@
+import re
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from . import db
+from .skills import SKILL_MATCHER
+
+# Default weight of a required skill relative to an optional one
+REQUIRED_WEIGHT = 2.0
+METRICS = ("overlap", "jaccard")
+
+# ══════════════════════════════════════════════════════════
+#  JOB DESCRIPTIONS
+# ══════════════════════════════════════════════════════════
+# Skills under a heading like this, or on a line saying so, are optional
+OPTIONAL_RE = re.compile(
+    r"\b(?:nice[\s-]to[\s-]have|good[\s-]to[\s-]have|preferred|bonus|a plus|plus points?|"
+    r"desirable|optional|not required)\b", re.IGNORECASE)
+
+
+class JobSkills(NamedTuple):
+    required: list
+    optional: list
+
+
+def _is_heading(line: str) -> bool:
+    return line.endswith(":") or line.startswith("#")
+
+
+def parse_job_description(text: str) -> JobSkills:
+    """Taxonomy skills in a pasted job description, split into required and optional.
+
+    A heading is a line ending in ``:`` or starting with ``#``. Skills below a
+    "nice to have" / "preferred" style heading, or on a line that says so,
+    are optional; everything else is required. A skill named in both places
+    counts as required. Skills are lower-cased taxonomy terms.
+    """
+    required, optional = set(), set()
+    in_optional = False
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        flagged = bool(OPTIONAL_RE.search(line))
+        if _is_heading(line):
+            in_optional = flagged
+        skills = SKILL_MATCHER.find(line)
+        (optional if in_optional or flagged else required).update(skills)
+    return JobSkills(sorted(required), sorted(optional - required))
+
+
+# ══════════════════════════════════════════════════════════
+#  SKILL BITSET INDEX
+# ══════════════════════════════════════════════════════════
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    # Set bits per row of a (rows, words) uint64 matrix
+    if hasattr(np, "bitwise_count"):  # NumPy 2.0+
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int32)
+    return _BYTE_POPCOUNT[words.view(np.uint8)].sum(axis=1, dtype=np.int32)
+
+
+class Match(NamedTuple):
+    resume_id: str
+    score: float        # 0-1
+    matched: list       # JD skills the candidate has, required ones first
+    missing: list       # required skills the candidate lacks
+
+
+class SkillIndex:
+    """Every candidate's skills as one row of a ``(candidates, words)`` uint64 matrix."""
+
+    def __init__(self, resume_ids: list, blobs: list, skill_ids: dict, generation=None):
+        self.generation = generation
+        self.skill_ids = skill_ids
+        self.skills = {i: skill for skill, i in skill_ids.items()}
+        self.words = max(self.skills, default=0) // 64 + 1
+        width = self.words * 8
+        self.resume_ids = np.array(resume_ids, dtype=object)
+        self.bits = np.frombuffer(b"".join(b.ljust(width, b"\0") for b in blobs),
+                                  dtype="<u8").astype(np.uint64).reshape(len(blobs), self.words)
+        self.counts = popcount(self.bits)
+
+    @classmethod
+    def load(cls, generation=None) -> "SkillIndex":
+        return cls(*db.fetch_skill_bits(), generation=generation)
+
+    def __len__(self) -> int:
+        return len(self.resume_ids)
+
+    def mask(self, skills) -> np.ndarray:
+        # Skills the index has never seen can't match anyone and are left out
+        n = 0
+        for skill in skills:
+            if skill in self.skill_ids:
+                n |= 1 << self.skill_ids[skill]
+        return np.array([(n >> (64 * w)) & (2**64 - 1) for w in range(self.words)], dtype=np.uint64)
+
+    def _skills_of(self, row: np.ndarray, mask: np.ndarray) -> list:
+        n = int.from_bytes((row & mask).astype("<u8").tobytes(), "little")
+        return sorted(self.skills[i] for i in range(n.bit_length()) if n >> i & 1)
+
+    def top_k(self, required=(), optional=(), k: int = 20, metric: str = "overlap",
+              required_weight: float = REQUIRED_WEIGHT, require_all: bool = False) -> list:
+        """The ``k`` best candidates for a job's skills, best first.
+
+        ``overlap`` scores the weighted share of the job's skills a candidate
+        has; ``jaccard`` also divides by the candidate's unrelated skills, so
+        focused profiles beat long skill lists. With ``require_all`` only
+        candidates with every required skill are ranked. Zero scores are
+        never returned.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"unknown metric {metric!r}, expected one of {METRICS}")
+        required = {s.lower() for s in required}
+        optional = {s.lower() for s in optional} - required
+        if not (required or optional) or not len(self) or k <= 0:
+            return []
+        req_mask, opt_mask = self.mask(required), self.mask(optional)
+        have_req = popcount(self.bits & req_mask)
+        have_opt = popcount(self.bits & opt_mask)
+        weighted = required_weight * have_req + have_opt
+        total = required_weight * len(required) + len(optional)
+        if metric == "jaccard":
+            # Candidate skills outside the job count once each in the union
+            scores = weighted / (total + (self.counts - have_req - have_opt))
+        else:
+            scores = weighted / total
+        if require_all:
+            scores = np.where(have_req == len(required), scores, 0.0)
+
+        k = min(k, len(self))
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(self) else np.arange(len(self))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        matches = []
+        for i in top:
+            if scores[i] <= 0:
+                break
+            row = self.bits[i]
+            matched_req = self._skills_of(row, req_mask)
+            matches.append(Match(self.resume_ids[i], float(scores[i]),
+                                 matched_req + self._skills_of(row, opt_mask),
+                                 sorted(required - set(matched_req))))
+        return matches
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def skill_index() -> SkillIndex:
+    """The index for the current database generation; reloaded after any write."""
+    global _index
+    generation = db.current_generation()
+    with _index_lock:
+        if _index is None or _index.generation != generation:
+            _index = SkillIndex.load(generation)
+        return _index
+
+
+def match_candidates(required=(), optional=(), k: int = 20, metric: str = "overlap",
+                     required_weight: float = REQUIRED_WEIGHT, require_all: bool = False) -> list:
+    # Top-k Matches across every stored candidate; see SkillIndex.top_k
+    return skill_index().top_k(required, optional, k, metric, required_weight, require_all)
@@ -0,0 +1,209 @@
+import hashlib
+import re
+import time
+import uuid
+from datetime import datetime
+from functools import lru_cache
+
+import spacy
+
+from .dedupe import minhash_signature
+from .sections import sectionize
+from .similar import term_vector
+from .skills import parse_skills
+from .timing import StageTimer
+
+SPACY_MODEL = "en_core_web_sm"
+# Bump whenever parser output changes so cached rows get re-parsed
+PARSER_VERSION = "2"
+# parse_name only reads doc.ents, so everything but ner is dead weight. In
+# en_core_web_sm ner embeds its own tok2vec; the shared one only feeds the
+# tagger and parser.
+NLP_DISABLED = ("tok2vec", "tagger", "parser", "lemmatizer", "attribute_ruler")
+NLP_MAX_CHARS = 50000  # limit for performance
+NLP_BATCH_SIZE = 32
+
+# ══════════════════════════════════════════════════════════
+#  NLP MODEL
+# ══════════════════════════════════════════════════════════
+
+
+@lru_cache(maxsize=None)
+def load_nlp(model: str = SPACY_MODEL):
+    # Raises OSError when the model isn't installed; callers decide how to report it
+    return spacy.load(model, disable=NLP_DISABLED)
+
+
+def nlp_installed(model: str = SPACY_MODEL) -> bool:
+    # Whether load_nlp can find the model, without loading it
+    return spacy.util.is_package(model)
+
+
+def nlp_pipe(texts, nlp=None, batch_size: int = NLP_BATCH_SIZE, n_process: int = 1):
+    # Batched NER over many documents; yields Docs in input order
+    if nlp is None:
+        nlp = load_nlp()
+    return nlp.pipe((t[:NLP_MAX_CHARS] for t in texts),
+                    batch_size=batch_size, n_process=n_process)
+
+
+# ══════════════════════════════════════════════════════════
+#  PARSERS
+# ══════════════════════════════════════════════════════════
+
+
+def parse_email(text: str) -> str:
+    match = re.search(
+        r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", text)
+    return match.group(0) if match else ""
+
+
+def parse_phone(text: str) -> str:
+    patterns = [
+        r"(?:\+91[\s\-]?)?[6-9]\d{9}",
+        r"\+?[\d][\d\s\-\(\)]{8,15}\d",
+    ]
+    for p in patterns:
+        m = re.search(p, text)
+        if m:
+            return m.group(0).strip()
+    return ""
+
+
+def parse_name(text: str, doc) -> str:
+    # Try spaCy PERSON first
+    for ent in doc.ents:
+        if ent.label_ == "PERSON":
+            name = ent.text.strip()
+            if 2 <= len(name.split()) <= 4 and len(name) < 50:
+                return name
+    # Fallback: first non-empty line that looks like a name
+    for line in text.split("\n")[:8]:
+        line = line.strip()
+        if (2 <= len(line.split()) <= 4 and
+                line.replace(" ", "").replace(".", "").isalpha() and
+                len(line) < 50 and line[0].isupper()):
+            return line
+    return ""
+
+
+# Degrees are matched as whole words; the bare "BE"/"ME" only in capitals, as
+# lower-case they are everyday words
+DEGREE_RE = re.compile(
+    r"\b(?:(?i:[bm](?:\.?(?:tech|sc)|\.(?:e|a|com)|ca|ba)|ph\.?d|bachelors?|masters?|diploma|"
+    r"1[02]th|llb|mbbs|engineering)|BE|ME)\b")
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+
+
+def _unique(lines, limit: int) -> list:
+    return list(dict.fromkeys(lines))[:limit]
+
+
+def parse_education(sections) -> list:
+    if isinstance(sections, str):
+        sections = sectionize(sections)
+    edu_lines = [l for l in sections.bodies.get("education", ()) if len(l) > 3]
+    edu_lines += [l for l, sec in zip(sections.lines, sections.section)
+                  if sec != "education" and len(l) < 200 and DEGREE_RE.search(l)]
+    return _unique(edu_lines, 6)
+
+
+def parse_experience(sections) -> list:
+    if isinstance(sections, str):
+        sections = sectionize(sections)
+    exp_lines = [l for l in sections.bodies.get("experience", ()) if len(l) > 3]
+    # Also catch dated lines like "2020 - 2023" next to job titles elsewhere,
+    # but not the graduation years of the education section
+    exp_lines += [l for l, sec in zip(sections.lines, sections.section)
+                  if sec not in ("experience", "education") and len(l) < 120 and YEAR_RE.search(l)]
+    return _unique(exp_lines, 10)
+
+
+def parse_linkedin(text: str) -> str:
+    m = re.search(r'linkedin\.com/in/[\w\-]+', text, re.IGNORECASE)
+    return "https://" + m.group(0) if m else ""
+
+
+def parse_github(text: str) -> str:
+    m = re.search(r'github\.com/[\w\-]+', text, re.IGNORECASE)
+    return "https://" + m.group(0) if m else ""
+
+
+def completion_score(data: dict) -> int:
+    fields = ["name", "email", "phone", "skills", "education", "experience"]
+    filled = sum(1 for f in fields if data.get(
+        f) and data[f] != "" and data[f] != [])
+    return int((filled / len(fields)) * 100)
+
+
+def content_hash(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def build_result(text: str, filename: str, doc, file_hash: str = None,
+                 truncated: bool = False, pages: int = 0, timings: dict = None) -> dict:
+    # ``timings`` may already hold the extract/nlp stages; the field parsers add theirs
+    timer = StageTimer(timings)
+    with timer("sections"):
+        sections = sectionize(text)
+    with timer("skills"):
+        skills = parse_skills(text)
+    with timer("name"):
+        name = parse_name(text, doc)
+    with timer("contact"):
+        email, phone = parse_email(text), parse_phone(text)
+        linkedin, github = parse_linkedin(text), parse_github(text)
+    with timer("education"):
+        education = parse_education(sections)
+    with timer("experience"):
+        experience = parse_experience(sections)
+    with timer("minhash"):
+        signature = minhash_signature(text)
+    with timer("terms"):
+        terms = term_vector(text, skills)
+    data = {
+        # Same file -> same id, so re-uploads replace their row instead of adding one
+        "id":          file_hash[:16] if file_hash else str(uuid.uuid4())[:8],
+        "filename":    filename,
+        "name":        name,
+        "email":       email,
+        "phone":       phone,
+        "linkedin":    linkedin,
+        "github":      github,
+        "skills":      skills,
+        "education":   education,
+        "experience":  experience,
+        "parsed_at":   datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "text":        text,          # stored compressed in resume_text
+        "minhash":     signature,     # near-duplicate detection, see dedupe.py
+        "terms":       terms,         # similar-candidate search, see similar.py
+        "truncated":   truncated,
+        "content_hash":   file_hash,
+        "parser_version": PARSER_VERSION,
+        "pages":       pages,
+        "chars":       len(text),
+        "timings":     timer.timings,
+    }
+    data["score"] = completion_score(data)
+    return data
+
+
+def parse_resume(text: str, filename: str, nlp=None) -> dict:
+    if nlp is None:
+        nlp = load_nlp()
+    timer = StageTimer()
+    with timer("nlp"):
+        doc = nlp(text[:NLP_MAX_CHARS])
+    return build_result(text, filename, doc, timings=timer.timings)
+
+
+def parse_resumes(items: list, nlp=None, batch_size: int = NLP_BATCH_SIZE,
+                  n_process: int = 1) -> list:
+    # items: [(text, filename), ...]; one nlp.pipe pass instead of a call per document
+    start = time.perf_counter()
+    docs = list(nlp_pipe((text for text, _ in items), nlp,
+                         batch_size=batch_size, n_process=n_process))
+    # Batched NER has no per-document time; each document gets an equal share
+    nlp_ms = (time.perf_counter() - start) * 1000 / max(len(items), 1)
+    return [build_result(text, filename, doc, timings={"nlp": nlp_ms})
+            for (text, filename), doc in zip(items, docs)]
@@ -0,0 +1,70 @@
+import io
+from contextlib import contextmanager
+
+import pdfplumber
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # optional fast backend
+    pdfium = None
+
+# ══════════════════════════════════════════════════════════
+#  PDF BACKENDS
+# ══════════════════════════════════════════════════════════
+# A backend is a context manager ``open_pages(file_bytes, max_pages)`` that
+# yields ``(page_texts, more_pages)``: a lazy iterator over the text of at
+# most ``max_pages`` pages (0 = all) and whether the document has pages past
+# that window. Pages must only be parsed when the iterator reaches them.
+
+
+def iter_pdfplumber_pages(pages):
+    # Lazily extract one pdfplumber page at a time, dropping its parsed
+    # layout objects as soon as the text is out
+    for page in pages:
+        text = page.extract_text() or ""
+        page.close()
+        yield text
+
+
+@contextmanager
+def pdfplumber_pages(file_bytes: bytes, max_pages: int = 0):
+    # Layout-aware and the most faithful on multi-column resumes, but slow.
+    # Only materialize the pages we may read, plus one that reveals truncation.
+    window = range(1, max_pages + 2) if max_pages else None
+    with pdfplumber.open(io.BytesIO(file_bytes), pages=window) as pdf:
+        pages = pdf.pages
+        more_pages = bool(max_pages) and len(pages) > max_pages
+        yield iter_pdfplumber_pages(pages[:max_pages] if max_pages else pages), more_pages
+
+
+def iter_pdfium_pages(pdf, count: int):
+    for i in range(count):
+        page = pdf[i]
+        textpage = page.get_textpage()
+        try:
+            text = textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+        # PDFium separates lines with CRLF; the parsers split on "\n"
+        yield text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+@contextmanager
+def pdfium_pages(file_bytes: bytes, max_pages: int = 0):
+    # Reads the text layer straight out of PDFium without layout analysis
+    pdf = pdfium.PdfDocument(file_bytes)
+    try:
+        total = len(pdf)
+        count = min(total, max_pages) if max_pages else total
+        yield iter_pdfium_pages(pdf, count), total > count
+    finally:
+        pdf.close()
+
+
+PDF_BACKENDS = {"pdfplumber": pdfplumber_pages}
+if pdfium is not None:
+    PDF_BACKENDS["pdfium"] = pdfium_pages
+
+ACCURATE_BACKEND = "pdfplumber"
+FAST_BACKEND = "pdfium" if "pdfium" in PDF_BACKENDS else ACCURATE_BACKEND
@@ -0,0 +1,319 @@
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from . import db
+from .dedupe import identity_keys, minhash_signature
+from .extract import MAX_CHARS, MAX_PAGES, extract_document
+from .parsing import (NLP_BATCH_SIZE, NLP_MAX_CHARS, PARSER_VERSION, build_result,
+                      completion_score, content_hash, load_nlp, nlp_pipe)
+from .similar import term_vector
+from .timing import StageTimer
+
+# Forking a process that is already running Streamlit's server threads can
+# deadlock the child, so workers always start from a fresh interpreter.
+MP_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def default_workers() -> int:
+    return max(1, min(8, (os.cpu_count() or 1) - 1))
+
+
+class ParseOutcome(NamedTuple):
+    filename: str
+    result: Optional[dict]   # None when no text could be extracted or parsing failed
+    error: Optional[str]     # set only when the file raised
+    cached: bool = False     # result came from the DB, the file wasn't parsed
+    content_hash: Optional[str] = None  # of the file's bytes, to tell same-named files apart
+
+
+def _error(e: Exception) -> str:
+    return f"{type(e).__name__}: {e}"
+
+
+# ══════════════════════════════════════════════════════════
+#  WORKERS
+# ══════════════════════════════════════════════════════════
+_worker_nlp = None
+
+
+def _init_worker():
+    # Runs once per worker process, so the spaCy model is loaded once, not per file
+    global _worker_nlp
+    _worker_nlp = load_nlp()
+
+
+def parse_chunk(files: list, nlp=None, batch_size: int = NLP_BATCH_SIZE,
+                n_process: int = 1, max_pages: int = MAX_PAGES,
+                max_chars: int = MAX_CHARS) -> list:
+    """Extract and parse ``(filename, file_bytes)`` pairs with one batched NLP pass.
+
+    Returns one ParseOutcome per input file, in input order.
+    """
+    if nlp is None:
+        nlp = _worker_nlp if _worker_nlp is not None else load_nlp()
+    outcomes = [None] * len(files)
+    texts = []   # (index, filename, extraction, file_hash, timer) of files that produced text
+    for i, (filename, file_bytes) in enumerate(files):
+        timer = StageTimer()
+        file_hash = content_hash(file_bytes)
+        try:
+            with timer("extract"):
+                extraction = extract_document(file_bytes, filename, max_pages, max_chars)
+        except Exception as e:
+            outcomes[i] = ParseOutcome(filename, None, _error(e), content_hash=file_hash)
+            continue
+        if extraction.text:
+            texts.append((i, filename, extraction, file_hash, timer))
+        else:
+            outcomes[i] = ParseOutcome(filename, None, None, content_hash=file_hash)
+
+    start = time.perf_counter()
+    try:
+        docs = list(nlp_pipe((ex.text for _, _, ex, _, _ in texts), nlp,
+                             batch_size=batch_size, n_process=n_process))
+        # Batched NER has no per-document time; each document gets an equal share
+        nlp_ms = (time.perf_counter() - start) * 1000 / max(len(texts), 1)
+    except Exception:
+        # One bad document shouldn't sink the chunk: retry the files one by one
+        docs = [None] * len(texts)
+    for (i, filename, ex, file_hash, timer), doc in zip(texts, docs):
+        try:
+            if doc is None:
+                with timer("nlp"):
+                    doc = nlp(ex.text[:NLP_MAX_CHARS])
+            else:
+                timer.add("nlp", nlp_ms)
+            outcomes[i] = ParseOutcome(filename, build_result(
+                ex.text, filename, doc, file_hash, ex.truncated, ex.pages, timer.timings), None,
+                content_hash=file_hash)
+        except Exception as e:
+            outcomes[i] = ParseOutcome(filename, None, _error(e), content_hash=file_hash)
+    return outcomes
+
+
+def worker_pool(workers: int) -> ProcessPoolExecutor:
+    # A parser pool that can be reused across many parse_files/ingest_files
+    # calls, so each worker loads spaCy once per run instead of once per call
+    return ProcessPoolExecutor(max_workers=workers, mp_context=MP_CONTEXT,
+                               initializer=_init_worker)
+
+
+def parse_file(filename: str, file_bytes: bytes, nlp=None) -> ParseOutcome:
+    return parse_chunk([(filename, file_bytes)], nlp)[0]
+
+
+# ══════════════════════════════════════════════════════════
+#  BATCH PARSING
+# ══════════════════════════════════════════════════════════
+
+
+def parse_files(files: Iterable, workers: int = 1, nlp=None,
+                batch_size: int = NLP_BATCH_SIZE, n_process: int = 1,
+                max_pages: int = MAX_PAGES, max_chars: int = MAX_CHARS,
+                pool: ProcessPoolExecutor = None) -> Iterator[ParseOutcome]:
+    """Parse ``(filename, file_bytes)`` pairs, yielding outcomes as they finish.
+
+    Files are handed out in chunks so every worker can feed spaCy a batch via
+    ``nlp.pipe``. With ``workers > 1`` chunks run on a process pool and results
+    come back in completion order; ``n_process`` only applies to the in-process
+    path. Pass a ``worker_pool`` as ``pool`` to reuse it instead of starting
+    one per call; it is left running. Nothing is written to the database
+    here; the caller stays the single writer.
+    """
+    files = list(files)
+    if workers <= 1 or len(files) <= 1:
+        if nlp is None:
+            nlp = load_nlp()
+        for start in range(0, len(files), batch_size):
+            yield from parse_chunk(files[start:start + batch_size], nlp,
+                                   batch_size, n_process, max_pages, max_chars)
+        return
+
+    workers = min(workers, len(files))
+    # Small enough that every worker gets several chunks (keeps the progress
+    # bar moving and balances uneven files), capped at one spaCy batch
+    chunk_size = max(1, min(batch_size, math.ceil(len(files) / (workers * 4))))
+    with nullcontext(pool) if pool is not None else worker_pool(workers) as executor:
+        futures = {}
+        for start in range(0, len(files), chunk_size):
+            chunk = files[start:start + chunk_size]
+            try:
+                futures[executor.submit(parse_chunk, chunk, None, batch_size, 1,
+                                        max_pages, max_chars)] = chunk
+            except BrokenExecutor as e:
+                # A shared pool can already be broken by an earlier call
+                for filename, data in chunk:
+                    yield ParseOutcome(filename, None, _error(e), content_hash=content_hash(data))
+        for fut in as_completed(futures):
+            try:
+                yield from fut.result()
+            except Exception as e:
+                # A crashed worker (e.g. BrokenProcessPool) only fails its own chunk
+                for filename, data in futures[fut]:
+                    yield ParseOutcome(filename, None, _error(e), content_hash=content_hash(data))
+
+
+# ══════════════════════════════════════════════════════════
+#  INGEST
+# ══════════════════════════════════════════════════════════
+
+
+def ingest_files(files: Iterable, workers: int = 1, nlp=None,
+                 batch_size: int = NLP_BATCH_SIZE, max_pages: int = MAX_PAGES,
+                 max_chars: int = MAX_CHARS, pool: ProcessPoolExecutor = None) -> Iterator[ParseOutcome]:
+    """Parse ``(filename, file_bytes)`` pairs into the database.
+
+    Files whose bytes were already parsed by the current PARSER_VERSION are
+    served from the ``resumes`` table (``cached=True``) without extraction or
+    NLP; identical files within ``files`` are handled once. Parsed rows are
+    group-committed by a ResumeWriter on the calling thread.
+    """
+    unique, seen = [], set()
+    for filename, file_bytes in files:
+        file_hash = content_hash(file_bytes)
+        if file_hash not in seen:
+            seen.add(file_hash)
+            unique.append((filename, file_bytes, file_hash))
+
+    cached = db.fetch_cached_resumes([h for _, _, h in unique], PARSER_VERSION)
+    for filename, _, file_hash in unique:
+        if file_hash in cached:
+            yield ParseOutcome(filename, cached[file_hash], None, cached=True, content_hash=file_hash)
+
+    to_parse = [(name, data) for name, data, h in unique if h not in cached]
+    # Leaving the with block (exhaustion, an early close() or an error) flushes,
+    # so every parsed row is committed before the caller sees the batch end
+    with db.ResumeWriter() as writer:
+        for outcome in parse_files(to_parse, workers=workers, nlp=nlp, batch_size=batch_size,
+                                   max_pages=max_pages, max_chars=max_chars, pool=pool):
+            if outcome.result:
+                writer.add(outcome.result)
+            else:
+                writer.tick()
+            yield outcome
+
+
+# ══════════════════════════════════════════════════════════
+#  RE-PARSE
+# ══════════════════════════════════════════════════════════
+
+
+def reparse_resumes(ids: list = None, nlp=None,
+                    batch_size: int = NLP_BATCH_SIZE) -> Iterator[ParseOutcome]:
+    """Re-run the parsers over stored full text, without the original files.
+
+    Defaults to every row an older PARSER_VERSION produced. Rows keep their id,
+    filename, content hash, page count and parsed_at, and their extraction
+    metrics are left as they were. Rows saved before full text was stored are
+    skipped (``error`` says why); ingest their files again instead.
+    """
+    if ids is None:
+        ids = db.stale_resume_ids(PARSER_VERSION)
+    if nlp is None:
+        nlp = load_nlp()
+    with db.ResumeWriter() as writer:
+        for start in range(0, len(ids), batch_size):
+            rows, texts = [], []
+            pages = db.fetch_pages(ids[start:start + batch_size])
+            for row in db.fetch_resumes(ids[start:start + batch_size]):
+                text = db.fetch_resume_text(row["id"], preview=False)
+                if text is None:
+                    yield ParseOutcome(row["filename"], None, "only a text preview is stored")
+                    continue
+                rows.append(row)
+                texts.append(text)
+            try:
+                docs = list(nlp_pipe(texts, nlp, batch_size=batch_size))
+            except Exception:
+                docs = [None] * len(texts)
+            for row, text, doc in zip(rows, texts, docs):
+                try:
+                    if doc is None:
+                        doc = nlp(text[:NLP_MAX_CHARS])
+                    result = build_result(text, row["filename"], doc, row["content_hash"],
+                                          row["truncated"], pages.get(row["id"], 0))
+                except Exception as e:
+                    yield ParseOutcome(row["filename"], None, _error(e))
+                    continue
+                # Still the same upload: it keeps its place in newest-first lists
+                result["id"], result["parsed_at"] = row["id"], row["parsed_at"]
+                del result["timings"]
+                writer.add(result)
+                yield ParseOutcome(row["filename"], result, None)
+
+
+# ══════════════════════════════════════════════════════════
+#  DUPLICATES
+# ══════════════════════════════════════════════════════════
+CONTACT_FIELDS = ("name", "email", "phone", "linkedin", "github")
+LIST_FIELDS = ("skills", "education", "experience")
+
+
+def index_stored_duplicates(batch_size: int = 500) -> int:
+    """Add rows stored before duplicate detection existed to its index.
+
+    Their likely duplicates are recorded as for new uploads. Signatures come
+    from the stored text, which is only the 3,000-character preview for the
+    oldest rows. Returns the number of rows indexed.
+    """
+    ids = db.unindexed_resume_ids()
+    for start in range(0, len(ids), batch_size):
+        db.index_duplicates([
+            (r["id"], identity_keys(r), minhash_signature(db.fetch_resume_text(r["id"]) or ""))
+            for r in db.fetch_resumes(ids[start:start + batch_size])])
+    return len(ids)
+
+
+def merge_duplicates(resume_ids: list, keep: str = None, merge: bool = True) -> Optional[dict]:
+    """Collapse resumes of one candidate into a single row and return it.
+
+    ``keep`` (default: the most recently parsed) survives. With ``merge`` its
+    empty contact fields are filled from the others, newest first, and its
+    skills, education and experience gain the others' entries; without it
+    the others are simply deleted (keep latest). One transaction either way.
+    """
+    rows = db.fetch_resumes(list(resume_ids))
+    if not rows:
+        return None
+    rows.sort(key=lambda r: (r["parsed_at"], r["id"]), reverse=True)
+    kept = next((r for r in rows if r["id"] == keep), rows[0])
+    others = [r for r in rows if r is not kept]
+    if not merge:
+        db.collapse_resumes([r["id"] for r in others])
+        return kept
+
+    merged = dict(kept)
+    for other in others:
+        for field in CONTACT_FIELDS:
+            merged[field] = merged[field] or other[field]
+        for field in LIST_FIELDS:
+            merged[field] = list(dict.fromkeys(merged[field] + other[field]))
+    merged["skills"] = sorted(merged["skills"])
+    merged["score"] = completion_score(merged)
+    text = db.fetch_resume_text(kept["id"]) or ""
+    merged["terms"] = term_vector(text, merged["skills"])
+    db.collapse_resumes([r["id"] for r in others], merged)
+    return merged
+
+
+# ══════════════════════════════════════════════════════════
+#  SIMILAR CANDIDATES
+# ══════════════════════════════════════════════════════════
+
+
+def index_stored_terms(batch_size: int = 500) -> int:
+    """Add rows stored before similar-candidate search existed to its index.
+
+    Terms come from the stored text (only the 3,000-character preview for
+    the oldest rows) and skills. Returns the number of rows indexed.
+    """
+    ids = db.resumes_without_terms()
+    for start in range(0, len(ids), batch_size):
+        db.save_terms([(r["id"], term_vector(db.fetch_resume_text(r["id"]) or "", r["skills"]))
+                       for r in db.fetch_resumes(ids[start:start + batch_size])])
+    return len(ids)
@@ -0,0 +1,71 @@
+import re
+from typing import NamedTuple
+
+# ══════════════════════════════════════════════════════════
+#  SECTION HEADINGS
+# ══════════════════════════════════════════════════════════
+SECTION_HEADINGS = {
+    "education":      ("education", "academic", "academics", "academic background",
+                       "qualification", "qualifications", "schooling"),
+    "experience":     ("experience", "employment", "employment history", "work history",
+                       "career", "career history", "internship", "internships"),
+    "skills":         ("skill", "skills", "technical skills", "competencies", "technologies"),
+    "projects":       ("project", "projects"),
+    "certifications": ("certification", "certifications", "certificates", "courses"),
+    "summary":        ("summary", "objective", "profile", "about me"),
+    "achievements":   ("achievements", "awards", "honors", "honours"),
+    "other":          ("interests", "hobbies", "languages", "publications", "references",
+                       "personal details", "declaration"),
+}
+
+_HEADING_TERMS = {term: name for name, terms in SECTION_HEADINGS.items() for term in terms}
+# Longest terms first so "technical skills" wins over "skills" at the same spot
+HEADING_RE = re.compile(
+    r"\b(" + "|".join(re.escape(t) for t in sorted(_HEADING_TERMS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE)
+# Headings are short; "5 years of experience building APIs" is body text
+HEADING_MAX_WORDS = 5
+HEADING_MAX_CHARS = 40
+
+
+class Sections(NamedTuple):
+    lines: list    # every non-empty line, stripped, in document order
+    bodies: dict   # section name -> lines under its headings, in order
+    section: list  # section name of each entry in ``lines`` ("" before the first heading)
+
+
+def heading_of(line: str):
+    """Return ``(section, inline_body)`` when ``line`` is a section heading, else None.
+
+    "Skills: Python, SQL" is a skills heading whose body starts on the same line.
+    """
+    head, sep, rest = line.partition(":")
+    if len(head) > HEADING_MAX_CHARS or len(head.split()) > HEADING_MAX_WORDS:
+        return None
+    if not sep and head.rstrip().endswith("."):
+        return None
+    m = HEADING_RE.search(head)
+    if not m:
+        return None
+    return _HEADING_TERMS[m.group(1).lower()], rest.strip()
+
+
+def sectionize(text: str) -> Sections:
+    """Split a resume into headed sections in a single pass over its lines."""
+    lines, section, bodies = [], [], {}
+    current = ""
+    for raw in text.split("\n"):
+        line = raw.strip()
+        if not line:
+            continue
+        heading = heading_of(line)
+        if heading:
+            current, line = heading
+            bodies.setdefault(current, [])
+            if not line:
+                continue
+        lines.append(line)
+        section.append(current)
+        if current:
+            bodies[current].append(line)
+    return Sections(lines, bodies, section)
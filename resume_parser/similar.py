@@ -0,0 +1,227 @@
+import copy
+import os
+import re
+import threading
+import zlib
+from typing import NamedTuple
+
+import numpy as np
+from scipy import sparse
+
+from . import db
+
+# ══════════════════════════════════════════════════════════
+#  TERM VECTORS
+# ══════════════════════════════════════════════════════════
+# Terms are hashed into 2**HASH_BITS features, so documents are vectorized on
+# their own (in the parser processes) with no shared vocabulary to keep in sync
+HASH_BITS = 20
+# Each taxonomy skill is one extra term, counted this many times
+SKILL_WEIGHT = 3
+# Stored per resume as packed (feature, count) pairs, sorted by feature
+TERM_DTYPE = np.dtype([("feature", "<u4"), ("count", "<u2")])
+
+STOPWORDS = frozenset("""
+    a an and are as at be been by for from has have he her his i in is it its me my of on
+    or our she that the their them they this to was we were will with you your
+""".split())
+_TERM_RE = re.compile(r"[a-z][a-z0-9+#]+")
+
+
+def terms(text: str, skills=()) -> list:
+    words = [w for w in _TERM_RE.findall(text.lower()) if w not in STOPWORDS]
+    return words + [f"skill:{s.lower()}" for s in skills for _ in range(SKILL_WEIGHT)]
+
+
+def term_vector(text: str, skills=()) -> bytes:
+    """Hashed term counts of a resume's text and skills, packed as TERM_DTYPE."""
+    found = terms(text, skills)
+    if not found:
+        return b""
+    features = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in found),
+                           dtype=np.uint32, count=len(found)) & np.uint32(2**HASH_BITS - 1)
+    features, counts = np.unique(features, return_counts=True)
+    packed = np.empty(len(features), TERM_DTYPE)
+    packed["feature"], packed["count"] = features, np.minimum(counts, 2**16 - 1)
+    return packed.tobytes()
+
+
+def _rows(blobs: list) -> sparse.csr_matrix:
+    # Sub-linear term frequencies (1 + log count), one row per blob
+    packed = np.frombuffer(b"".join(blobs), TERM_DTYPE)
+    indptr = np.zeros(len(blobs) + 1, dtype=np.int64)
+    np.cumsum([len(b) // TERM_DTYPE.itemsize for b in blobs], out=indptr[1:])
+    data = 1 + np.log(packed["count"].astype(np.float32))
+    return sparse.csr_matrix((data, packed["feature"].astype(np.int32), indptr),
+                             shape=(len(blobs), 2**HASH_BITS))
+
+
+# ══════════════════════════════════════════════════════════
+#  TF-IDF INDEX
+# ══════════════════════════════════════════════════════════
+# Rows written since the last rebuild (new, replaced or deleted) beyond which
+# the index is rebuilt, its IDF refreshed and its snapshot saved again
+COMPACT_FRACTION = 0.1
+COMPACT_MIN_ROWS = 1000
+
+
+class Similar(NamedTuple):
+    resume_id: str
+    score: float        # cosine similarity, 0-1
+
+
+class SimilarIndex:
+    """TF-IDF cosine search over every resume with stored terms.
+
+    Sub-linear term frequencies are held as CSR matrices, one row per
+    resume: ``main`` as of the last rebuild and a small ``delta`` of rows
+    written since. Replaced and deleted rows stay in place with a zero
+    norm until the next rebuild. IDF is fixed at rebuild time, so applying a
+    change touches only the changed rows, and a query is one sparse
+    matrix-vector product per matrix. An index never changes once built:
+    ``refresh`` returns a new one, so queries can run on it without a lock.
+    """
+
+    def __init__(self, resume_ids: list, tf: sparse.csr_matrix, seq: int, path: str = None):
+        self.path = path
+        self._rebuild(list(resume_ids), tf, seq)
+
+    def __len__(self) -> int:
+        return len(self.row_of)
+
+    def _rebuild(self, resume_ids: list, tf: sparse.csr_matrix, seq: int):
+        self.resume_ids = resume_ids
+        self.row_of = {resume_id: i for i, resume_id in enumerate(resume_ids)}
+        self.main, self.delta = tf, _rows([])
+        self.alive = np.ones(len(resume_ids), dtype=bool)
+        self.seq = seq
+        self.stale = 0
+        # Smoothed IDF, as in scikit-learn: log((1 + n) / (1 + df)) + 1
+        df = np.bincount(tf.indices, minlength=2**HASH_BITS)
+        self.idf = (np.log((1 + len(resume_ids)) / (1 + df)) + 1).astype(np.float32)
+        self.norms = self._norms(tf)
+
+    def _norms(self, tf: sparse.csr_matrix) -> np.ndarray:
+        squares = tf.copy()
+        squares.data **= 2
+        return np.sqrt(squares @ self.idf ** 2)
+
+    def _row(self, i: int) -> sparse.csr_matrix:
+        n = self.main.shape[0]
+        return self.main[i] if i < n else self.delta[i - n]
+
+    # ── persistence ──────────────────────────────────────
+    @classmethod
+    def load(cls, path: str) -> "SimilarIndex":
+        """The snapshot at ``path`` brought up to date, or a fresh build from the database."""
+        index = cls.read_snapshot(path)
+        if index is not None:
+            index = index.refresh()
+        # A snapshot that disagrees on the row count belongs to another database
+        if index is not None and len(index) == db.count_terms():
+            return index
+        seq, resume_ids, blobs = db.fetch_terms()
+        index = cls(resume_ids, _rows(blobs), seq, path)
+        index.save()
+        return index
+
+    @classmethod
+    def read_snapshot(cls, path: str):
+        try:
+            with np.load(path, allow_pickle=False) as f:
+                tf = sparse.csr_matrix((f["data"], f["indices"], f["indptr"]),
+                                       shape=(len(f["resume_ids"]), 2**HASH_BITS))
+                return cls(f["resume_ids"].tolist(), tf, int(f["seq"]), path)
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def save(self):
+        # Only a freshly rebuilt index is saved. Written to a temporary file and
+        # renamed, so readers never see half of one.
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, data=self.main.data, indices=self.main.indices, indptr=self.main.indptr,
+                     resume_ids=np.array(self.resume_ids, dtype=str), seq=self.seq)
+        os.replace(tmp, self.path)
+
+    def refresh(self) -> "SimilarIndex":
+        """This index with rows written or deleted since ``seq`` applied.
+
+        Returns self if nothing changed and None if the log no longer covers
+        the changes. The new index shares ``main`` with this one.
+        """
+        changes = db.fetch_term_changes(self.seq)
+        if changes is None:
+            return None
+        seq, changed = changes
+        if not changed:
+            return self
+        index = copy.copy(self)
+        index.seq = seq
+        index.row_of, index.resume_ids = dict(self.row_of), list(self.resume_ids)
+        index.alive, index.norms = self.alive.copy(), self.norms.copy()
+        for resume_id in changed:
+            i = index.row_of.pop(resume_id, None)
+            if i is not None:
+                index.alive[i] = False
+                index.norms[i] = 0.0
+        added = [(i, blob) for i, blob in changed.items() if blob is not None]
+        new = _rows([blob for _, blob in added])
+        for resume_id, _ in added:
+            index.row_of[resume_id] = len(index.resume_ids)
+            index.resume_ids.append(resume_id)
+        index.delta = sparse.vstack([self.delta, new], format="csr")
+        index.alive = np.concatenate([index.alive, np.ones(len(added), dtype=bool)])
+        index.norms = np.concatenate([index.norms, index._norms(new)])
+        index.stale = self.stale + len(changed)
+
+        if index.stale > max(COMPACT_MIN_ROWS, COMPACT_FRACTION * len(index)):
+            index._rebuild([i for i, k in zip(index.resume_ids, index.alive) if k],
+                           sparse.vstack([index.main, index.delta], format="csr")[index.alive], seq)
+            if index.path:
+                index.save()
+        return index
+
+    # ── queries ──────────────────────────────────────────
+    def top_k(self, resume_id: str, k: int = 20) -> list:
+        """The ``k`` resumes most like ``resume_id``, best first; [] if it isn't indexed."""
+        i = self.row_of.get(resume_id)
+        if i is None or not self.norms[i] or k <= 0:
+            return []
+        row = self._row(i)
+        query = np.zeros(2**HASH_BITS, dtype=np.float32)
+        query[row.indices] = row.data * self.idf[row.indices] ** 2
+        dots = np.concatenate([self.main @ query, self.delta @ query])
+        # Replaced, deleted and empty rows have a zero norm and score 0
+        scores = np.divide(dots, self.norms * self.norms[i], out=np.zeros_like(dots),
+                           where=self.norms > 0)
+        scores[i] = 0.0
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [Similar(self.resume_ids[j], float(min(scores[j], 1.0)))
+                for j in top if scores[j] > 0]
+
+
+def snapshot_path() -> str:
+    # Next to the database: resumes.db -> resumes.similar.npz
+    return os.path.splitext(db.DB_PATH)[0] + ".similar.npz"
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def similar_index() -> SimilarIndex:
+    """The process-wide index, brought up to date with the database on each call."""
+    global _index
+    with _index_lock:
+        index = _index.refresh() if _index is not None and _index.path == snapshot_path() else None
+        _index = index if index is not None else SimilarIndex.load(snapshot_path())
+        return _index
+
+
+def similar_candidates(resume_id: str, k: int = 20) -> list:
+    # Top-k Similar resumes by TF-IDF cosine; see SimilarIndex.top_k
+    return similar_index().top_k(resume_id, k)
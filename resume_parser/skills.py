@@ -0,0 +1,102 @@
+import re
+
+# ══════════════════════════════════════════════════════════
+#  SKILLS DICTIONARY
+# ══════════════════════════════════════════════════════════
+SKILLS_DB = {
+    # Languages
+    "python", "java", "javascript", "typescript", "c++", "c#", "c", "ruby", "go", "rust", "kotlin", "swift",
+    "php", "scala", "r", "matlab", "perl", "bash", "shell", "dart", "lua", "haskell", "elixir", "clojure",
+    # Web
+    "html", "css", "react", "angular", "vue", "next.js", "nuxt", "svelte", "jquery", "bootstrap", "tailwind",
+    "sass", "less", "webpack", "vite", "node.js", "express", "django", "flask", "fastapi", "spring", "rails",
+    "asp.net", "laravel", "gatsby", "remix",
+    # Data / ML / AI
+    "machine learning", "deep learning", "nlp", "computer vision", "tensorflow", "pytorch", "keras",
+    "scikit-learn", "pandas", "numpy", "matplotlib", "seaborn", "plotly", "opencv", "huggingface",
+    "langchain", "openai", "transformers", "xgboost", "lightgbm", "random forest", "neural network",
+    "data analysis", "data science", "feature engineering", "model deployment",
+    # Databases
+    "sql", "mysql", "postgresql", "mongodb", "redis", "sqlite", "cassandra", "oracle", "dynamodb",
+    "firebase", "elasticsearch", "neo4j", "influxdb", "supabase",
+    # Cloud / DevOps
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "ansible", "jenkins", "ci/cd", "github actions",
+    "linux", "nginx", "apache", "heroku", "vercel", "netlify", "cloudflare",
+    # Tools
+    "git", "github", "gitlab", "bitbucket", "jira", "confluence", "figma", "postman", "swagger",
+    "grafana", "prometheus", "airflow", "spark", "hadoop", "kafka", "rabbitmq", "celery",
+    # Mobile
+    "android", "ios", "react native", "flutter", "xamarin",
+    # Other
+    "rest api", "graphql", "microservices", "agile", "scrum", "devops", "mlops", "llm",
+    "excel", "power bi", "tableau", "looker", "dbt",
+}
+
+# ══════════════════════════════════════════════════════════
+#  SKILL MATCHER
+# ══════════════════════════════════════════════════════════
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _is_boundary(left: str, right: str) -> bool:
+    # Same rule as regex \b between two adjacent characters
+    return bool(_WORD_CHAR.match(left)) != bool(_WORD_CHAR.match(right))
+
+
+def _trie_pattern(node: dict) -> str:
+    alts = [re.escape(ch) + _trie_pattern(child)
+            for ch, child in sorted(node.items()) if ch]
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    # "" marks the end of a term; making the tail optional lets the regex
+    # engine fall back to the shorter term when the longer one doesn't fit
+    return "(?:" + body + ")?" if "" in node else body
+
+
+class SkillMatcher:
+    """Finds every taxonomy term in a text with a single regex scan.
+
+    Matches are identical to running ``\\b<term>\\b`` once per term on the
+    lower-cased text, including terms that end in punctuation ("c++", "c#").
+    """
+
+    def __init__(self, skills):
+        self.skills = frozenset(s.lower() for s in skills if s)
+        trie = {}
+        for skill in self.skills:
+            node = trie
+            for ch in skill:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        # A lookahead match is zero-width, so finditer tries every position
+        # and reports the longest term that starts there.
+        self.pattern = re.compile(
+            r"\b(?=(" + _trie_pattern(trie) + r")\b)") if self.skills else None
+        # Shorter terms matching at the same position are always prefixes of
+        # the longest one, and whether they end on a word boundary depends
+        # only on the longest term's own characters, so precompute them.
+        self.implied = {}
+        for skill in self.skills:
+            self.implied[skill] = [
+                skill[:k] for k in range(1, len(skill))
+                if skill[:k] in self.skills and _is_boundary(skill[k - 1], skill[k])
+            ]
+
+    def find(self, text: str) -> set:
+        found = set()
+        if self.pattern is None:
+            return found
+        implied = self.implied
+        for m in self.pattern.finditer(text.lower()):
+            skill = m.group(1)
+            found.add(skill)
+            found.update(implied[skill])
+        return found
+
+
+SKILL_MATCHER = SkillMatcher(SKILLS_DB)
+
+
+def parse_skills(text: str) -> list:
+    return sorted({skill.title() for skill in SKILL_MATCHER.find(text)})
@@ -0,0 +1,83 @@
+import cProfile
+import io
+import pstats
+import time
+from contextlib import contextmanager
+
+try:
+    import pyinstrument
+except ImportError:  # optional sampling profiler
+    pyinstrument = None
+
+# ══════════════════════════════════════════════════════════
+#  STAGE TIMINGS
+# ══════════════════════════════════════════════════════════
+# Per-resume timings are a dict of stage -> milliseconds, stored with the row
+# in resume_metrics. Stages in pipeline order:
+STAGES = ("extract", "nlp", "sections", "skills", "name", "contact",
+          "education", "experience", "minhash", "terms", "db_write")
+
+
+class StageTimer:
+    """Accumulates wall time per stage into ``timings`` (milliseconds)."""
+
+    def __init__(self, timings: dict = None):
+        self.timings = {} if timings is None else timings
+
+    @contextmanager
+    def __call__(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, (time.perf_counter() - start) * 1000)
+
+    def add(self, stage: str, ms: float):
+        self.timings[stage] = self.timings.get(stage, 0.0) + ms
+
+
+# ══════════════════════════════════════════════════════════
+#  PROFILING
+# ══════════════════════════════════════════════════════════
+PROFILERS = ["cProfile"] + (["pyinstrument"] if pyinstrument is not None else [])
+
+
+class Profile:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._profiler = None
+
+    def report(self, limit: int = 40) -> str:
+        if self._profiler is None:
+            return ""
+        if self.kind == "pyinstrument":
+            return self._profiler.output_text(unicode=True)
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+
+@contextmanager
+def profile(kind: str = "cProfile"):
+    """Profile the block with cProfile or pyinstrument; call ``.report()`` after.
+
+    Only this process is profiled, so parse in-process (one worker) to see
+    extraction and NLP in the report.
+    """
+    prof = Profile(kind)
+    if kind == "pyinstrument":
+        if pyinstrument is None:
+            raise RuntimeError("pyinstrument is not installed: pip install pyinstrument")
+        prof._profiler = pyinstrument.Profiler()
+        prof._profiler.start()
+        try:
+            yield prof
+        finally:
+            prof._profiler.stop()
+        return
+    prof._profiler = cProfile.Profile()
+    prof._profiler.enable()
+    try:
+        yield prof
+    finally:
+        prof._profiler.disable()